@@ -9,15 +9,17 @@ This system uses 8 specialized AI agents orchestrated by LangGraph to:
 5. Output machine-readable JSON files
 
 Usage:
-    python main.py
+    python main.py            # Run the example product
+    python main.py --rebuild      # Rebuild all stored pages without LLM calls
+    python main.py --compare-all  # Comparison pages for all stored product pairs per category
+    python main.py --render-html  # Static HTML for all stored products (outputs/site/)
 """
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from dotenv import load_dotenv
-from src.orchestrator import run_workflow
-from src.config import OUTPUTS_DIR
+from src.orchestrator import run_workflow, rebuild_catalog, run_bulk_comparisons, render_catalog_html
 
 # Load environment variables
 load_dotenv()
@@ -70,20 +72,19 @@ def main():
         print(f"   Agents executed: {len(final_state.get('agent_trace', []))}")
         print(f"   Pages generated: 3 (FAQ, Product, Comparison)")
         
-        print(f"\n📁 Output Location: {OUTPUTS_DIR}")
+        print(f"\n📁 Output Location: {final_state.get('output_directory')}")
         print(f"\n   Generated files:")
-        for file_name in ["faq.json", "product_page.json", "comparison_page.json"]:
-            file_path = OUTPUTS_DIR / file_name
+        for file_path in map(Path, final_state.get('written_files') or []):
             if file_path.exists():
                 size_kb = file_path.stat().st_size / 1024
-                print(f"   ✅ {file_name} ({size_kb:.1f} KB)")
+                print(f"   ✅ {file_path.name} ({size_kb:.1f} KB)")
         
         print("\n" + "=" * 80)
         print("🎉 All outputs generated successfully!")
         print("=" * 80)
         
         print("\n💡 Next Steps:")
-        print("   1. Check the outputs/ directory for generated JSON files")
+        print("   1. Check outputs/products/ for the generated JSON files (one directory per product and run)")
         print("   2. Modify the product data in main.py to test different products")
         print("   3. See docs/projectdocumentation.md for system architecture")
         
@@ -96,4 +97,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--rebuild" in sys.argv:
+        rebuild_catalog()
+    elif "--compare-all" in sys.argv:
+        run_bulk_comparisons()
+    elif "--render-html" in sys.argv:
+        render_catalog_html()
+    else:
+        main()
\ No newline at end of file
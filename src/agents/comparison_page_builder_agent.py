@@ -9,6 +9,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from typing import Dict, Any
 from datetime import datetime
 from src.models.state_model import WorkflowState
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.config import INGREDIENT_KB_ENABLED
 
 
 def build_comparison_page(state: WorkflowState) -> Dict[str, Any]:
@@ -56,44 +59,10 @@ def build_comparison_page(state: WorkflowState) -> Dict[str, Any]:
         else:
             comparison_data = comparison_block.content
         
-        # Build product A summary
-        product_a_summary = {
-            "name": product_a.name,
-            "price": product_a.price,
-            "currency": product_a.currency,
-            "formatted_price": f"{product_a.currency}{product_a.price}",
-            "category": product_a.category,
-            "key_ingredients": [
-                {
-                    "name": ing.name,
-                    "concentration": ing.concentration,
-                    "purpose": ing.purpose
-                } for ing in product_a.key_ingredients
-            ] if product_a.key_ingredients else [],
-            "benefits": product_a.benefits if product_a.benefits else [],
-            "target_audience": product_a.target_audience if product_a.target_audience else [],
-            "product_id": product_a.product_id
-        }
+        # Build product summaries
+        product_a_summary = _build_product_summary(product_a)
         print("  ✅ Product A summary")
-        
-        # Build product B summary
-        product_b_summary = {
-            "name": product_b.name,
-            "price": product_b.price,
-            "currency": product_b.currency,
-            "formatted_price": f"{product_b.currency}{product_b.price}",
-            "category": product_b.category,
-            "key_ingredients": [
-                {
-                    "name": ing.name,
-                    "concentration": ing.concentration,
-                    "purpose": ing.purpose
-                } for ing in product_b.key_ingredients
-            ] if product_b.key_ingredients else [],
-            "benefits": product_b.benefits if product_b.benefits else [],
-            "target_audience": product_b.target_audience if product_b.target_audience else [],
-            "product_id": product_b.product_id
-        }
+        product_b_summary = _build_product_summary(product_b)
         print("  ✅ Product B summary")
         
         # Extract comparison data
@@ -126,24 +95,19 @@ def build_comparison_page(state: WorkflowState) -> Dict[str, Any]:
         print("  ✅ Recommendations")
         
         # Build final comparison page
-        comparison_page = {
-            "page_type": "comparison",
-            "product_a": product_a_summary,
-            "product_b": product_b_summary,
-            "comparison": {
+        comparison_page = _assemble_comparison_page(
+            product_a_summary,
+            product_b_summary,
+            {
                 "price": price_comparison,
                 "ingredients": ingredient_comparison,
                 "benefits": benefit_comparison,
                 "summary": summary_text
             },
-            "recommendations": recommendations,
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "comparison_id": f"comp_{product_a.product_id}_{product_b.product_id}",
-                "product_a_completeness": product_a.completeness_score,
-                "product_b_completeness": product_b.completeness_score
-            }
-        }
+            recommendations,
+            product_a,
+            product_b
+        )
         
         print(f"\n✅ Comparison page built successfully")
         print(f"   Product A: {product_a.name} ({product_a.currency}{product_a.price})")
@@ -170,6 +134,51 @@ def build_comparison_page(state: WorkflowState) -> Dict[str, Any]:
         }
 
 
+def _build_product_summary(product) -> Dict[str, Any]:
+    """Product A / Product B section of the comparison page"""
+    return {
+        "name": product.name,
+        "price": product.price,
+        "currency": product.currency,
+        "formatted_price": f"{product.currency}{product.price}",
+        "category": product.category,
+        "key_ingredients": [
+            {
+                "name": ing.name,
+                "concentration": ing.concentration,
+                "purpose": ing.purpose
+            } for ing in product.key_ingredients
+        ] if product.key_ingredients else [],
+        "benefits": product.benefits if product.benefits else [],
+        "target_audience": product.target_audience if product.target_audience else [],
+        "product_id": product.product_id
+    }
+
+
+def _assemble_comparison_page(
+    product_a_summary: Dict[str, Any],
+    product_b_summary: Dict[str, Any],
+    comparison: Dict[str, Any],
+    recommendations: Dict[str, Any],
+    product_a,
+    product_b
+) -> Dict[str, Any]:
+    """Final comparison page JSON (shared with bulk comparison pages)"""
+    return {
+        "page_type": "comparison",
+        "product_a": product_a_summary,
+        "product_b": product_b_summary,
+        "comparison": comparison,
+        "recommendations": recommendations,
+        "metadata": {
+            "generated_at": datetime.now().isoformat(),
+            "comparison_id": f"comp_{product_a.product_id}_{product_b.product_id}",
+            "product_a_completeness": product_a.completeness_score,
+            "product_b_completeness": product_b.completeness_score
+        }
+    }
+
+
 def _generate_basic_comparison(product_a, product_b) -> Dict[str, Any]:
     """Generate basic comparison if comparison block is missing"""
     return {
@@ -200,21 +209,32 @@ def _compare_prices(product_a, product_b) -> Dict[str, Any]:
 
 
 def _compare_ingredients(product_a, product_b) -> Dict[str, Any]:
-    """Compare ingredients between two products"""
-    a_ingredients = {ing.name.lower() for ing in product_a.key_ingredients} if product_a.key_ingredients else set()
-    b_ingredients = {ing.name.lower() for ing in product_b.key_ingredients} if product_b.key_ingredients else set()
+    """Compare ingredients between two products (synonyms match via the normalisation index)"""
+    a_groups = INGREDIENT_INDEX.group_by_id(ing.name for ing in product_a.key_ingredients or [])
+    b_groups = INGREDIENT_INDEX.group_by_id(ing.name for ing in product_b.key_ingredients or [])
+    a_ingredients = set(a_groups)
+    b_ingredients = set(b_groups)
     
-    common = a_ingredients.intersection(b_ingredients)
-    a_unique = a_ingredients - b_ingredients
-    b_unique = b_ingredients - a_ingredients
+    common = {a_groups[i][0] for i in a_ingredients & b_ingredients}
+    a_unique = {a_groups[i][0] for i in a_ingredients - b_ingredients}
+    b_unique = {b_groups[i][0] for i in b_ingredients - a_ingredients}
     
     similarity_score = len(common) / max(len(a_ingredients), len(b_ingredients), 1)
     
+    # Stored knowledge base descriptions only; page building never calls the LLM
+    ingredient_notes = {}
+    if INGREDIENT_KB_ENABLED:
+        for name in a_unique | b_unique:
+            entry = INGREDIENT_KB.get(name)
+            if entry:
+                ingredient_notes[name] = entry["purpose"]
+    
     return {
         "common_ingredients": list(common),
         "product_a_unique_ingredients": list(a_unique),
         "product_b_unique_ingredients": list(b_unique),
         "similarity_score": similarity_score,
+        "ingredient_notes": ingredient_notes,
         "analysis": f"Products share {len(common)} common ingredients. Similarity: {similarity_score:.0%}."
     }
 
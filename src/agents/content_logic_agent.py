@@ -6,25 +6,96 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from typing import Dict, Any, List, Optional
+import functools
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.models.product_model import ProductModel
 from src.models.question_model import QuestionModel
 from src.models.content_block_model import ContentBlock
 from src.models.state_model import WorkflowState
-from src.config import OPENAI_MODEL, OPENAI_TEMPERATURE
+from src.utils.llm_client import invoke_llm, LLM_ERRORS
+from src.storage.block_cache import BLOCK_CACHE, BlockCache, block_cache_key
+from src.storage.product_store import SNAPSHOT_IGNORED_FIELDS
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB, IngredientKnowledgeBase
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.config import BLOCK_CACHE_ENABLED, INGREDIENT_KB_ENABLED
+
+
+# Bump a block type's version whenever its generator output changes, so
+# cached blocks from the old generator are no longer hit
+BLOCK_GENERATOR_VERSIONS = {
+    "overview": "1",
+    "benefits": "1",
+    "ingredients": "2",
+    "usage": "1",
+    "safety": "1",
+    "price": "1",
+    "comparison": "3"
+}
+
+# Block types whose generator rewrites its rule-based content with the LLM
+LLM_ENHANCED_BLOCK_TYPES = {"overview"}
+
+
+def cached_block(block_type: str, key_fields: List[str]) -> Callable:
+    """
+    Serve a generator method from the block cache
+    
+    The key covers the block type, its generator version and the exact values
+    of key_fields on the product. Comparison generators (two products) key on
+    both full products instead. Rule-based fallbacks of a failed LLM
+    enhancement are returned but not cached, so later products retry the LLM.
+    """
+    def decorator(generate: Callable) -> Callable:
+        @functools.wraps(generate)
+        def wrapper(self, *products: ProductModel) -> ContentBlock:
+            if self.block_cache is None:
+                return generate(self, *products)
+            
+            if len(products) == 1:
+                source_values = products[0].model_dump(mode="json", include=set(key_fields))
+            else:
+                source_values = {
+                    f"product_{label}": product.model_dump(mode="json", exclude=SNAPSHOT_IGNORED_FIELDS)
+                    for label, product in zip("ab", products)
+                }
+            if block_type == "overview":
+                source_values["llm_enhanced"] = self.use_llm_enhancement
+            if block_type in ("ingredients", "comparison"):
+                source_values["ingredient_knowledge"] = self._ingredient_notes(*products)
+            
+            key = block_cache_key(block_type, BLOCK_GENERATOR_VERSIONS[block_type], source_values)
+            
+            block = self.block_cache.get(key, block_type)
+            if block is None:
+                block = generate(self, *products)
+                if not is_llm_fallback(block):
+                    self.block_cache.put(key, block)
+            return block
+        return wrapper
+    return decorator
+
+
+def is_llm_fallback(block: ContentBlock) -> bool:
+    """Whether a block holds rule-based content because its LLM enhancement failed"""
+    return block.block_type in LLM_ENHANCED_BLOCK_TYPES and block.validation_status == "partial"
 
 
 class ContentBlockGenerator:
     """Generates various types of content blocks"""
     
-    def __init__(self, use_llm_enhancement: bool = True):
+    def __init__(
+        self,
+        use_llm_enhancement: bool = True,
+        block_cache: Optional[BlockCache] = None,
+        ingredient_kb: Optional[IngredientKnowledgeBase] = None
+    ):
         self.use_llm_enhancement = use_llm_enhancement
-        if use_llm_enhancement:
-            self.llm = ChatOpenAI(model=OPENAI_MODEL, temperature=OPENAI_TEMPERATURE)
+        self.block_cache = block_cache
+        self.ingredient_kb = ingredient_kb
     
+    @cached_block("overview", ["name", "category", "key_ingredients", "benefits", "completeness_score"])
     def generate_overview_block(self, product: ProductModel) -> ContentBlock:
         """Generate product overview block"""
         # Rule-based generation
@@ -41,10 +112,16 @@ class ContentBlockGenerator:
             parts.append(f"designed to provide {product.benefits[0].lower()}")
         
         content = " ".join(parts) + "."
+        status = "complete"
         
         # Optional LLM enhancement for more natural flow
         if self.use_llm_enhancement and product.completeness_score > 50:
-            content = self._enhance_overview(product, content)
+            enhanced = self._enhance_overview(product, content)
+            if enhanced is None:
+                # Rule-based overview only; marked so it is neither cached nor reused
+                status = "partial"
+            else:
+                content = enhanced
         
         return ContentBlock(
             block_id="overview_block",
@@ -53,9 +130,10 @@ class ContentBlockGenerator:
             source_fields=["name", "category", "key_ingredients", "benefits"],
             format="plain_text",
             reusable=True,
-            validation_status="complete"
+            validation_status=status
         )
     
+    @cached_block("benefits", ["benefits", "name"])
     def generate_benefits_block(self, product: ProductModel) -> ContentBlock:
         """Generate benefits content block"""
         if not product.benefits or len(product.benefits) == 0:
@@ -80,6 +158,7 @@ class ContentBlockGenerator:
             validation_status=status
         )
     
+    @cached_block("ingredients", ["key_ingredients"])
     def generate_ingredients_block(self, product: ProductModel) -> ContentBlock:
         """Generate ingredients content block"""
         if not product.key_ingredients or len(product.key_ingredients) == 0:
@@ -87,16 +166,21 @@ class ContentBlockGenerator:
             status = "missing"
         else:
             # Structured format with details
+            # General knowledge base notes fill in what the product data leaves out
+            notes = self._ingredient_notes(product)
+            
             ingredients_data = []
             for ing in product.key_ingredients:
                 ing_info = {
                     "name": ing.name,
                     "concentration": ing.concentration,
-                    "purpose": ing.purpose
+                    "purpose": ing.purpose or notes.get(ing.name, {}).get("purpose")
                 }
+                if notes.get(ing.name, {}).get("safety_notes"):
+                    ing_info["safety_notes"] = notes[ing.name]["safety_notes"]
                 ingredients_data.append(ing_info)
             
-            # Create formatted text
+            # Create formatted text (product-specific purposes only)
             ing_details = []
             for ing in product.key_ingredients:
                 detail = ing.name
@@ -123,6 +207,7 @@ class ContentBlockGenerator:
             validation_status=status
         )
     
+    @cached_block("usage", ["usage_instructions"])
     def generate_usage_block(self, product: ProductModel) -> ContentBlock:
         """Generate usage instructions block"""
         if not product.usage_instructions:
@@ -145,6 +230,7 @@ class ContentBlockGenerator:
             validation_status=status
         )
     
+    @cached_block("safety", ["side_effects"])
     def generate_safety_block(self, product: ProductModel) -> ContentBlock:
         """Generate safety/side effects block"""
         if not product.side_effects:
@@ -172,6 +258,7 @@ class ContentBlockGenerator:
             validation_status=status
         )
     
+    @cached_block("price", ["price", "currency", "name"])
     def generate_price_block(self, product: ProductModel) -> ContentBlock:
         """Generate pricing block"""
         # Determine value proposition
@@ -199,6 +286,7 @@ class ContentBlockGenerator:
             validation_status="complete"
         )
     
+    @cached_block("comparison", ["product_a", "product_b"])
     def generate_comparison_block(
         self, 
         product_a: ProductModel, 
@@ -206,13 +294,15 @@ class ContentBlockGenerator:
     ) -> ContentBlock:
         """Generate product comparison block"""
         
-        # Ingredient comparison
-        a_ingredients = {ing.name for ing in product_a.key_ingredients} if product_a.key_ingredients else set()
-        b_ingredients = {ing.name for ing in product_b.key_ingredients} if product_b.key_ingredients else set()
+        # Ingredient comparison on canonical IDs (reported under each product's own names)
+        a_groups = INGREDIENT_INDEX.group_by_id(ing.name for ing in product_a.key_ingredients or [])
+        b_groups = INGREDIENT_INDEX.group_by_id(ing.name for ing in product_b.key_ingredients or [])
+        a_ingredients = set(a_groups)
+        b_ingredients = set(b_groups)
         
-        ingredient_overlap = a_ingredients.intersection(b_ingredients)
-        a_unique = a_ingredients - b_ingredients
-        b_unique = b_ingredients - a_ingredients
+        ingredient_overlap = {a_groups[i][0] for i in a_ingredients & b_ingredients}
+        a_unique = {a_groups[i][0] for i in a_ingredients - b_ingredients}
+        b_unique = {b_groups[i][0] for i in b_ingredients - a_ingredients}
         
         # Price comparison
         price_diff = product_b.price - product_a.price
@@ -244,7 +334,12 @@ class ContentBlockGenerator:
                 "common_ingredients": list(ingredient_overlap),
                 f"{product_a.name}_unique": list(a_unique),
                 f"{product_b.name}_unique": list(b_unique),
-                "similarity_score": len(ingredient_overlap) / max(len(a_ingredients), len(b_ingredients), 1)
+                "similarity_score": len(ingredient_overlap) / max(len(a_ingredients), len(b_ingredients), 1),
+                "ingredient_notes": {
+                    name: note["purpose"]
+                    for name, note in self._ingredient_notes(product_a, product_b).items()
+                    if name in a_unique or name in b_unique
+                }
             },
             "benefit_comparison": {
                 "common_benefits": list(benefit_overlap),
@@ -292,8 +387,21 @@ class ContentBlockGenerator:
         
         return faq_blocks
     
-    def _enhance_overview(self, product: ProductModel, base_content: str) -> str:
-        """Use LLM to enhance overview for more natural flow"""
+    def _ingredient_notes(self, *products: ProductModel) -> Dict[str, Dict[str, str]]:
+        """Knowledge base purpose and safety notes for the products' ingredients (no LLM calls)"""
+        if self.ingredient_kb is None:
+            return {}
+        
+        notes = {}
+        for product in products:
+            for ing in product.key_ingredients or []:
+                entry = self.ingredient_kb.get(ing.name)
+                if entry:
+                    notes[ing.name] = {"purpose": entry["purpose"], "safety_notes": entry["safety_notes"]}
+        return notes
+    
+    def _enhance_overview(self, product: ProductModel, base_content: str) -> Optional[str]:
+        """Use LLM to enhance overview for more natural flow (None if the LLM call failed)"""
         try:
             prompt = f"""Rewrite this product overview to be more engaging and natural, keep it concise (2-3 sentences max):
 
@@ -306,11 +414,11 @@ Product details:
 
 Return only the enhanced overview text, nothing else."""
 
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            enhanced = response.content.strip()
+            enhanced = invoke_llm([HumanMessage(content=prompt)])
             return enhanced if len(enhanced) > 10 else base_content
-        except:
-            return base_content
+        except LLM_ERRORS as e:
+            print(f"⚠️  Overview enhancement failed, using rule-based overview: {e}")
+            return None
     
     def _generate_comparison_summary(
         self, 
@@ -337,7 +445,8 @@ def generate_content_blocks(state: WorkflowState) -> Dict[str, Any]:
     Reads: product_model, product_b_model, questions from state
     Writes: content_blocks, agent_trace
     
-    Generates all reusable content blocks from product data
+    Generates all reusable content blocks from product data. On incremental
+    runs, blocks whose source_fields are unchanged are taken from previous_outputs.
     """
     print("\n📝 Content Logic Agent: Starting...")
     
@@ -355,38 +464,58 @@ def generate_content_blocks(state: WorkflowState) -> Dict[str, Any]:
         }
     
     try:
-        generator = ContentBlockGenerator(use_llm_enhancement=True)
+        generator = ContentBlockGenerator(
+            use_llm_enhancement=True,
+            block_cache=BLOCK_CACHE if BLOCK_CACHE_ENABLED else None,
+            ingredient_kb=INGREDIENT_KB if INGREDIENT_KB_ENABLED else None
+        )
+        
+        # Describe any unseen Product B ingredients once for the whole catalog
+        # (Product A's were looked up by the question generator)
+        if INGREDIENT_KB_ENABLED and product_b_model and product_b_model.key_ingredients:
+            INGREDIENT_KB.ensure([ing.name for ing in product_b_model.key_ingredients])
         
         print("🔨 Generating content blocks...")
         
+        # Blocks from the previous run whose source fields are unchanged can be reused
+        previous_outputs = state.get("previous_outputs") or {}
+        previous_blocks = previous_outputs.get("content_blocks") or {}
+        changed_fields = state.get("changed_fields")
+        product_b_changed = _product_changed(previous_outputs.get("product_b_model"), product_b_model)
+        
         # Generate core product blocks
         blocks = {}
         
-        blocks["overview"] = generator.generate_overview_block(product_model)
-        print(f"  ✅ Overview block")
-        
-        blocks["benefits"] = generator.generate_benefits_block(product_model)
-        print(f"  ✅ Benefits block")
-        
-        blocks["ingredients"] = generator.generate_ingredients_block(product_model)
-        print(f"  ✅ Ingredients block")
-        
-        blocks["usage"] = generator.generate_usage_block(product_model)
-        print(f"  ✅ Usage block")
-        
-        blocks["safety"] = generator.generate_safety_block(product_model)
-        print(f"  ✅ Safety block")
-        
-        blocks["price"] = generator.generate_price_block(product_model)
-        print(f"  ✅ Price block")
+        block_generators = [
+            ("overview", "Overview", generator.generate_overview_block),
+            ("benefits", "Benefits", generator.generate_benefits_block),
+            ("ingredients", "Ingredients", generator.generate_ingredients_block),
+            ("usage", "Usage", generator.generate_usage_block),
+            ("safety", "Safety", generator.generate_safety_block),
+            ("price", "Price", generator.generate_price_block)
+        ]
+        
+        for key, label, generate_block in block_generators:
+            previous_block = previous_blocks.get(key)
+            if _can_reuse_block(previous_block, changed_fields, product_b_changed):
+                blocks[key] = previous_block
+                print(f"  ♻️  {label} block (reused)")
+            else:
+                blocks[key] = generate_block(product_model)
+                print(f"  ✅ {label} block")
         
         # Generate comparison block if Product B exists
         if product_b_model:
-            blocks["comparison"] = generator.generate_comparison_block(
-                product_model, 
-                product_b_model
-            )
-            print(f"  ✅ Comparison block")
+            previous_block = previous_blocks.get("comparison")
+            if _can_reuse_block(previous_block, changed_fields, product_b_changed):
+                blocks["comparison"] = previous_block
+                print(f"  ♻️  Comparison block (reused)")
+            else:
+                blocks["comparison"] = generator.generate_comparison_block(
+                    product_model, 
+                    product_b_model
+                )
+                print(f"  ✅ Comparison block")
         
         # Generate FAQ answer blocks
         if questions:
@@ -412,6 +541,39 @@ def generate_content_blocks(state: WorkflowState) -> Dict[str, Any]:
         }
 
 
+def _can_reuse_block(
+    block: Optional[ContentBlock],
+    changed_fields: Optional[List[str]],
+    product_b_changed: bool
+) -> bool:
+    """
+    A previous block is reusable when none of its source fields changed and
+    it is not the rule-based fallback of a failed LLM enhancement
+    
+    source_fields "product_a" / "product_b" stand for the whole product.
+    """
+    if block is None or changed_fields is None or is_llm_fallback(block):
+        return False
+    
+    for field in block.source_fields:
+        if field == "product_a" and changed_fields:
+            return False
+        if field == "product_b" and product_b_changed:
+            return False
+        if field in changed_fields:
+            return False
+    
+    return True
+
+
+def _product_changed(previous: Optional[ProductModel], current: Optional[ProductModel]) -> bool:
+    """Compare two product models ignoring system-generated metadata"""
+    if previous is None or current is None:
+        return previous is not current
+    exclude = {"created_at", "field_count", "completeness_score"}
+    return previous.model_dump(exclude=exclude) != current.model_dump(exclude=exclude)
+
+
 # Agent metadata
 AGENT_INFO = {
     "name": "Content Logic Agent",
@@ -0,0 +1,126 @@
+"""
+HTML Renderer Agent
+Renders the generated pages to static HTML with precompiled templates
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from jinja2 import Environment, FileSystemLoader, ChainableUndefined, Template
+from src.models.state_model import WorkflowState
+from src.agents.output_formatter_agent import output_pages, UNKNOWN_PRODUCT_ID
+from src.storage.output_paths import atomic_write_bytes, safe_path_component
+from src.config import TEMPLATES_DIR, HTML_OUTPUT_DIR
+
+
+# Template file per page type (page["page_type"])
+PAGE_TEMPLATES = {
+    "faq": "faq.html",
+    "product_page": "product_page.html",
+    "comparison": "comparison.html"
+}
+
+
+@lru_cache(maxsize=1)
+def page_templates() -> Dict[str, Template]:
+    """
+    Compile every page template once per process
+    
+    Autoescaping is on (page text comes from the LLM); missing page fields
+    render as empty strings instead of failing the page.
+    """
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        undefined=ChainableUndefined,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    return {page_type: environment.get_template(name) for page_type, name in PAGE_TEMPLATES.items()}
+
+
+def render_page(page: Dict[str, Any]) -> Optional[str]:
+    """HTML for a page, or None for page types without a template"""
+    template = page_templates().get(page.get("page_type"))
+    return template.render(page=page) if template else None
+
+
+def html_output_dir(product_id: str) -> Path:
+    """Static site directory of a product (always holds its latest pages; the ID is sanitised)"""
+    return HTML_OUTPUT_DIR / safe_path_component(product_id)
+
+
+def write_html_pages(product_id: str, pages, skip: Optional[List[str]] = None) -> List[str]:
+    """
+    Render (page, file name, label) triples to HTML_OUTPUT_DIR/<product_id>/<stem>.html
+    
+    Pages whose file name is in skip are left alone if their HTML exists.
+    Returns the paths written.
+    """
+    output_dir = html_output_dir(product_id)
+    written = []
+    for page, file_name, _ in pages:
+        if not page:
+            continue
+        html_path = output_dir / f"{Path(file_name).stem}.html"
+        if skip and file_name in skip and html_path.exists():
+            continue
+        html = render_page(page)
+        if html is None:
+            continue
+        atomic_write_bytes(html_path, html.encode("utf-8"))
+        written.append(str(html_path))
+    return written
+
+
+def render_html_pages(state: WorkflowState) -> Dict[str, Any]:
+    """
+    HTML Renderer Agent
+    
+    Reads: product_model, faq_page, product_page, comparison_page, changed_pages from state
+    Writes: html_files, agent_trace
+    
+    Renders every generated page to HTML_OUTPUT_DIR/<product_id> for static
+    site deploys. Pages the Output Formatter Agent found unchanged keep
+    their existing HTML.
+    """
+    print("\n🌐 HTML Renderer Agent: Starting...")
+    
+    product_model = state.get("product_model")
+    product_id = product_model.product_id if product_model else UNKNOWN_PRODUCT_ID
+    pages = output_pages(state)
+    changed_pages = state.get("changed_pages")
+    unchanged = [file_name for _, file_name, _ in pages if changed_pages is not None and file_name not in changed_pages]
+    
+    try:
+        html_files = write_html_pages(product_id, pages, skip=unchanged)
+    except Exception as e:
+        error_msg = f"Failed to render HTML pages: {str(e)}"
+        print(f"❌ Error: {error_msg}")
+        return {
+            "errors": [error_msg],
+            "agent_trace": ["html_renderer_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    print(f"✅ Rendered {len(html_files)} HTML page(s) to {html_output_dir(product_id)}")
+    
+    return {
+        "html_files": html_files,
+        "agent_trace": ["html_renderer_agent"],
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+# Agent metadata
+AGENT_INFO = {
+    "name": "HTML Renderer Agent",
+    "responsibility": "Render pages to static HTML",
+    "reads_from_state": ["product_model", "faq_page", "product_page", "comparison_page", "changed_pages"],
+    "writes_to_state": ["html_files", "agent_trace"],
+    "dependencies": ["output_formatter_agent"]
+}
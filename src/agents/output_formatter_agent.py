@@ -6,92 +6,161 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-import json
-from typing import Dict, Any
+import sqlite3
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from src.models.state_model import WorkflowState
-from src.config import OUTPUTS_DIR, FAQ_OUTPUT_FILE, PRODUCT_PAGE_OUTPUT_FILE, COMPARISON_OUTPUT_FILE
+from src.storage.output_paths import (
+    new_run_id, run_output_dir, atomic_write_bytes, link_unchanged, mark_latest_run, latest_run_manifest
+)
+from src.storage.run_sinks import get_run_sink
+from src.storage.output_manifest import manifest_file_path
+from src.storage.product_store import PRODUCT_STORE, serialize_content_blocks
+from src.storage.faq_index import FAQ_INDEX
+from src.utils.serialization import encode_page, decode_page, content_hash
+from src.utils.json_patch import make_patch
+from src.config import (
+    FAQ_OUTPUT_FILE, PRODUCT_PAGE_OUTPUT_FILE, COMPARISON_OUTPUT_FILE, OUTPUT_COMPACT_JSON, OUTPUT_SKIP_UNCHANGED,
+    OUTPUT_PATCHES_ENABLED, FAQ_INDEX_ENABLED
+)
+
+
+# Output namespace for states without a parsed product
+UNKNOWN_PRODUCT_ID = "unknown_product"
+
+# Patch files sit next to their page: faq.json → faq.patch.json
+PATCH_FILE_SUFFIX = ".patch.json"
+
+# Bump a page type's version whenever its builder's JSON structure changes,
+# so publishers can tell old and new layouts apart in the output manifest
+PAGE_SCHEMA_VERSIONS = {
+    "faq": "1",
+    "product_page": "1",
+    "comparison": "1"
+}
 
 
 def write_output_files(state: WorkflowState) -> Dict[str, Any]:
     """
     Output Formatter Agent
     
-    Reads: faq_page, product_page, comparison_page from state
-    Writes: Files to disk, agent_trace
+    Reads: product_model, run_id, faq_page, product_page, comparison_page, content_blocks from state
+    Writes: Files to disk, written_files, serialized_pages, changed_pages, manifest_entries,
+            output_directory, agent_trace
+    
+    Writes all generated pages as JSON files to the product's directory for
+    this run (OUTPUTS_DIR/products/<shard>/<product_id>/<run_id>). Each file
+    is written to a temp file and renamed into place; latest.json in the
+    product directory then points at the run.
+    
+    Each page is encoded once (compact when OUTPUT_COMPACT_JSON is set);
+    the same bytes go to disk and into serialized_pages (file name → bytes)
+    for downloads and API responses.
+    
+    Pages whose content hash (ignoring metadata.generated_at) matches the
+    product's previous run are hard-linked from that run instead of being
+    rewritten (OUTPUT_SKIP_UNCHANGED); changed_pages lists the others.
+    manifest_entries describe every page (hash, size, schema version,
+    generation time) for the run's output manifest. For changed pages an
+    RFC 6902 patch from the previous run's version is written alongside
+    (faq.patch.json) and referenced from the page's entry.
+    
+    Once the pages are stored, the FAQ entries are added to the catalog's
+    full-text search index (FAQ_INDEX_ENABLED).
     
-    Writes all generated pages as JSON files to the outputs directory
+    When the run has an open sink (catalog runs with OUTPUT_SINK = "jsonl",
+    "archive" or "sqlite"), the compact pages are appended to it instead;
+    the SQLite result store also keeps the content blocks. Every page is
+    appended, but only pages whose hash differs from the product's stored
+    snapshot count as changed.
     """
     print("\n💾 Output Formatter Agent: Starting...")
     
-    faq_page = state.get("faq_page")
-    product_page = state.get("product_page")
-    comparison_page = state.get("comparison_page")
+    product_model = state.get("product_model")
+    product_id = product_model.product_id if product_model else UNKNOWN_PRODUCT_ID
+    run_id = state.get("run_id") or new_run_id()
+    
+    pages = output_pages(state)
+    
+    sink = get_run_sink(run_id)
+    if sink is not None:
+        return _append_to_sink(sink, product_id, run_id, pages, state.get("content_blocks"))
+    
+    output_dir = run_output_dir(product_id, run_id)
+    
+    # Manifest entries of the previous run, to skip unchanged pages and patch changed ones
+    previous = latest_run_manifest(product_id)
+    previous_pages = previous.get("pages", {}) if previous else {}
     
     # Track which files were written
     written_files = []
+    serialized_pages = {}
+    manifest_entries = {}
+    changed_pages = []
     errors = []
     
-    # Ensure outputs directory exists
-    OUTPUTS_DIR.mkdir(exist_ok=True, parents=True)
-    print(f"📁 Output directory: {OUTPUTS_DIR}")
+    print(f"📁 Output directory: {output_dir}")
     
     try:
-        # Write FAQ page
-        if faq_page:
-            faq_path = OUTPUTS_DIR / FAQ_OUTPUT_FILE
-            try:
-                with open(faq_path, 'w', encoding='utf-8') as f:
-                    json.dump(faq_page, f, indent=2, ensure_ascii=False)
-                written_files.append(str(faq_path))
-                print(f"  ✅ Written: {FAQ_OUTPUT_FILE}")
-            except Exception as e:
-                error_msg = f"Failed to write FAQ page: {str(e)}"
-                errors.append(error_msg)
-                print(f"  ❌ Error: {error_msg}")
-        else:
-            print(f"  ⚠️  Skipped: {FAQ_OUTPUT_FILE} (no data)")
-        
-        # Write Product page
-        if product_page:
-            product_path = OUTPUTS_DIR / PRODUCT_PAGE_OUTPUT_FILE
-            try:
-                with open(product_path, 'w', encoding='utf-8') as f:
-                    json.dump(product_page, f, indent=2, ensure_ascii=False)
-                written_files.append(str(product_path))
-                print(f"  ✅ Written: {PRODUCT_PAGE_OUTPUT_FILE}")
-            except Exception as e:
-                error_msg = f"Failed to write product page: {str(e)}"
-                errors.append(error_msg)
-                print(f"  ❌ Error: {error_msg}")
-        else:
-            print(f"  ⚠️  Skipped: {PRODUCT_PAGE_OUTPUT_FILE} (no data)")
-        
-        # Write Comparison page
-        if comparison_page:
-            comparison_path = OUTPUTS_DIR / COMPARISON_OUTPUT_FILE
+        for page, file_name, label in pages:
+            if not page:
+                print(f"  ⚠️  Skipped: {file_name} (no data)")
+                continue
+            
+            file_path = output_dir / file_name
             try:
-                with open(comparison_path, 'w', encoding='utf-8') as f:
-                    json.dump(comparison_page, f, indent=2, ensure_ascii=False)
-                written_files.append(str(comparison_path))
-                print(f"  ✅ Written: {COMPARISON_OUTPUT_FILE}")
+                entry = manifest_entry(product_id, run_id, page, file_path)
+                previous_entry = previous_pages.get(file_name, {})
+                unchanged = (
+                    OUTPUT_SKIP_UNCHANGED
+                    and previous_entry.get("content_hash") == entry["content_hash"]
+                    and previous_entry.get("schema_version") == entry["schema_version"]
+                )
+                if unchanged and link_unchanged(run_output_dir(product_id, previous["run_id"]) / file_name, file_path):
+                    serialized_pages[file_name] = file_path.read_bytes()
+                    # Size and generation time are those of the linked file; no patch is needed
+                    entry = {
+                        **{key: value for key, value in previous_entry.items() if key != "patch"},
+                        "file": entry["file"], "run_id": run_id, "changed": False
+                    }
+                    print(f"  ⏭️  Unchanged: {file_name} (linked from run {previous['run_id']})")
+                else:
+                    data = encode_page(page, compact=OUTPUT_COMPACT_JSON)
+                    atomic_write_bytes(file_path, data)
+                    serialized_pages[file_name] = data
+                    entry["size"] = len(data)
+                    changed_pages.append(file_name)
+                    print(f"  ✅ Written: {file_name}")
+                    if OUTPUT_PATCHES_ENABLED and previous_entry and previous["run_id"] != run_id:
+                        patch = _write_patch(
+                            run_output_dir(product_id, previous["run_id"]) / file_name, page, file_path
+                        )
+                        if patch:
+                            entry["patch"] = {**patch, "base_run_id": previous["run_id"]}
+                            print(f"  ✅ Patch: {Path(patch['file']).name} ({patch['operations']} operations)")
+                manifest_entries[file_name] = entry
+                written_files.append(str(file_path))
             except Exception as e:
-                error_msg = f"Failed to write comparison page: {str(e)}"
+                error_msg = f"Failed to write {label}: {str(e)}"
                 errors.append(error_msg)
                 print(f"  ❌ Error: {error_msg}")
-        else:
-            print(f"  ⚠️  Skipped: {COMPARISON_OUTPUT_FILE} (no data)")
         
         # Summary
         if written_files:
-            print(f"\n✅ Successfully wrote {len(written_files)} file(s)")
-            print(f"📂 Location: {OUTPUTS_DIR}")
+            if not errors:
+                mark_latest_run(product_id, run_id, [Path(path).name for path in written_files], manifest_entries)
+                index_faq(product_id, state.get("faq_page"))
+            print(f"\n✅ Successfully wrote {len(written_files)} file(s) ({len(changed_pages)} changed)")
+            print(f"📂 Location: {output_dir}")
         else:
             print(f"\n⚠️  No files written (no page data available)")
         
         result = {
             "written_files": written_files,
-            "output_directory": str(OUTPUTS_DIR),
+            "serialized_pages": serialized_pages,
+            "changed_pages": changed_pages,
+            "manifest_entries": list(manifest_entries.values()),
+            "output_directory": str(output_dir),
             "files_written_count": len(written_files),
             "agent_trace": ["output_formatter_agent"],
             "timestamp": datetime.now().isoformat()
@@ -108,16 +177,159 @@ def write_output_files(state: WorkflowState) -> Dict[str, Any]:
         return {
             "errors": [error_msg],
             "written_files": written_files,
+            "serialized_pages": serialized_pages,
+            "changed_pages": changed_pages,
+            "manifest_entries": list(manifest_entries.values()),
             "agent_trace": ["output_formatter_agent"],
             "timestamp": datetime.now().isoformat()
         }
 
 
+def _write_patch(previous_path: Path, page: Dict[str, Any], file_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Write the RFC 6902 patch from the previous run's page next to the page
+    
+    Returns the patch's manifest details, or None when the previous page
+    can no longer be read.
+    """
+    try:
+        with open(previous_path, 'rb') as f:
+            previous_page = decode_page(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    patch = make_patch(previous_page, page)
+    patch_path = file_path.with_name(file_path.stem + PATCH_FILE_SUFFIX)
+    data = encode_page(patch, compact=True)
+    atomic_write_bytes(patch_path, data)
+    return {"file": manifest_file_path(patch_path), "size": len(data), "operations": len(patch)}
+
+
+def output_pages(state: WorkflowState) -> List[Tuple[Optional[Dict[str, Any]], str, str]]:
+    """(page, file name, label) for every page the formatter writes"""
+    return [
+        (state.get("faq_page"), FAQ_OUTPUT_FILE, "FAQ page"),
+        (state.get("product_page"), PRODUCT_PAGE_OUTPUT_FILE, "product page"),
+        (state.get("comparison_page"), COMPARISON_OUTPUT_FILE, "comparison page")
+    ]
+
+
+def manifest_entry(product_id: str, run_id: str, page: Dict[str, Any], file_path: Optional[Path]) -> Dict[str, Any]:
+    """
+    Output manifest entry of a page (size is filled in once the page is encoded)
+    
+    file is None for sink records until the sink has stored them.
+    """
+    page_type = page.get("page_type", "unknown")
+    metadata = page.get("metadata") or {}
+    return {
+        "product_id": product_id,
+        "page_type": page_type,
+        "file": manifest_file_path(file_path) if file_path else None,
+        "content_hash": content_hash(page),
+        "size": None,
+        "schema_version": PAGE_SCHEMA_VERSIONS.get(page_type, "1"),
+        "generated_at": metadata.get("generated_at") or datetime.now().isoformat(),
+        "run_id": run_id,
+        "changed": True
+    }
+
+
+def sink_pages(
+    product_id: str,
+    run_id: str,
+    pages,
+    previous_pages: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, bytes], List[Dict[str, Any]], List[str]]:
+    """
+    Compact page bytes (file name → bytes), the pages' manifest entries (without file) and the changed file names
+
+    A page is unchanged when its content hash matches the page of the same
+    type in previous_pages (the product's stored snapshot pages).
+    """
+    previous_hashes = {
+        page.get("page_type"): content_hash(page) for page in (previous_pages or {}).values() if page
+    }
+    serialized_pages = {}
+    entries = []
+    changed_pages = []
+    for page, file_name, _ in pages:
+        if not page:
+            continue
+        serialized_pages[file_name] = encode_page(page, compact=True)
+        entry = {**manifest_entry(product_id, run_id, page, None), "size": len(serialized_pages[file_name])}
+        entry["changed"] = previous_hashes.get(entry["page_type"]) != entry["content_hash"]
+        if entry["changed"]:
+            changed_pages.append(file_name)
+        entries.append(entry)
+    return serialized_pages, entries, changed_pages
+
+
+def index_faq(product_id: str, faq_page: Optional[Dict[str, Any]]) -> None:
+    """Add a product's FAQ entries to the search index (skipped when disabled or unchanged)"""
+    if not (FAQ_INDEX_ENABLED and faq_page):
+        return
+    try:
+        if FAQ_INDEX.index_faq_page(product_id, faq_page):
+            print(f"  ✅ Indexed {len(faq_page.get('faqs') or [])} FAQ entries for search")
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Warning: Could not update FAQ search index: {str(e)}")
+
+
+def _append_to_sink(sink, product_id: str, run_id: str, pages, content_blocks) -> Dict[str, Any]:
+    """Append the product's compact pages to the run's sink (JSONL shards, page archive or result store)"""
+    serialized_pages, entries, changed_pages = sink_pages(
+        product_id, run_id, pages, PRODUCT_STORE.load_pages(product_id)
+    )
+    if not serialized_pages:
+        print(f"\n⚠️  No pages to append (no page data available)")
+        return {
+            "written_files": [],
+            "serialized_pages": {},
+            "changed_pages": [],
+            "manifest_entries": [],
+            "files_written_count": 0,
+            "agent_trace": ["output_formatter_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    try:
+        sink_path = sink.append(
+            product_id, run_id, serialized_pages, entries, serialize_content_blocks(content_blocks)
+        )
+    except Exception as e:
+        error_msg = f"Failed to append to output sink: {str(e)}"
+        print(f"❌ Error: {error_msg}")
+        return {
+            "errors": [error_msg],
+            "written_files": [],
+            "agent_trace": ["output_formatter_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    for entry in entries:
+        entry["file"] = manifest_file_path(sink_path)
+    print(f"  ✅ Appended {len(serialized_pages)} page(s) to {sink_path} ({len(changed_pages)} changed)")
+    index_faq(product_id, next((page for page, file_name, _ in pages if file_name == FAQ_OUTPUT_FILE), None))
+    return {
+        "written_files": [str(sink_path)],
+        "serialized_pages": serialized_pages,
+        "changed_pages": changed_pages,
+        "manifest_entries": entries,
+        "output_directory": str(sink.path),
+        "files_written_count": len(serialized_pages),
+        "agent_trace": ["output_formatter_agent"],
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 # Agent metadata
 AGENT_INFO = {
     "name": "Output Formatter Agent",
     "responsibility": "Write final JSON files to disk",
-    "reads_from_state": ["faq_page", "product_page", "comparison_page"],
-    "writes_to_state": ["written_files", "agent_trace"],
+    "reads_from_state": ["product_model", "run_id", "faq_page", "product_page", "comparison_page", "content_blocks"],
+    "writes_to_state": [
+        "written_files", "serialized_pages", "changed_pages", "manifest_entries", "output_directory", "agent_trace"
+    ],
     "dependencies": ["faq_builder_agent", "product_page_builder_agent", "comparison_page_builder_agent"]
 }
\ No newline at end of file
@@ -7,13 +7,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
-from langchain_openai import ChatOpenAI
+from pydantic import ValidationError
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.models.product_model import ProductModel
 from src.models.state_model import WorkflowState
-from src.config import OPENAI_MODEL, OPENAI_TEMPERATURE
+from src.utils.llm_client import invoke_llm, LLM_ERRORS
+from src.utils.circuit_breaker import CircuitOpenError
+from src.content_logic.competitor_library import COMPETITOR_LIBRARY
+from src.content_logic.catalog_index import get_catalog_index
+from src.content_logic.similarity import score_product_similarity, LLM_REPAIRABLE_FIELDS
+from src.config import (
+    COMPETITOR_LIBRARY_ENABLED, PRODUCT_B_REPAIR_PRICE_DIFFERENCE,
+    COMPETITOR_SOURCE, CATALOG_COMPETITOR_MIN_SCORE
+)
 
 
 def generate_product_b(state: WorkflowState) -> Dict[str, Any]:
@@ -23,7 +31,11 @@ def generate_product_b(state: WorkflowState) -> Dict[str, Any]:
     Reads: product_model from state
     Writes: product_b_model, agent_trace
     
-    Generates a fictional competitor product for comparison
+    Generates a fictional competitor product for comparison, reusing a close
+    match from the competitor library when one exists. With COMPETITOR_SOURCE
+    "catalog", the closest real product from our own catalog is used instead.
+    After a price-only edit, the previous competitor is kept while it stays
+    within the price gap.
     """
     print("\n🏭 Product B Generator Agent: Starting...")
     
@@ -38,13 +50,45 @@ def generate_product_b(state: WorkflowState) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     
+    # Closest real competitor from the catalog index (no LLM call)
+    if COMPETITOR_SOURCE == "catalog":
+        partner = get_catalog_index().partner_for(product_model)
+        if partner and partner[1] >= CATALOG_COMPETITOR_MIN_SCORE:
+            print(f"🗂️  Using catalog competitor: {partner[0].name} (similarity {partner[1]:.2f})")
+            return {
+                "product_b_model": partner[0],
+                "agent_trace": ["product_b_generator_agent"],
+                "timestamp": datetime.now().isoformat()
+            }
+        print("⚠️  Warning: No close catalog competitor, generating Product B")
+    
+    # Incremental run with only a price change: the previous competitor
+    # stands while the new price stays within the allowed gap
+    previous_product_b = (state.get("previous_outputs") or {}).get("product_b_model")
+    changed_fields = state.get("changed_fields")
+    if previous_product_b and changed_fields is not None and set(changed_fields) <= {"price"}:
+        if "price" not in score_product_similarity(product_model, previous_product_b)["offending_fields"]:
+            print(f"♻️  Price-only change - keeping competitor {previous_product_b.name}")
+            return {
+                "product_b_model": previous_product_b,
+                "agent_trace": ["product_b_generator_agent"],
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    # Reuse a stored competitor for the same category / price band / profile
+    if COMPETITOR_LIBRARY_ENABLED:
+        library_match = COMPETITOR_LIBRARY.lookup(product_model)
+        if library_match:
+            print(f"📚 Reusing competitor from library: {library_match.name}")
+            return {
+                "product_b_model": library_match,
+                "agent_trace": ["product_b_generator_agent"],
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    response_text = ""
+    
     try:
-        # Initialize LLM
-        llm = ChatOpenAI(
-            model=OPENAI_MODEL,
-            temperature=OPENAI_TEMPERATURE
-        )
-        
         # Build Product A context
         product_a_context = _build_product_context(product_model)
         
@@ -95,14 +139,11 @@ Generate Product B - a realistic competitor product that:
 
         # Call LLM
         print("🤖 Calling LLM to generate competitor product...")
-        response = llm.invoke([
+        response_text = invoke_llm([
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ])
         
-        # Parse response
-        response_text = response.content.strip()
-        
         # Extract JSON (handle markdown code blocks)
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
@@ -123,23 +164,51 @@ Generate Product B - a realistic competitor product that:
         print(f"   Ingredients: {len(product_b_model.key_ingredients)} items")
         print(f"   Benefits: {len(product_b_model.benefits)} items")
         
-        # Check for ingredient overlap (should be minimal)
-        if product_model.key_ingredients and product_b_model.key_ingredients:
-            a_ingredients = {ing.name.lower() for ing in product_model.key_ingredients}
-            b_ingredients = {ing.name.lower() for ing in product_b_model.key_ingredients}
-            overlap = a_ingredients.intersection(b_ingredients)
+        # Validate against Product A with the local similarity scorer
+        warnings = []
+        similarity = score_product_similarity(product_model, product_b_model)
+        print(f"   Similarity score: {similarity['score']:.2f}")
+        
+        if similarity["offending_fields"]:
+            print(f"   ⚠️  Repairing fields: {', '.join(similarity['offending_fields'])}")
+            product_b_model, repair_warnings = _repair_product_b(
+                product_model, product_b_model, similarity["offending_fields"]
+            )
+            warnings.extend(repair_warnings)
+            similarity = score_product_similarity(product_model, product_b_model)
+            print(f"   Similarity score after repair: {similarity['score']:.2f}")
             
-            if overlap:
-                print(f"   ⚠️  Ingredient overlap detected: {overlap}")
-            else:
-                print(f"   ✅ No ingredient overlap - good differentiation")
+            if similarity["offending_fields"]:
+                warning_msg = (
+                    f"Product B still out of bounds after repair: "
+                    f"{', '.join(similarity['offending_fields'])}"
+                )
+                print(f"   ⚠️  {warning_msg}")
+                warnings.append(warning_msg)
+        else:
+            print(f"   ✅ Within similarity bounds - good differentiation")
         
-        return {
+        if COMPETITOR_LIBRARY_ENABLED:
+            COMPETITOR_LIBRARY.add(product_model, product_b_model)
+        
+        result = {
             "product_b_model": product_b_model,
             "agent_trace": ["product_b_generator_agent"],
             "timestamp": datetime.now().isoformat()
         }
+        if warnings:
+            result["warnings"] = warnings
+        return result
         
+    except CircuitOpenError:
+        # Provider degraded - skip instead of waiting on timeouts
+        warning_msg = "LLM circuit open - Product B generation skipped"
+        print(f"⚠️  Warning: {warning_msg}")
+        return {
+            "warnings": [warning_msg],
+            "agent_trace": ["product_b_generator_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
     except json.JSONDecodeError as e:
         error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
         print(f"❌ Error: {error_msg}")
@@ -159,6 +228,83 @@ Generate Product B - a realistic competitor product that:
         }
 
 
+def _repair_product_b(
+    product_a: ProductModel,
+    product_b: ProductModel,
+    offending_fields: List[str]
+) -> Tuple[ProductModel, List[str]]:
+    """
+    Fix only the offending Product B fields
+    
+    Category and price are corrected locally; ingredients, benefits and audience
+    are rewritten with a small targeted LLM call instead of regenerating Product B.
+    The repair is best-effort: if the LLM call fails or returns fields that do
+    not validate, the unrepaired Product B is kept with a warning.
+    
+    Returns:
+        (Product B, warnings)
+    """
+    updates: Dict[str, Any] = {}
+    
+    if "category" in offending_fields:
+        updates["category"] = product_a.category
+    
+    if "price" in offending_fields:
+        direction = 1 if product_b.price >= product_a.price else -1
+        updates["price"] = round(product_a.price * (1 + direction * PRODUCT_B_REPAIR_PRICE_DIFFERENCE), 2)
+    
+    llm_fields = [field for field in offending_fields if field in LLM_REPAIRABLE_FIELDS]
+    try:
+        if llm_fields:
+            updates.update(_repair_fields_with_llm(product_a, product_b, llm_fields))
+        if not updates:
+            return product_b, []
+        
+        repaired_data = product_b.model_dump(exclude={"field_count", "completeness_score"})
+        repaired_data.update(updates)
+        return ProductModel(**repaired_data), []
+    except LLM_ERRORS + (json.JSONDecodeError, ValidationError, TypeError, KeyError) as e:
+        warning_msg = f"Product B repair failed, keeping the generated competitor: {e}"
+        print(f"   ⚠️  {warning_msg}")
+        return product_b, [warning_msg]
+
+
+def _repair_fields_with_llm(
+    product_a: ProductModel,
+    product_b: ProductModel,
+    fields: List[str]
+) -> Dict[str, Any]:
+    """Ask the LLM to rewrite just the given Product B fields"""
+    field_rules = {
+        "key_ingredients": "key_ingredients: list of {\"name\", \"concentration\", \"purpose\"}, NONE of Product A's ingredients",
+        "benefits": "benefits: list of strings, comparable to Product A's benefits but not identical",
+        "target_audience": "target_audience: list of strings, overlapping at least partly with Product A's audience"
+    }
+    rules = "\n".join(f"- {field_rules[field]}" for field in fields)
+    
+    prompt = f"""Product A:
+{_build_product_context(product_a)}
+
+Product B (competitor):
+{_build_product_context(product_b)}
+
+Rewrite ONLY these Product B fields so it is a realistic, comparable competitor:
+{rules}
+
+Return ONLY a JSON object containing exactly these keys: {', '.join(fields)}"""
+    
+    print("🤖 Calling LLM to repair Product B fields...")
+    response_text = invoke_llm([HumanMessage(content=prompt)])
+    
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    
+    repaired = json.loads(response_text)
+    return {field: repaired[field] for field in fields if field in repaired}
+
+
 def _build_product_context(product: ProductModel) -> str:
     """Build product context for LLM prompt"""
     context_parts = [
@@ -185,6 +331,9 @@ AGENT_INFO = {
     "name": "Product B Generator Agent (LLM-Powered)",
     "responsibility": "Generate fictional competitor product for comparison",
     "reads_from_state": ["product_model"],
+    "reads_product_fields": [
+        "name", "price", "currency", "category", "key_ingredients", "benefits", "target_audience"
+    ],
     "writes_to_state": ["product_b_model", "agent_trace"],
     "dependencies": ["data_parser_agent"]
 }
\ No newline at end of file
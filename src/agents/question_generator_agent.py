@@ -7,14 +7,44 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import json
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.models.product_model import ProductModel
 from src.models.question_model import QuestionModel
 from src.models.state_model import WorkflowState
-from src.config import MIN_QUESTIONS, QUESTION_CATEGORIES, OPENAI_MODEL, OPENAI_TEMPERATURE
+from src.utils.llm_client import invoke_llm, LLM_ERRORS
+from src.utils.circuit_breaker import CircuitOpenError
+from src.content_logic.template_questions import generate_template_questions
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB
+from src.content_logic.question_dedup import dedupe_questions, QUESTION_INDEX
+from src.config import (
+    MIN_QUESTIONS, QUESTION_CATEGORIES, TEMPLATE_QUESTION_CATEGORIES, INGREDIENT_KB_ENABLED,
+    QUESTION_DEDUP_ENABLED, QUESTION_TOP_UP_ROUNDS
+)
+
+
+# ProductModel fields a question can relate to
+PRODUCT_FIELDS = [
+    "name", "price", "currency", "category", "key_ingredients", "benefits",
+    "usage_instructions", "side_effects", "target_audience", "custom_fields"
+]
+
+# Common LLM variations of the field names above
+RELATED_FIELD_ALIASES = {
+    "ingredients": "key_ingredients",
+    "ingredient": "key_ingredients",
+    "usage": "usage_instructions",
+    "instructions": "usage_instructions",
+    "side_effect": "side_effects",
+    "warnings": "side_effects",
+    "safety": "side_effects",
+    "audience": "target_audience",
+    "benefit": "benefits",
+    "cost": "price",
+    "product_name": "name"
+}
 
 
 def generate_questions(state: WorkflowState) -> Dict[str, Any]:
@@ -24,7 +54,12 @@ def generate_questions(state: WorkflowState) -> Dict[str, Any]:
     Reads: product_model from state
     Writes: questions, questions_by_category, agent_trace
     
-    Uses LLM to generate contextual questions based on product data
+    Answers field-lookup categories with the template engine and uses the LLM
+    only for the remaining categories. Paraphrased duplicate LLM questions
+    are dropped and only the missing count is requested again. On incremental
+    runs, only previous answers whose related_fields changed (or that mention
+    the previous product's name) are re-answered; a price change only
+    rewrites the price mentioned in previous answers.
     """
     print("\n❓ Question Generator Agent: Starting...")
     
@@ -39,25 +74,214 @@ def generate_questions(state: WorkflowState) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat()
         }
     
+    # Field-lookup categories are answered without the LLM; ingredient
+    # descriptions come from the shared knowledge base (LLM only for unseen ones)
+    ingredient_knowledge = {}
+    if INGREDIENT_KB_ENABLED and product_model.key_ingredients:
+        ingredient_knowledge = INGREDIENT_KB.ensure([ing.name for ing in product_model.key_ingredients])
+    template_questions = generate_template_questions(product_model, ingredient_knowledge)
+    print(f"📋 Template engine answered {len(template_questions)} questions")
+    
+    # Incremental run: keep previous LLM answers whose related fields are unchanged
+    changed_fields = state.get("changed_fields")
+    previous_outputs = state.get("previous_outputs") or {}
+    previous_questions = previous_outputs.get("questions") or []
+    previous_llm_questions = [q for q in previous_questions if q.generated_from == "llm"]
+    previous_product = previous_outputs.get("product_model")
+    
+    llm_categories = [c for c in QUESTION_CATEGORIES if c not in TEMPLATE_QUESTION_CATEGORIES]
+    llm_count = max(MIN_QUESTIONS - len(template_questions), 0)
+    
     try:
-        # Initialize LLM
-        llm = ChatOpenAI(
-            model=OPENAI_MODEL,
-            temperature=OPENAI_TEMPERATURE
-        )
+        if changed_fields is not None and previous_llm_questions:
+            return _refresh_llm_questions(
+                product_model, template_questions, previous_llm_questions, changed_fields,
+                previous_name=previous_product.name if previous_product else None,
+                previous_price=previous_product.price
+                if previous_product and previous_product.currency == product_model.currency else None
+            )
+        
+        llm_questions = []
+        warnings = []
         
-        # Build product context for prompt
-        product_context = _build_product_context(product_model)
+        if llm_count > 0:
+            llm_questions = _request_llm_questions(product_model, llm_count, llm_categories)
+            
+            # Paraphrases of template answers or of each other waste FAQ slots
+            if QUESTION_DEDUP_ENABLED:
+                llm_questions, warnings = _replace_duplicate_questions(
+                    product_model, template_questions, llm_questions, llm_count, llm_categories
+                )
+        
+        result = _build_questions_result(_with_canonical_ids(template_questions + llm_questions, product_model))
+        if warnings:
+            result["warnings"] = warnings
+        return result
         
-        # Create prompt
-        system_prompt = f"""You are an expert question generator for product information.
+    except CircuitOpenError:
+        # Provider degraded - serve template questions instead of waiting on timeouts
+        warning_msg = "LLM circuit open - using template questions only"
+        print(f"⚠️  Warning: {warning_msg}")
+        result = _build_questions_result(_with_canonical_ids(template_questions, product_model))
+        result["warnings"] = [warning_msg]
+        return result
+    except LLM_ERRORS as e:
+        # Timeouts and provider errors before the circuit opens get the same fallback
+        warning_msg = f"LLM call failed ({e}) - using template questions only"
+        print(f"⚠️  Warning: {warning_msg}")
+        result = _build_questions_result(_with_canonical_ids(template_questions, product_model))
+        result["warnings"] = [warning_msg]
+        return result
+    except json.JSONDecodeError as e:
+        error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
+        print(f"❌ Error: {error_msg}")
+        return {
+            "errors": [error_msg],
+            "agent_trace": ["question_generator_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        error_msg = f"Failed to generate questions: {str(e)}"
+        print(f"❌ Error: {error_msg}")
+        return {
+            "errors": [error_msg],
+            "agent_trace": ["question_generator_agent"],
+            "timestamp": datetime.now().isoformat()
+        }
 
-Your task: Generate {MIN_QUESTIONS} diverse, user-focused questions about the given product with accurate answers.
+
+def _refresh_llm_questions(
+    product_model: ProductModel,
+    template_questions: List[QuestionModel],
+    previous_llm_questions: List[QuestionModel],
+    changed_fields: List[str],
+    previous_name: Optional[str] = None,
+    previous_price: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Re-answer only the previous LLM questions affected by the changed fields
+    
+    A question is stale when its related_fields intersect changed_fields (or
+    when it has no related_fields). When the previous product had another
+    name (a rename, or a near-duplicate adapting its representative's
+    outputs), every question mentioning that name is stale too. Stale
+    questions are rewritten against the current product and re-answered
+    together in one compact LLM request; the rest are kept as-is. If that
+    request fails, stale questions keep their previous text and answer.
+    Any mention of the previous name left afterwards is replaced with the
+    current one.
+    
+    A price change in the same currency (previous_price given) does not make
+    questions stale: mentions of the previous price are replaced with the
+    current one, so a price-only edit needs no LLM call.
+    """
+    renamed = bool(previous_name) and previous_name != product_model.name
+    previous_name_pattern = re.compile(re.escape(previous_name), re.IGNORECASE) if renamed else None
+    
+    changed = set(changed_fields)
+    previous_price_pattern = None
+    if previous_price is not None and "price" in changed:
+        changed.discard("price")
+        if previous_price != product_model.price:
+            previous_price_pattern = _price_pattern(previous_price)
+    
+    stale = [
+        q for q in previous_llm_questions
+        if (changed and not q.related_fields) or changed & set(q.related_fields)
+        or (previous_name_pattern and previous_name_pattern.search(q.question_text + "\n" + q.answer))
+    ]
+    
+    print(f"♻️  Reusing {len(previous_llm_questions) - len(stale)} previous answers, "
+          f"re-answering {len(stale)}")
+    
+    refreshed = {}
+    warnings = []
+    
+    if stale:
+        try:
+            for question, (question_text, answer) in zip(stale, _reanswer_questions(product_model, stale)):
+                refreshed[id(question)] = _rewritten_question(question, question_text, answer)
+        except LLM_ERRORS + (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            warning_msg = f"Could not re-answer {len(stale)} stale questions, keeping previous answers: {e}"
+            print(f"⚠️  Warning: {warning_msg}")
+            warnings.append(warning_msg)
+    
+    llm_questions = [refreshed.get(id(question), question) for question in previous_llm_questions]
+    
+    if previous_name_pattern:
+        def current_name(text: str) -> str:
+            return previous_name_pattern.sub(lambda _: product_model.name, text)
+        
+        llm_questions = [
+            _rewritten_question(q, current_name(q.question_text), current_name(q.answer))
+            if previous_name_pattern.search(q.question_text + "\n" + q.answer) else q
+            for q in llm_questions
+        ]
+    
+    if previous_price_pattern:
+        def current_price(text: str) -> str:
+            return previous_price_pattern.sub(lambda match: _format_price_like(match.group(0), product_model.price), text)
+        
+        llm_questions = [
+            _rewritten_question(q, current_price(q.question_text), current_price(q.answer))
+            if previous_price_pattern.search(q.question_text + "\n" + q.answer) else q
+            for q in llm_questions
+        ]
+    
+    result = _build_questions_result(_with_canonical_ids(template_questions + llm_questions, product_model))
+    if warnings:
+        result["warnings"] = warnings
+    return result
+
+
+def _price_pattern(price: float) -> re.Pattern:
+    """Mentions of a price as a whole number ("699", "1,299", "699.00"), not inside other numbers"""
+    whole, cents = f"{price:.2f}".split(".")
+    grouped = f"{int(whole):,}"
+    amount = f"(?:{re.escape(grouped)}|{whole})" if grouped != whole else whole
+    decimals = rf"\.{cents}" if cents != "00" else r"(?:\.00?)?"
+    return re.compile(rf"(?<![\d.,]){amount}{decimals}(?![\d]|[.,]\d)")
+
+
+def _format_price_like(mention: str, price: float) -> str:
+    """The price written the way a previous mention was (thousands separators, decimals)"""
+    decimals = len(mention.split(".")[1]) if "." in mention else (0 if float(price).is_integer() else 2)
+    return f"{price:,.{decimals}f}" if "," in mention else f"{price:.{decimals}f}"
+
+
+def _rewritten_question(question: QuestionModel, question_text: str, answer: str) -> QuestionModel:
+    """The question with new text and answer (question_id follows the new text)"""
+    return QuestionModel(
+        **question.model_dump(exclude={"question_text", "answer", "question_id", "created_at"}),
+        question_text=question_text,
+        answer=answer
+    )
+
+
+def _request_llm_questions(
+    product_model: ProductModel,
+    llm_count: int,
+    llm_categories: List[str],
+    existing_questions: Optional[List[QuestionModel]] = None
+) -> List[QuestionModel]:
+    """
+    Ask the LLM for llm_count questions with answers
+    
+    existing_questions are listed in the prompt so a follow-up request does
+    not repeat them. Raises json.JSONDecodeError on an unparseable reply.
+    """
+    # Build product context for prompt
+    product_context = _build_product_context(product_model)
+    
+    # Create prompt
+    system_prompt = f"""You are an expert question generator for product information.
+
+Your task: Generate {llm_count} diverse, user-focused questions about the given product with accurate answers.
 
 REQUIREMENTS:
-1. Generate EXACTLY {MIN_QUESTIONS} or more questions
+1. Generate EXACTLY {llm_count} or more questions
 2. Each question must have a clear, accurate answer based ONLY on the provided product data
-3. Distribute questions across these categories: {', '.join(QUESTION_CATEGORIES)}
+3. Distribute questions across these categories: {', '.join(llm_categories)}
 4. Questions should be natural and user-focused (what real customers would ask)
 5. Answers must be factual, concise, and derived from product information
 6. If data is missing for a question, provide a generic but helpful answer
@@ -75,91 +299,190 @@ OUTPUT FORMAT (strict JSON):
   ]
 }}
 
-VALID CATEGORIES: {', '.join(QUESTION_CATEGORIES)}
+VALID CATEGORIES: {', '.join(llm_categories)}
+VALID RELATED FIELDS: {', '.join(PRODUCT_FIELDS)}
 
 Return ONLY the JSON object, no other text."""
 
-        user_prompt = f"""Product Information:
+    user_prompt = f"""Product Information:
 {product_context}
 
-Generate {MIN_QUESTIONS} comprehensive questions with answers for this product."""
+Generate {llm_count} comprehensive questions with answers for this product."""
+    
+    if existing_questions:
+        asked = "\n".join(f"- {q.question_text}" for q in existing_questions)
+        user_prompt += f"""
 
-        # Call LLM
-        print("🤖 Calling LLM to generate questions...")
-        response = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ])
-        
-        # Parse response
-        response_text = response.content.strip()
-        
-        # Extract JSON (handle markdown code blocks)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
+These questions are already answered. Do NOT repeat or rephrase them:
+{asked}"""
+
+    # Call LLM
+    print(f"🤖 Calling LLM to generate {llm_count} questions...")
+    response_text = invoke_llm([
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt)
+    ])
+    
+    # Extract JSON (handle markdown code blocks)
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    
+    try:
         questions_data = json.loads(response_text)
+    except json.JSONDecodeError:
+        print(f"Raw response: {response_text[:500]}")
+        raise
+    
+    # Convert to QuestionModel objects
+    llm_questions = []
+    for q_data in questions_data.get("questions", []):
+        try:
+            question = QuestionModel(
+                question_text=q_data["question_text"],
+                answer=q_data["answer"],
+                category=q_data["category"],
+                related_fields=_normalize_related_fields(q_data.get("related_fields", [])),
+                priority=q_data.get("priority", "medium"),
+                generated_from="llm"
+            )
+            llm_questions.append(question)
+        except Exception as e:
+            print(f"⚠️  Skipping invalid question: {e}")
+            continue
+    
+    return llm_questions
+
+
+def _replace_duplicate_questions(
+    product_model: ProductModel,
+    template_questions: List[QuestionModel],
+    llm_questions: List[QuestionModel],
+    llm_count: int,
+    llm_categories: List[str]
+) -> Tuple[List[QuestionModel], List[str]]:
+    """
+    Drop paraphrased LLM questions and request only the missing count again
+    
+    Template questions are never dropped. Up to QUESTION_TOP_UP_ROUNDS
+    follow-up requests are made; if one fails, the questions kept so far
+    are returned with a warning.
+    
+    Returns:
+        (unique LLM questions, warnings)
+    """
+    kept, dropped = dedupe_questions(llm_questions, product_model.name, existing=template_questions)
+    warnings = []
+    rounds = 0
+    
+    while dropped:
+        print(f"🧹 Dropped {len(dropped)} duplicate questions")
+        missing = llm_count - len(kept)
+        if missing <= 0 or rounds >= QUESTION_TOP_UP_ROUNDS:
+            break
+        rounds += 1
         
-        # Convert to QuestionModel objects
-        questions = []
-        for q_data in questions_data.get("questions", []):
-            try:
-                question = QuestionModel(
-                    question_text=q_data["question_text"],
-                    answer=q_data["answer"],
-                    category=q_data["category"],
-                    related_fields=q_data.get("related_fields", []),
-                    priority=q_data.get("priority", "medium"),
-                    generated_from="llm"
-                )
-                questions.append(question)
-            except Exception as e:
-                print(f"⚠️  Skipping invalid question: {e}")
-                continue
-        
-        if len(questions) < MIN_QUESTIONS:
-            warning_msg = f"Generated {len(questions)} questions, expected {MIN_QUESTIONS}"
+        try:
+            extra = _request_llm_questions(
+                product_model, missing, llm_categories, existing_questions=template_questions + kept
+            )
+        except LLM_ERRORS + (json.JSONDecodeError,) as e:
+            warning_msg = f"Could not replace {missing} duplicate questions: {e}"
             print(f"⚠️  Warning: {warning_msg}")
-            # Don't fail, just warn
-        
-        # Organize by category
-        questions_by_category = {}
-        for question in questions:
-            category = question.category
-            if category not in questions_by_category:
-                questions_by_category[category] = []
-            questions_by_category[category].append(question)
-        
-        print(f"✅ Generated {len(questions)} questions across {len(questions_by_category)} categories")
-        for category, cat_questions in questions_by_category.items():
-            print(f"   {category}: {len(cat_questions)} questions")
+            warnings.append(warning_msg)
+            break
         
-        return {
-            "questions": questions,
-            "questions_by_category": questions_by_category,
-            "agent_trace": ["question_generator_agent"],
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except json.JSONDecodeError as e:
-        error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
-        print(f"❌ Error: {error_msg}")
-        print(f"Raw response: {response_text[:500]}")
-        return {
-            "errors": [error_msg],
-            "agent_trace": ["question_generator_agent"],
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        error_msg = f"Failed to generate questions: {str(e)}"
-        print(f"❌ Error: {error_msg}")
-        return {
-            "errors": [error_msg],
-            "agent_trace": ["question_generator_agent"],
-            "timestamp": datetime.now().isoformat()
-        }
+        new_questions, dropped = dedupe_questions(
+            extra, product_model.name, existing=template_questions + kept
+        )
+        kept.extend(new_questions)
+    
+    return kept, warnings
+
+
+def _with_canonical_ids(questions: List[QuestionModel], product_model: ProductModel) -> List[QuestionModel]:
+    """Tag questions with their catalog-wide canonical question form"""
+    if not QUESTION_DEDUP_ENABLED:
+        return questions
+    return QUESTION_INDEX.assign(questions, product_model.name)
+
+
+def _reanswer_questions(product_model: ProductModel, questions: List[QuestionModel]) -> List[Tuple[str, str]]:
+    """
+    Rewrite and answer a list of existing questions in a single LLM call
+    
+    Question texts are brought in line with the current product (name, price,
+    details) without changing what they ask. Returns (question_text, answer)
+    pairs in order; raises KeyError when the reply does not cover every question.
+    """
+    numbered = "\n".join(f"{i}. {q.question_text}" for i, q in enumerate(questions, 1))
+    
+    prompt = f"""Product Information:
+{_build_product_context(product_model)}
+
+Answer each question below accurately and concisely using ONLY the product information above.
+If a question mentions a product name, price or detail that differs from the product information,
+rewrite the question to match it without changing what it asks; otherwise keep the question as is.
+
+Questions:
+{numbered}
+
+Return ONLY a JSON object: {{"questions": [{{"question_text": "question 1", "answer": "answer to question 1"}}, ...]}}"""
+    
+    print(f"🤖 Calling LLM to re-answer {len(questions)} questions...")
+    response_text = invoke_llm([HumanMessage(content=prompt)])
+    
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    
+    answered = json.loads(response_text)["questions"]
+    if len(answered) != len(questions):
+        raise KeyError(f"expected {len(questions)} answers, got {len(answered)}")
+    return [
+        (str(item.get("question_text") or question.question_text), str(item["answer"]))
+        for question, item in zip(questions, answered)
+    ]
+
+
+def _normalize_related_fields(fields: List[str]) -> List[str]:
+    """Map loose field names from the LLM onto ProductModel field names"""
+    normalized = []
+    for field in fields:
+        key = str(field).strip().lower().replace(" ", "_")
+        key = RELATED_FIELD_ALIASES.get(key, key)
+        if key not in normalized:
+            normalized.append(key)
+    return normalized
+
+
+def _build_questions_result(questions: List[QuestionModel]) -> Dict[str, Any]:
+    """Organize questions by category and build the state update"""
+    if len(questions) < MIN_QUESTIONS:
+        warning_msg = f"Generated {len(questions)} questions, expected {MIN_QUESTIONS}"
+        print(f"⚠️  Warning: {warning_msg}")
+        # Don't fail, just warn
+    
+    # Organize by category
+    questions_by_category = {}
+    for question in questions:
+        category = question.category
+        if category not in questions_by_category:
+            questions_by_category[category] = []
+        questions_by_category[category].append(question)
+    
+    print(f"✅ Generated {len(questions)} questions across {len(questions_by_category)} categories")
+    for category, cat_questions in questions_by_category.items():
+        print(f"   {category}: {len(cat_questions)} questions")
+    
+    return {
+        "questions": questions,
+        "questions_by_category": questions_by_category,
+        "agent_trace": ["question_generator_agent"],
+        "timestamp": datetime.now().isoformat()
+    }
 
 
 def _build_product_context(product: ProductModel) -> str:
@@ -207,6 +530,7 @@ AGENT_INFO = {
     "name": "Question Generator Agent (LLM-Powered)",
     "responsibility": "Generate contextual questions with answers using AI",
     "reads_from_state": ["product_model"],
+    "reads_product_fields": PRODUCT_FIELDS,
     "writes_to_state": ["questions", "questions_by_category", "agent_trace"],
     "dependencies": ["data_parser_agent"]
 }
\ No newline at end of file
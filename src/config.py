@@ -27,6 +27,19 @@ OPENAI_MODEL = "gpt-4o-mini"  # Model for all LLM calls
 OPENAI_TEMPERATURE = 0.7  # Balance between creativity and consistency
 OPENAI_MAX_TOKENS = 2000  # Maximum response length
 
+# LLM resilience settings
+LLM_REQUEST_TIMEOUT = 30  # Seconds before a single LLM request is abandoned
+LLM_MAX_RETRIES = 1  # Client-side retries per request (breaker handles sustained outages)
+LLM_RESPONSE_CACHE_SIZE = 512  # Successful responses kept as fallback while the circuit is open
+CIRCUIT_BREAKER_FAILURE_RATIO = 0.5  # Error ratio (0-1) in the rolling window that opens the circuit
+CIRCUIT_BREAKER_WINDOW_SIZE = 20  # Number of recent calls considered
+CIRCUIT_BREAKER_MIN_CALLS = 5  # Minimum calls in the window before the circuit may open
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # Seconds the circuit stays open before a half-open probe
+
+# Batch settings
+BATCH_MAX_WORKERS = 4  # Products processed concurrently by run_batch_workflow
+REBUILD_CHUNKS_PER_WORKER = 4  # Work chunks per process when rebuilding pages from the store
+
 # Question generation settings
 MIN_QUESTIONS = 15  # Minimum questions to generate
 QUESTION_CATEGORIES = [
@@ -47,8 +60,79 @@ QUESTION_CATEGORIES = [
     "Concerns"
 ]
 
+# Categories answered by the template engine (pure field lookups, no LLM call)
+TEMPLATE_QUESTION_CATEGORIES = [
+    "Purchase",
+    "Storage",
+    "Usage",
+    "Safety",
+    "Ingredients",
+    "Value"
+]
+MAX_TEMPLATE_INGREDIENT_QUESTIONS = 3  # Per-ingredient "what does X do" questions
+
 # Product B generation settings
 PRODUCT_B_SIMILARITY_THRESHOLD = 0.6  # How similar Product B should be (0-1)
+PRODUCT_B_MAX_PRICE_DIFFERENCE = 0.4  # Max relative price gap between Product A and B
+PRODUCT_B_SIMILARITY_TOLERANCE = 0.25  # Accepted score range: threshold ± tolerance
+PRODUCT_B_REPAIR_PRICE_DIFFERENCE = 0.3  # Relative gap used when repairing an out-of-range price
+SIMILARITY_WEIGHTS = {
+    "category": 0.3,
+    "target_audience": 0.2,
+    "price": 0.2,
+    "benefits": 0.15,
+    "key_ingredients": 0.15
+}
+
+# Persistent store (caches and libraries reused across runs)
+STORE_DIR = OUTPUTS_DIR / "_store"
+PRODUCT_STORE_DIR = STORE_DIR / "products"  # Last snapshot per product for incremental runs
+
+# Block cache settings (content-addressed blocks shared across products)
+BLOCK_CACHE_ENABLED = True
+BLOCK_CACHE_DIR = STORE_DIR / "blocks"
+BLOCK_CACHE_MEMORY_SIZE = 2048  # Blocks kept in memory in front of the disk cache
+
+# Ingredient knowledge base settings (one LLM description per unseen ingredient)
+INGREDIENT_KB_ENABLED = True
+INGREDIENT_KB_FILE = STORE_DIR / "ingredient_knowledge.json"
+
+# Competitor library settings (reuse past Product B outputs)
+COMPETITOR_LIBRARY_ENABLED = True
+COMPETITOR_LIBRARY_FILE = STORE_DIR / "competitor_library.json"
+COMPETITOR_LIBRARY_MAX_AGE_DAYS = 30  # Entries older than this are regenerated
+COMPETITOR_LIBRARY_MIN_PROFILE_SIMILARITY = 0.5  # Min Jaccard overlap of Product A ingredient profiles
+PRICE_BAND_BASE = 1.25  # Price bands grow geometrically by this factor
+
+# Competitor source: "generated" (fictional Product B via LLM) or "catalog"
+# (closest real product from our own catalog, no LLM call)
+COMPETITOR_SOURCE = "generated"
+CATALOG_COMPETITOR_MIN_SCORE = 0.3  # Below this, fall back to generating Product B
+CATALOG_INDEX_CHUNK_BUDGET = 1_000_000  # Pair scores computed per vectorised block
+
+# Bulk comparison settings (every meaningful pair within a category, no LLM)
+BULK_COMPARISON_MAX_PRICE_DIFFERENCE = 1.0  # Max price gap relative to the cheaper product
+BULK_COMPARISON_CHUNK_BUDGET = 1_000_000  # Pairs whose deltas are held in memory at once
+BULK_COMPARISON_DIR = OUTPUTS_DIR / "comparisons"
+
+# Near-duplicate detection (MinHash + LSH over normalised product fields).
+# The batch runner generates once per cluster and adapts the output to each variant.
+NEAR_DUPLICATE_ENABLED = True
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Min estimated Jaccard similarity of product shingles
+NEAR_DUPLICATE_NUM_PERM = 128  # MinHash signature length
+NEAR_DUPLICATE_BANDS = 32  # LSH bands (rows per band = NUM_PERM / BANDS)
+
+# Question deduplication: paraphrased duplicates are dropped and only the
+# missing count is requested again; a catalog-wide index keeps canonical forms
+QUESTION_DEDUP_ENABLED = True
+QUESTION_DEDUP_THRESHOLD = 0.6  # Min Jaccard similarity of question shingles
+QUESTION_TOP_UP_ROUNDS = 1  # Follow-up LLM requests to replace dropped duplicates
+QUESTION_INDEX_FILE = STORE_DIR / "canonical_questions.json"
+
+# FAQ search index (SQLite FTS5 over every product's FAQ entries, updated as pages are written)
+FAQ_INDEX_ENABLED = True
+FAQ_INDEX_FILE = STORE_DIR / "faq_index.sqlite3"
+FAQ_SEARCH_DEFAULT_LIMIT = 10
 
 # Content block types
 CONTENT_BLOCK_TYPES = [
@@ -65,4 +149,30 @@ CONTENT_BLOCK_TYPES = [
 # Output file names
 FAQ_OUTPUT_FILE = "faq.json"
 PRODUCT_PAGE_OUTPUT_FILE = "product_page.json"
-COMPARISON_OUTPUT_FILE = "comparison_page.json"
\ No newline at end of file
+COMPARISON_OUTPUT_FILE = "comparison_page.json"
+
+# Output layout: OUTPUTS_DIR/products/<shard>/<product_id>/<run_id>/<file>
+OUTPUT_PRODUCTS_DIR = OUTPUTS_DIR / "products"
+OUTPUT_SHARD_WIDTH = 2  # Hex characters of the product ID hash per shard directory (256 shards)
+OUTPUT_RUNS_TO_KEEP = 5  # Newest run directories kept per product
+OUTPUT_SKIP_UNCHANGED = True  # Hard-link pages whose content hash matches the previous run instead of rewriting them
+OUTPUT_PATCHES_ENABLED = True  # Write an RFC 6902 patch from the previous run next to every changed page
+OUTPUT_CHANGES_DIR = OUTPUTS_DIR / "changes"  # <run_id>.json: product IDs whose pages changed in a catalog run
+OUTPUT_MANIFEST_DIR = OUTPUTS_DIR / "manifests"  # <run_id>.json: every page of a catalog run with hash, size and version
+OUTPUT_COMPACT_JSON = False  # Write pages without indentation (smaller files for machine consumers)
+
+# Catalog runs (batch / rebuild) can append to one shared sink per run instead of writing files
+OUTPUT_SINK = "files"  # "files" (per-product run directories), "jsonl" (rolling shards), "archive" (one zip per run) or "sqlite" (result store)
+JSONL_OUTPUT_DIR = OUTPUTS_DIR / "jsonl"  # <run_id>/part-NNNNN.jsonl[.gz] plus index.json
+JSONL_SHARD_MAX_BYTES = 256 * 1024 * 1024  # A new shard is started (and the last one fsynced) past this size
+JSONL_COMPRESS = False  # gzip each record (shards become .jsonl.gz, still randomly accessible)
+JSONL_GZIP_LEVEL = 6
+JSONL_BUFFER_SIZE = 1024 * 1024  # Write buffer per open shard
+ARCHIVE_OUTPUT_DIR = OUTPUTS_DIR / "archives"  # <run_id>.zip with an index.json member for random access by product
+ARCHIVE_COMPRESS = False  # Deflate pages (smaller archive; reads decompress instead of slicing the memory map)
+RESULT_STORE_FILE = OUTPUTS_DIR / "results.sqlite3"  # Pages, content blocks and run metadata of every "sqlite" run
+RESULT_STORE_BATCH_SIZE = 500  # Products inserted per transaction
+
+# Static HTML rendering (optional workflow stage after the output formatter; templates in TEMPLATES_DIR)
+HTML_RENDERING_ENABLED = False
+HTML_OUTPUT_DIR = OUTPUTS_DIR / "site"  # <product_id>/<page>.html, always the latest pages
\ No newline at end of file
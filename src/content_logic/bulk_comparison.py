@@ -0,0 +1,243 @@
+"""
+Bulk Comparison Engine
+Comparison pages for every meaningful pair of products within a category,
+computed from encoded feature matrices without any LLM call
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from typing import Dict, Any, Iterable, List, Tuple
+import numpy as np
+from src.models.product_model import ProductModel
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB
+from src.agents.comparison_page_builder_agent import (
+    _build_product_summary, _assemble_comparison_page, _generate_recommendations
+)
+from src.config import BULK_COMPARISON_MAX_PRICE_DIFFERENCE, BULK_COMPARISON_CHUNK_BUDGET, INGREDIENT_KB_ENABLED
+
+
+def build_bulk_comparison_pages(
+    products: Iterable[ProductModel],
+    max_price_difference: float = BULK_COMPARISON_MAX_PRICE_DIFFERENCE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Comparison pages for all pairs within each (category, currency) group
+
+    A pair is meaningful when the price gap, relative to the cheaper
+    product, is at most max_price_difference. Pages use the same format as
+    build_comparison_page.
+
+    Returns:
+        Category → list of comparison pages
+    """
+    groups: Dict[Tuple[str, str], List[ProductModel]] = {}
+    for product in products:
+        key = ((product.category or "general").strip().lower(), product.currency)
+        groups.setdefault(key, []).append(product)
+
+    pages: Dict[str, List[Dict[str, Any]]] = {}
+    for (category, _), group in sorted(groups.items()):
+        if len(group) < 2:
+            continue
+        pages.setdefault(category, []).extend(_group_pages(group, max_price_difference))
+    return pages
+
+
+def comparison_matrix(products: List[ProductModel]) -> Dict[str, np.ndarray]:
+    """
+    Pairwise deltas for one group of products (row = product A, column = product B)
+
+    Returns price difference and percentage (B - A, relative to A), common /
+    unique ingredient counts by canonical ID, ingredient similarity (common
+    over the larger list, as in _compare_ingredients) and common / unique
+    benefit counts. The matrices are N×N; build_bulk_comparison_pages
+    computes the same deltas in bounded chunks instead.
+    """
+    ingredients, _ = _encode(products, _ingredient_ids)
+    benefits, _ = _encode(products, lambda product: product.benefits or [])
+    prices = np.array([product.price for product in products], dtype=np.float64)
+    everything = slice(0, len(products))
+    return _pair_deltas(prices, ingredients, benefits, everything, everything)
+
+
+def _pair_deltas(
+    prices: np.ndarray,
+    ingredients: np.ndarray,
+    benefits: np.ndarray,
+    rows: slice,
+    columns: slice
+) -> Dict[str, np.ndarray]:
+    """Pairwise counts of rows (product A) against columns (product B), one matrix product per feature"""
+    a_ingredient_sizes = ingredients[rows].sum(axis=1)[:, None]
+    b_ingredient_sizes = ingredients[columns].sum(axis=1)[None, :]
+    a_benefit_sizes = benefits[rows].sum(axis=1)[:, None]
+    b_benefit_sizes = benefits[columns].sum(axis=1)[None, :]
+
+    common_ingredients = ingredients[rows] @ ingredients[columns].T
+    common_benefits = benefits[rows] @ benefits[columns].T
+    price_difference = prices[None, columns] - prices[rows, None]
+
+    return {
+        "price_difference": price_difference,
+        "percentage_difference": price_difference / prices[rows, None] * 100,
+        "common_ingredients": common_ingredients,
+        "a_unique_ingredients": a_ingredient_sizes - common_ingredients,
+        "b_unique_ingredients": b_ingredient_sizes - common_ingredients,
+        "ingredient_similarity": common_ingredients / np.maximum(
+            np.maximum(a_ingredient_sizes, b_ingredient_sizes), 1
+        ),
+        "common_benefits": common_benefits,
+        "a_unique_benefits": a_benefit_sizes - common_benefits,
+        "b_unique_benefits": b_benefit_sizes - common_benefits
+    }
+
+
+def _group_pages(products: List[ProductModel], max_price_difference: float) -> List[Dict[str, Any]]:
+    """
+    Pages for the meaningful pairs of one group
+
+    Products are sorted by price, so the partners of a row are the
+    contiguous columns up to max_price_difference above its price. Deltas
+    are computed for chunks of rows against their price window, at most
+    BULK_COMPARISON_CHUNK_BUDGET pairs at a time, so memory stays bounded
+    however large the category is.
+    """
+    # Stable sort: equal prices keep their input order (earlier product is A)
+    order = sorted(range(len(products)), key=lambda i: products[i].price)
+    products = [products[i] for i in order]
+
+    ingredients, ingredient_vocab = _encode(products, _ingredient_ids)
+    benefits, benefit_vocab = _encode(products, lambda product: product.benefits or [])
+    prices = np.array([product.price for product in products], dtype=np.float64)
+    has_ingredient = ingredients.astype(bool)
+    has_benefit = benefits.astype(bool)
+
+    # First name per canonical ID, as _compare_ingredients shows it
+    names_by_id = [
+        {canonical: names[0] for canonical, names in INGREDIENT_INDEX.group_by_id(
+            ing.name for ing in product.key_ingredients or []
+        ).items()}
+        for product in products
+    ]
+    summaries = [_build_product_summary(product) for product in products]
+    notes_cache: Dict[str, Any] = {}
+
+    pages = []
+    start = 0
+    while start < len(products):
+        # Size the chunk from the first row's window, then shrink it to the
+        # budget once the window of the whole chunk is known
+        high = _window_end(prices, start + 1, max_price_difference)
+        stop = min(len(products), start + max(1, BULK_COMPARISON_CHUNK_BUDGET // max(1, high - start)))
+        high = _window_end(prices, stop, max_price_difference)
+        stop = min(stop, start + max(1, BULK_COMPARISON_CHUNK_BUDGET // max(1, high - start)))
+        high = _window_end(prices, stop, max_price_difference)
+
+        matrix = _pair_deltas(prices, ingredients, benefits, slice(start, stop), slice(start, high))
+
+        # Each unordered pair once (cheaper product as A), within the price gap
+        later = np.arange(start, high)[None, :] > np.arange(start, stop)[:, None]
+        cheaper = np.minimum(prices[start:stop, None], prices[None, start:high])
+        meaningful = later & (np.abs(matrix["price_difference"]) / cheaper <= max_price_difference)
+
+        for row, column in zip(*np.nonzero(meaningful)):
+            a, b = start + row, start + column
+            product_a, product_b = products[a], products[b]
+
+            # Vectorised set operations on the encoded rows
+            common_ids = ingredient_vocab[has_ingredient[a] & has_ingredient[b]]
+            a_only_ids = ingredient_vocab[has_ingredient[a] & ~has_ingredient[b]]
+            b_only_ids = ingredient_vocab[has_ingredient[b] & ~has_ingredient[a]]
+            a_unique = [names_by_id[a][i] for i in a_only_ids]
+            b_unique = [names_by_id[b][i] for i in b_only_ids]
+            similarity = float(matrix["ingredient_similarity"][row, column])
+
+            price_diff = float(matrix["price_difference"][row, column])
+            percent = abs(float(matrix["percentage_difference"][row, column]))
+            cheaper_name = product_a.name if price_diff > 0 else product_b.name
+            more_expensive = product_b.name if price_diff > 0 else product_a.name
+            price_comparison = {
+                "product_a_price": f"{product_a.currency}{product_a.price}",
+                "product_b_price": f"{product_b.currency}{product_b.price}",
+                "difference": f"{product_a.currency}{abs(price_diff)}",
+                "percentage_difference": f"{percent:.1f}%",
+                "cheaper_product": cheaper_name,
+                "more_expensive_product": more_expensive,
+                "analysis": f"{cheaper_name} is {percent:.1f}% cheaper than {more_expensive}."
+            }
+            ingredient_comparison = {
+                "common_ingredients": [names_by_id[a][i] for i in common_ids],
+                "product_a_unique_ingredients": a_unique,
+                "product_b_unique_ingredients": b_unique,
+                "similarity_score": similarity,
+                "ingredient_notes": _ingredient_notes(a_unique + b_unique, notes_cache),
+                "analysis": f"Products share {len(common_ids)} common ingredients. Similarity: {similarity:.0%}."
+            }
+            common_benefits = benefit_vocab[has_benefit[a] & has_benefit[b]]
+            benefit_comparison = {
+                "common_benefits": list(common_benefits),
+                "product_a_unique_benefits": list(benefit_vocab[has_benefit[a] & ~has_benefit[b]]),
+                "product_b_unique_benefits": list(benefit_vocab[has_benefit[b] & ~has_benefit[a]]),
+                "analysis": f"Both products offer {len(common_benefits)} shared benefits."
+            }
+
+            summary = (
+                f"{product_a.name} and {product_b.name} are both {product_a.category or 'products'} options. "
+                f"{cheaper_name} is more affordable with a {percent:.1f}% price difference."
+            )
+            recommendations = _generate_recommendations(
+                product_a, product_b, price_comparison, ingredient_comparison
+            )
+
+            pages.append(_assemble_comparison_page(
+                summaries[a],
+                summaries[b],
+                {
+                    "price": price_comparison,
+                    "ingredients": ingredient_comparison,
+                    "benefits": benefit_comparison,
+                    "summary": summary
+                },
+                recommendations,
+                product_a,
+                product_b
+            ))
+        start = stop
+
+    return pages
+
+
+def _window_end(prices: np.ndarray, stop: int, max_price_difference: float) -> int:
+    """End of the price-sorted columns within the allowed gap above row stop - 1"""
+    return int(np.searchsorted(prices, prices[stop - 1] * (1 + max_price_difference), side="right"))
+
+
+def _ingredient_ids(product: ProductModel) -> List[str]:
+    return [INGREDIENT_INDEX.canonical_id(ing.name) for ing in product.key_ingredients or []]
+
+
+def _encode(products: List[ProductModel], values_of) -> Tuple[np.ndarray, np.ndarray]:
+    """0/1 float32 matrix (products × vocabulary) and the vocabulary array"""
+    rows = [set(values_of(product)) for product in products]
+    vocab = np.array(sorted(set().union(*rows)), dtype=object)
+    positions = {value: i for i, value in enumerate(vocab)}
+
+    encoded = np.zeros((len(products), max(len(vocab), 1)), dtype=np.float32)
+    for row, values in enumerate(rows):
+        encoded[row, [positions[value] for value in values]] = 1.0
+    return encoded[:, :len(vocab)], vocab
+
+
+def _ingredient_notes(names: List[str], cache: Dict[str, Any]) -> Dict[str, str]:
+    """Stored knowledge base purposes (never calls the LLM)"""
+    if not INGREDIENT_KB_ENABLED:
+        return {}
+    notes = {}
+    for name in names:
+        if name not in cache:
+            cache[name] = INGREDIENT_KB.get(name)
+        if cache[name]:
+            notes[name] = cache[name]["purpose"]
+    return notes
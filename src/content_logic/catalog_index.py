@@ -0,0 +1,371 @@
+"""
+Catalog Competitor Index
+Vectorised retrieval of the closest real competitor from our own catalog,
+as an alternative to generating a fictional Product B
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from src.models.product_model import ProductModel
+from src.content_logic.similarity import product_feature_sets
+from src.content_logic.near_duplicates import NearDuplicateIndex, product_shingles
+from src.storage.product_store import PRODUCT_STORE
+from src.config import (
+    SIMILARITY_WEIGHTS, PRODUCT_B_MAX_PRICE_DIFFERENCE, CATALOG_INDEX_CHUNK_BUDGET
+)
+
+
+# Set-valued features, encoded as one bitset matrix each
+FEATURE_FIELDS = ["key_ingredients", "benefits", "target_audience"]
+
+# Rough cost of one shared value found by the sparse join, in dense
+# multiply-adds; above it best_partners multiplies 0/1 matrices instead
+_SPARSE_MATCH_COST = 16
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 word (np.bitwise_count on NumPy >= 2.0)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].reshape(words.shape + (8,)).sum(axis=-1)
+
+
+def _group_key(product: ProductModel) -> Tuple[str, str]:
+    return ((product.category or "general").strip().lower(), product.currency)
+
+
+class CatalogIndex:
+    """
+    Bitset feature matrices over a product catalog
+
+    Products are grouped by (category, currency) and sorted by price inside
+    each group, so a search only scans the contiguous price window allowed
+    by PRODUCT_B_MAX_PRICE_DIFFERENCE. Scores use the same weighted formula
+    as score_product_similarity: Jaccard over ingredients (canonical IDs),
+    benefit words and audience words, plus price similarity. Category
+    always matches inside a group. Near-duplicates of a product (its size
+    variants and relaunches, as found by NearDuplicateIndex) are never its
+    partner.
+    """
+
+    def __init__(self, products: Iterable[ProductModel]):
+        # Last product wins for a repeated product_id
+        by_id = {product.product_id: product for product in products}
+        self.products: List[ProductModel] = list(by_id.values())
+        self._positions = {product.product_id: i for i, product in enumerate(self.products)}
+        self._prices = np.array([product.price for product in self.products], dtype=np.float64)
+        self._partners: Optional[Dict[str, List[Tuple[str, float]]]] = None
+
+        feature_sets = [product_feature_sets(product) for product in self.products]
+        self._vocab: Dict[str, Dict[str, int]] = {}
+        self._bits: Dict[str, np.ndarray] = {}
+        self._sizes: Dict[str, np.ndarray] = {}
+        # Value positions of every row, concatenated, and each row's start (CSR)
+        self._values: Dict[str, np.ndarray] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+        for field in FEATURE_FIELDS:
+            sets = [features[field] for features in feature_sets]
+            vocab = {value: i for i, value in enumerate(sorted(set().union(*sets)))}
+            lengths = np.array([len(values) for values in sets], dtype=np.int64)
+            self._vocab[field] = vocab
+            self._sizes[field] = lengths.astype(np.float64)
+            self._offsets[field] = np.concatenate([[0], np.cumsum(lengths)])
+            self._values[field] = np.fromiter(
+                (vocab[value] for values in sets for value in values), dtype=np.int64, count=int(lengths.sum())
+            )
+            self._bits[field] = self._encode_rows(
+                np.repeat(np.arange(len(sets)), lengths), self._values[field], len(sets), len(vocab)
+            )
+
+        # Near-duplicate cluster per row (the lowest row among its members); a
+        # candidate in the query's cluster is excluded like the query itself
+        self._near_duplicates = NearDuplicateIndex()
+        self._signatures = self._near_duplicates.signatures_of([product_shingles(product) for product in self.products])
+        self._clusters = np.arange(len(self.products), dtype=np.int64)
+        for a, b in self._near_duplicates.similar_pairs(self._signatures).tolist():
+            root_a, root_b = self._cluster_root(a), self._cluster_root(b)
+            self._clusters[max(root_a, root_b)] = min(root_a, root_b)
+        self._clusters = np.array([self._cluster_root(row) for row in range(len(self.products))], dtype=np.int64)
+
+        # Row indices per group, sorted by price
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for i, product in enumerate(self.products):
+            groups.setdefault(_group_key(product), []).append(i)
+        self._groups = {
+            key: np.array(sorted(rows, key=lambda row: self._prices[row]), dtype=np.int64)
+            for key, rows in groups.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def top_k(self, product: ProductModel, k: int = 1) -> List[Tuple[ProductModel, float]]:
+        """Closest catalog products to any product (in the catalog or not), best first"""
+        group = self._groups.get(_group_key(product))
+        if group is None:
+            return []
+
+        features = product_feature_sets(product)
+        intersections = {}
+        for field in FEATURE_FIELDS:
+            query_bits = self._encode(features[field], self._vocab[field])
+            intersections[field] = _popcount(self._bits[field][group] & query_bits).sum(axis=1)[None, :]
+        query_sizes = {field: np.array([len(features[field])], dtype=np.float64) for field in FEATURE_FIELDS}
+
+        rows, scores = self._score_block(
+            np.array([product.price]), query_sizes, intersections, group, np.array([self._cluster_of(product)]), k
+        )
+        return [(self.products[row], float(score)) for row, score in zip(rows[0], scores[0]) if row >= 0]
+
+    def best_partners(self, k: int = 1) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Top-k comparison partners for every catalog product
+
+        Scores are computed in row chunks of at most CATALOG_INDEX_CHUNK_BUDGET
+        pairs. Pairwise feature intersections come from a join on shared
+        values, so pairs without a common value cost nothing; a feature dense
+        enough that most pairs share values falls back to one matrix product
+        of the group's unpacked 0/1 bitsets. The result is kept and used by
+        partner_for.
+        """
+        partners: Dict[str, List[Tuple[str, float]]] = {}
+        for group in self._groups.values():
+            group_prices = self._prices[group]
+            incidence = {field: self._group_incidence(field, group) for field in FEATURE_FIELDS}
+            dense: Dict[str, np.ndarray] = {}
+
+            start = 0
+            while start < len(group):
+                # Size the chunk from the first row's window, then shrink it to
+                # the budget once the window of the whole chunk is known
+                low, high = self._price_window(group_prices, start, start + 1)
+                stop = min(len(group), start + max(1, CATALOG_INDEX_CHUNK_BUDGET // max(1, high - low)))
+                low, high = self._price_window(group_prices, start, stop)
+                stop = min(stop, start + max(1, CATALOG_INDEX_CHUNK_BUDGET // max(1, high - low)))
+                low, high = self._price_window(group_prices, start, stop)
+
+                rows = group[start:stop]
+                rows_found, scores = self._score_block(
+                    self._prices[rows],
+                    {field: self._sizes[field][rows] for field in FEATURE_FIELDS},
+                    {
+                        field: self._chunk_intersections(field, group, incidence[field], dense, start, stop, low, high)
+                        for field in FEATURE_FIELDS
+                    },
+                    group[low:high],
+                    self._clusters[rows],
+                    k
+                )
+                for row, found, found_scores in zip(rows, rows_found, scores):
+                    partners[self.products[row].product_id] = [
+                        (self.products[j].product_id, float(score))
+                        for j, score in zip(found, found_scores) if j >= 0
+                    ]
+                start = stop
+
+        self._partners = partners
+        return partners
+
+    def partner_for(self, product: ProductModel) -> Optional[Tuple[ProductModel, float]]:
+        """Best partner, from best_partners when precomputed, otherwise a single search"""
+        if self._partners is not None and product.product_id in self._partners:
+            found = self._partners[product.product_id]
+            if not found:
+                return None
+            partner_id, score = found[0]
+            return self.products[self._positions[partner_id]], score
+
+        found = self.top_k(product, k=1)
+        return found[0] if found else None
+
+    def _cluster_of(self, product: ProductModel) -> int:
+        """Near-duplicate cluster of any product (-1 if it has no near-duplicate in the catalog)"""
+        position = self._positions.get(product.product_id)
+        if position is not None:
+            return int(self._clusters[position])
+        duplicates = self._near_duplicates.matches(self._near_duplicates.signature(product), self._signatures)
+        return int(self._clusters[duplicates[0]]) if len(duplicates) else -1
+
+    def _cluster_root(self, row: int) -> int:
+        while self._clusters[row] != row:
+            row = self._clusters[row]
+        return int(row)
+
+    def _price_window(self, group_prices: np.ndarray, start: int, stop: int) -> Tuple[int, int]:
+        """Column range of a price-sorted group within the allowed gap of rows start..stop"""
+        low_price = group_prices[start] * (1 - PRODUCT_B_MAX_PRICE_DIFFERENCE)
+        high_price = group_prices[stop - 1] * (1 + PRODUCT_B_MAX_PRICE_DIFFERENCE)
+        return (
+            int(np.searchsorted(group_prices, low_price, side="left")),
+            int(np.searchsorted(group_prices, high_price, side="right"))
+        )
+
+    def _score_block(
+        self,
+        query_prices: np.ndarray,
+        query_sizes: Dict[str, np.ndarray],
+        intersections: Dict[str, np.ndarray],
+        candidates: np.ndarray,
+        query_clusters: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Weighted similarity of query rows against candidate rows, top-k per query
+
+        intersections holds the (queries, candidates) feature overlap counts;
+        query_clusters gives each query's near-duplicate cluster, whose
+        members (the query product included) are not candidates. Returns
+        (candidate row indices, scores), both shaped (queries, k) and padded
+        with -1 / -inf where fewer than k candidates qualify.
+        """
+        n_queries = len(query_prices)
+        if len(candidates) == 0:
+            return np.full((n_queries, k), -1), np.full((n_queries, k), -np.inf)
+
+        # float32 and in-place arithmetic: this is the hot loop over all pairs
+        scores = np.full((n_queries, len(candidates)), SIMILARITY_WEIGHTS["category"], dtype=np.float32)
+        for field in FEATURE_FIELDS:
+            query_size = query_sizes[field].astype(np.float32)
+            candidate_size = self._sizes[field][candidates].astype(np.float32)
+            inter = intersections[field].astype(np.float32, copy=False)
+
+            union = query_size[:, None] + candidate_size[None, :]
+            union -= inter
+            np.maximum(union, 1, out=union)
+            jaccard = np.divide(inter, union, out=union)
+            # Both sets empty counts as identical (as in score_product_similarity)
+            if (query_size == 0).any() and (candidate_size == 0).any():
+                jaccard[np.ix_(query_size == 0, candidate_size == 0)] = 1.0
+            jaccard *= SIMILARITY_WEIGHTS[field]
+            scores += jaccard
+
+        query_price = query_prices.astype(np.float32)[:, None]
+        gap = self._prices[candidates].astype(np.float32)[None, :] - query_price
+        np.abs(gap, out=gap)
+        gap /= query_price
+        price_score = np.maximum(0.0, 1.0 - gap / PRODUCT_B_MAX_PRICE_DIFFERENCE, dtype=np.float32)
+        price_score *= SIMILARITY_WEIGHTS["price"]
+        scores += price_score
+
+        # Outside the price gap, the product itself or one of its variants: not a partner
+        scores[gap > PRODUCT_B_MAX_PRICE_DIFFERENCE] = -np.inf
+        scores[query_clusters[:, None] == self._clusters[candidates][None, :]] = -np.inf
+
+        take = min(k, len(candidates))
+        if take == 1:
+            top = scores.argmax(axis=1)[:, None]
+        else:
+            top = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.round(np.take_along_axis(top_scores, order, axis=1).astype(np.float64), 4)
+
+        rows = np.where(np.isfinite(top_scores), candidates[top], -1)
+        if take < k:
+            rows = np.pad(rows, ((0, 0), (0, k - take)), constant_values=-1)
+            top_scores = np.pad(top_scores, ((0, 0), (0, k - take)), constant_values=-np.inf)
+        return rows, top_scores
+
+    def _group_incidence(self, field: str, group: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        A group's values of a feature for the sparse join in _chunk_intersections
+
+        Returns (row offsets, value positions in row order, sorted keys
+        value * len(group) + row), with rows numbered within the price-sorted
+        group, so the rows holding a value are one contiguous, row-ordered
+        run of keys.
+        """
+        offsets = self._offsets[field]
+        lengths = offsets[group + 1] - offsets[group]
+        starts = np.cumsum(lengths) - lengths
+        values = self._values[field][np.repeat(offsets[group] - starts, lengths) + np.arange(lengths.sum())]
+        rows = np.repeat(np.arange(len(group)), lengths)
+        return np.concatenate([[0], np.cumsum(lengths)]), values, np.sort(values * len(group) + rows)
+
+    def _chunk_intersections(
+        self,
+        field: str,
+        group: np.ndarray,
+        incidence: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        dense: Dict[str, np.ndarray],
+        start: int,
+        stop: int,
+        low: int,
+        high: int
+    ) -> np.ndarray:
+        """
+        Overlap counts of group rows start..stop against group columns low..high
+
+        Each value of a row is looked up in the sorted keys to find the window
+        rows sharing it, and the matches are counted per pair; the dense
+        matrices (cached in dense per group) are only built when the matches
+        would cost more than the matrix product.
+        """
+        row_offsets, values, keys = incidence
+        size, width = len(group), high - low
+        shared = values[row_offsets[start]:row_offsets[stop]]
+        first = np.searchsorted(keys, shared * size + low)
+        counts = np.searchsorted(keys, shared * size + high) - first
+        matches = int(counts.sum())
+
+        if matches * _SPARSE_MATCH_COST > (stop - start) * width * len(self._vocab[field]):
+            if field not in dense:
+                dense[field] = self._dense(field, group)
+            return dense[field][start:stop] @ dense[field][low:high].T
+
+        rows = np.repeat(np.arange(stop - start), np.diff(row_offsets[start:stop + 1]))
+        matched = np.repeat(first - (np.cumsum(counts) - counts), counts) + np.arange(matches)
+        cells = np.repeat(rows, counts) * width + keys[matched] % size - low
+        return np.bincount(cells, minlength=(stop - start) * width).reshape(stop - start, width)
+
+    def _dense(self, field: str, rows: np.ndarray) -> np.ndarray:
+        """0/1 float32 matrix of a feature for the given rows (for BLAS intersections)"""
+        packed = self._bits[field][rows].astype("<u8").view(np.uint8)
+        bits = np.unpackbits(packed, axis=1, bitorder="little")[:, :len(self._vocab[field])]
+        return bits.astype(np.float32)
+
+    @staticmethod
+    def _encode_rows(rows: np.ndarray, positions: np.ndarray, n_rows: int, vocab_size: int) -> np.ndarray:
+        """Bitsets of n_rows value sets given as (row, value position) pairs, packed into uint64 words"""
+        words = np.zeros((n_rows, max(1, (vocab_size + 63) // 64)), dtype=np.uint64)
+        bits = np.left_shift(np.uint64(1), (positions % 64).astype(np.uint64))
+        np.bitwise_or.at(words, (rows, positions // 64), bits)
+        return words
+
+    @staticmethod
+    def _encode(values: Set[str], vocab: Dict[str, int]) -> np.ndarray:
+        """Bitset of the known values, packed into uint64 words"""
+        words = np.zeros(max(1, (len(vocab) + 63) // 64), dtype=np.uint64)
+        for value in values:
+            position = vocab.get(value)
+            if position is not None:
+                words[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+        return words
+
+
+_catalog_index: Optional[CatalogIndex] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog_index() -> CatalogIndex:
+    """Shared index, built from the product store on first use"""
+    global _catalog_index
+    with _catalog_lock:
+        if _catalog_index is None:
+            _catalog_index = CatalogIndex(PRODUCT_STORE.product_models())
+        return _catalog_index
+
+
+def set_catalog_index(index: CatalogIndex) -> None:
+    """Replace the shared index (e.g. with one covering a whole batch)"""
+    global _catalog_index
+    with _catalog_lock:
+        _catalog_index = index
@@ -0,0 +1,191 @@
+"""
+Competitor Library
+Persistent store of generated Product B competitors, reused across products
+with the same category, price band and a similar ingredient profile
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from src.models.product_model import ProductModel
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.content_logic.similarity import score_product_similarity
+from src.storage.output_paths import atomic_write_json
+from src.utils.metrics import METRICS
+from src.config import (
+    COMPETITOR_LIBRARY_FILE, COMPETITOR_LIBRARY_MAX_AGE_DAYS,
+    COMPETITOR_LIBRARY_MIN_PROFILE_SIMILARITY, PRICE_BAND_BASE,
+    PRODUCT_B_MAX_PRICE_DIFFERENCE
+)
+
+
+def price_band(price: float) -> int:
+    """Geometric price band index (neighbouring bands differ by PRICE_BAND_BASE)"""
+    return int(math.floor(math.log(price, PRICE_BAND_BASE)))
+
+
+def ingredient_profile(product: ProductModel) -> List[str]:
+    """Sorted canonical ingredient IDs"""
+    if not product.key_ingredients:
+        return []
+    return sorted(INGREDIENT_INDEX.canonical_ids(ing.name for ing in product.key_ingredients))
+
+
+def _normalize_category(category: Optional[str]) -> str:
+    return (category or "general").strip().lower()
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class CompetitorLibrary:
+    """
+    Competitor products indexed by (category, currency, price band)
+
+    Each entry remembers the Product A it was generated for, so a lookup can
+    check that the new product has a close ingredient profile and that the
+    stored competitor still satisfies the Product B rules (price gap, no
+    ingredient overlap, similarity score in bounds).
+
+    Added entries are kept in memory and written by flush(), once per run
+    or batch, so a catalog run does not rewrite the library per product.
+    """
+
+    def __init__(self, path: Path = COMPETITOR_LIBRARY_FILE, max_age_days: int = COMPETITOR_LIBRARY_MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.max_age = timedelta(days=max_age_days)
+        self._index: Dict[Tuple[str, str, int], List[Dict[str, Any]]] = {}
+        self._source_keys: Dict[str, Tuple[str, str, int]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def lookup(self, product: ProductModel) -> Optional[ProductModel]:
+        """Return a fresh stored competitor that fits the product, or None"""
+        with self._lock:
+            self._ensure_loaded()
+
+            category = _normalize_category(product.category)
+            band = price_band(product.price)
+            profile = set(ingredient_profile(product))
+
+            best_entry = None
+            best_score = -1.0
+
+            for neighbour_band in (band - 1, band, band + 1):
+                for entry in self._index.get((category, product.currency, neighbour_band), []):
+                    if not self._is_fresh(entry):
+                        continue
+
+                    # Re-mapped so profiles stored before an alias was known still match
+                    score = _jaccard(profile, INGREDIENT_INDEX.canonical_ids(entry["ingredient_profile"]))
+                    if score < COMPETITOR_LIBRARY_MIN_PROFILE_SIMILARITY or score <= best_score:
+                        continue
+
+                    competitor = entry["product_b"]
+                    price_gap = abs(competitor["price"] - product.price) / product.price
+                    if price_gap > PRODUCT_B_MAX_PRICE_DIFFERENCE:
+                        continue
+
+                    competitor_ingredients = INGREDIENT_INDEX.canonical_ids(
+                        ing["name"] for ing in competitor.get("key_ingredients") or []
+                    )
+                    if competitor_ingredients & profile:
+                        continue
+
+                    if score_product_similarity(product, ProductModel(**competitor))["offending_fields"]:
+                        continue
+
+                    best_entry = entry
+                    best_score = score
+
+        if best_entry is None:
+            METRICS.increment("competitor_library.misses")
+            return None
+
+        METRICS.increment("competitor_library.hits")
+        return ProductModel(**best_entry["product_b"])
+
+    def add(self, product_a: ProductModel, product_b: ProductModel) -> None:
+        """Store a generated competitor (written by the next flush)"""
+        entry = {
+            "category": _normalize_category(product_a.category),
+            "currency": product_a.currency,
+            "price_band": price_band(product_a.price),
+            "source_product_id": product_a.product_id,
+            "source_price": product_a.price,
+            "ingredient_profile": ingredient_profile(product_a),
+            "product_b": product_b.model_dump(mode="json"),
+            "created_at": datetime.now().isoformat()
+        }
+
+        with self._lock:
+            self._ensure_loaded()
+            self._insert(entry)
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write fresh entries to disk if any were added since the last flush"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [
+                entry for bucket in self._index.values() for entry in bucket
+                if self._is_fresh(entry)
+            ]
+            try:
+                atomic_write_json(self.path, {"entries": entries}, compact=True)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save competitor library: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return sum(len(bucket) for bucket in self._index.values())
+
+    def _insert(self, entry: Dict[str, Any]) -> None:
+        """Index an entry, replacing older generations for its source product in any band"""
+        previous_key = self._source_keys.get(entry["source_product_id"])
+        if previous_key is not None:
+            self._index[previous_key] = [
+                e for e in self._index[previous_key] if e["source_product_id"] != entry["source_product_id"]
+            ]
+        key = (entry["category"], entry["currency"], entry["price_band"])
+        self._index.setdefault(key, []).append(entry)
+        self._source_keys[entry["source_product_id"]] = key
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        created_at = datetime.fromisoformat(entry["created_at"])
+        return datetime.now() - created_at <= self.max_age
+
+    def _ensure_loaded(self) -> None:
+        """Load entries from disk on first use (caller holds the lock)"""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", [])
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not load competitor library: {e}")
+            return
+
+        for entry in entries:
+            self._insert(entry)
+
+
+# Shared library instance
+COMPETITOR_LIBRARY = CompetitorLibrary()
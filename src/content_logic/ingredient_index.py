@@ -0,0 +1,133 @@
+"""
+Ingredient Normalisation Index
+Maps free-text ingredient names to canonical IDs so every comparison (Product
+A vs B, competitor lookups, similarity scoring) treats synonyms such as
+"Ascorbic Acid" and "Vitamin C" as the same ingredient
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB
+from src.config import INGREDIENT_KB_ENABLED
+
+
+# Canonical name → common aliases (seed table; knowledge base synonyms are added at startup).
+# Only true synonyms belong here: class names such as "Vitamin A", "AHA" or "BHA"
+# cover several distinct ingredients and, through alias containment, would
+# merge e.g. "Vitamin A Palmitate" or "Lactic Acid (AHA)" into one of them.
+BUILTIN_INGREDIENT_ALIASES = {
+    "Vitamin C": ["Ascorbic Acid", "L-Ascorbic Acid"],
+    "Vitamin E": ["Tocopherol", "Tocopheryl Acetate"],
+    "Niacinamide": ["Nicotinamide", "Vitamin B3"],
+    "Retinol": [],
+    "Hyaluronic Acid": ["Sodium Hyaluronate", "Hyaluronan"],
+    "Omega-3": ["Omega 3 Fatty Acids", "Omega-3 Fatty Acids"],
+    "EPA": ["Eicosapentaenoic Acid"],
+    "DHA": ["Docosahexaenoic Acid"],
+    "Salicylic Acid": ["2-Hydroxybenzoic Acid"],
+    "Glycolic Acid": ["Hydroxyacetic Acid"],
+    "Whey Protein": ["Whey Protein Concentrate", "Whey Protein Isolate"],
+    "Zinc PCA": ["Zinc Pyrrolidone Carboxylic Acid"]
+}
+
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+_EDGE_PUNCTUATION = re.compile(r"^[^\w]+|[^\w]+$")
+
+
+def normalize_ingredient_key(name: str) -> str:
+    """Lowercase, drop parentheticals like "(10%)", treat hyphens/underscores as spaces"""
+    key = _PARENTHETICAL.sub(" ", name.lower())
+    key = _SEPARATORS.sub(" ", key)
+    return _EDGE_PUNCTUATION.sub("", key.strip())
+
+
+class IngredientIndex:
+    """
+    Alias table plus one compiled pattern over every known alias
+
+    Lookup order: exact normalised alias, then the longest known alias
+    contained in the name as whole words ("Pure Vitamin C Powder"), then the
+    normalised name itself as a new canonical ID. Results are memoised.
+    """
+
+    def __init__(self, alias_groups: Iterable[Tuple[str, Iterable[str]]] = ()):
+        self._aliases: Dict[str, str] = {}
+        self._memo: Dict[str, str] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._lock = threading.Lock()
+        for canonical, aliases in alias_groups:
+            self._register(canonical, aliases)
+        self._compile()
+
+    def add_aliases(self, canonical: str, aliases: Iterable[str]) -> None:
+        """Register extra aliases after startup (recompiles the pattern)"""
+        with self._lock:
+            self._register(canonical, aliases)
+            self._compile()
+
+    def canonical_id(self, name: str) -> str:
+        """Canonical ID for an ingredient name"""
+        memoised = self._memo.get(name)
+        if memoised is not None:
+            return memoised
+
+        key = normalize_ingredient_key(name)
+        canonical = self._aliases.get(key)
+        if canonical is None and self._pattern is not None:
+            match = self._pattern.search(key)
+            if match:
+                canonical = self._aliases[match.group(0)]
+        canonical = canonical or key
+
+        self._memo[name] = canonical
+        return canonical
+
+    def canonical_ids(self, names: Iterable[str]) -> Set[str]:
+        """Canonical IDs for several names"""
+        return {self.canonical_id(name) for name in names}
+
+    def group_by_id(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Original names grouped under their canonical ID (insertion ordered)"""
+        groups: Dict[str, List[str]] = {}
+        for name in names:
+            groups.setdefault(self.canonical_id(name), []).append(name)
+        return groups
+
+    def __len__(self) -> int:
+        return len(set(self._aliases.values()))
+
+    def _register(self, canonical: str, aliases: Iterable[str]) -> None:
+        canonical_key = normalize_ingredient_key(canonical)
+        # An alias already owned by another ingredient keeps its first owner
+        canonical_id = self._aliases.get(canonical_key, canonical_key)
+        self._aliases[canonical_key] = canonical_id
+        for alias in aliases:
+            alias_key = normalize_ingredient_key(alias)
+            if alias_key:
+                self._aliases.setdefault(alias_key, canonical_id)
+
+    def _compile(self) -> None:
+        self._memo = {}
+        if not self._aliases:
+            self._pattern = None
+            return
+        # Longest alias first so "l ascorbic acid" wins over "ascorbic acid"
+        alternatives = sorted(self._aliases, key=len, reverse=True)
+        self._pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, alternatives)) + r")\b")
+
+
+def build_ingredient_index() -> IngredientIndex:
+    """Index over the built-in alias table and the stored knowledge base synonyms"""
+    alias_groups = list(BUILTIN_INGREDIENT_ALIASES.items())
+    if INGREDIENT_KB_ENABLED:
+        alias_groups.extend(INGREDIENT_KB.alias_groups())
+    return IngredientIndex(alias_groups)
+
+
+# Shared index, built once per process
+INGREDIENT_INDEX = build_ingredient_index()
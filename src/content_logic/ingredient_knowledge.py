@@ -0,0 +1,195 @@
+"""
+Ingredient Knowledge Base
+Persistent, catalog-wide descriptions of ingredients (normalised name,
+synonyms, typical purpose, safety notes). Filled lazily with one LLM call
+per unseen ingredient and reused by every later product.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from langchain_core.messages import SystemMessage, HumanMessage
+from src.utils.llm_client import invoke_llm
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.metrics import METRICS
+from src.storage.output_paths import atomic_write_json
+from src.config import INGREDIENT_KB_FILE
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """Lowercase, strip and collapse whitespace"""
+    return re.sub(r"\s+", " ", name.strip().lower())
+
+
+class IngredientKnowledgeBase:
+    """
+    Ingredient entries keyed by normalised canonical name
+
+    Synonyms (and every name an entry was requested under) resolve to the
+    same entry, so "Ascorbic Acid" reuses a stored "Vitamin C" description.
+    Newly learned entries are kept in memory and written by flush(), once
+    per run or batch.
+    """
+
+    def __init__(self, path: Path = INGREDIENT_KB_FILE):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Stored entry for an ingredient name or synonym (never calls the LLM)"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._resolve(name)
+
+    def ensure(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return entries for the given names, describing unseen ingredients
+
+        Each unseen ingredient costs one LLM call. Ingredients that cannot be
+        described (LLM unavailable, unparseable reply) are left out.
+        """
+        known = {}
+        unseen = []
+        with self._lock:
+            self._ensure_loaded()
+            for name in names:
+                entry = self._resolve(name)
+                if entry:
+                    known[name] = entry
+                    METRICS.increment("ingredient_kb.hits")
+                elif name not in unseen:
+                    unseen.append(name)
+
+        for name in unseen:
+            METRICS.increment("ingredient_kb.misses")
+            entry = self._describe(name)
+            if entry:
+                known[name] = self._add(name, entry)
+
+        return known
+
+    def alias_groups(self) -> List[Tuple[str, List[str]]]:
+        """(name, synonyms) for every stored ingredient"""
+        with self._lock:
+            self._ensure_loaded()
+            return [(entry["name"], list(entry["synonyms"])) for entry in self._entries.values()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._entries)
+
+    def _resolve(self, name: str) -> Optional[Dict[str, Any]]:
+        key = self._aliases.get(normalize_ingredient_name(name))
+        return self._entries.get(key) if key else None
+
+    def _describe(self, name: str) -> Optional[Dict[str, Any]]:
+        """One LLM call describing a single ingredient"""
+        system_prompt = """You are an ingredient reference writer for product pages.
+
+Describe the given ingredient in general terms (not for a specific product).
+
+OUTPUT FORMAT (strict JSON):
+{
+  "name": "Most common consumer-facing name",
+  "synonyms": ["Other names of this exact ingredient, INCI or chemical names (not its class, e.g. not \"BHA\" for Salicylic Acid)"],
+  "purpose": "Typical purpose in one short sentence",
+  "safety_notes": "Common cautions in one short sentence, or empty string"
+}
+
+Return ONLY the JSON object, no other text."""
+
+        try:
+            response_text = invoke_llm([
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=f"Ingredient: {name}")
+            ])
+            METRICS.increment("ingredient_kb.llm_calls")
+
+            if "```json" in response_text:
+                response_text = response_text.split("```json")[1].split("```")[0].strip()
+            elif "```" in response_text:
+                response_text = response_text.split("```")[1].split("```")[0].strip()
+
+            data = json.loads(response_text)
+            if not data.get("purpose"):
+                return None
+            return {
+                "name": data.get("name") or name,
+                "synonyms": [s for s in data.get("synonyms", []) if isinstance(s, str)],
+                "purpose": data["purpose"],
+                "safety_notes": data.get("safety_notes") or ""
+            }
+        except CircuitOpenError:
+            return None
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            print(f"⚠️  Warning: Could not describe ingredient '{name}': {e}")
+            return None
+        except Exception as e:
+            print(f"⚠️  Warning: Ingredient lookup failed for '{name}': {e}")
+            return None
+
+    def _add(self, requested_name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Store an entry under its canonical name and all aliases (written by the next flush)"""
+        with self._lock:
+            key = normalize_ingredient_name(entry["name"])
+            existing = self._entries.get(key)
+            if existing:
+                # Same canonical ingredient described under another name
+                for synonym in entry["synonyms"] + [requested_name]:
+                    if synonym not in existing["synonyms"] and normalize_ingredient_name(synonym) != key:
+                        existing["synonyms"].append(synonym)
+                entry = existing
+            else:
+                entry = {**entry, "created_at": datetime.now().isoformat()}
+                if normalize_ingredient_name(requested_name) != key and requested_name not in entry["synonyms"]:
+                    entry["synonyms"].append(requested_name)
+                self._entries[key] = entry
+
+            self._index_entry(key, entry)
+            self._dirty = True
+            return entry
+
+    def _index_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        self._aliases[key] = key
+        for synonym in entry["synonyms"]:
+            self._aliases.setdefault(normalize_ingredient_name(synonym), key)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f).get("ingredients", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not load ingredient knowledge base: {e}")
+            self._entries = {}
+        for key, entry in self._entries.items():
+            self._index_entry(key, entry)
+
+    def flush(self) -> None:
+        """Write the knowledge base to disk if entries were learned since the last flush"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.path, {"ingredients": self._entries})
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save ingredient knowledge base: {e}")
+
+
+# Shared knowledge base instance
+INGREDIENT_KB = IngredientKnowledgeBase()
@@ -0,0 +1,306 @@
+"""
+Near-Duplicate Product Index
+MinHash signatures with locality-sensitive hashing over normalised product
+fields, so size variants and relaunches are found without scanning the catalog
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import re
+import hashlib
+import threading
+from itertools import chain, combinations
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+from src.models.product_model import ProductModel
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.storage.product_store import PRODUCT_STORE
+from src.config import (
+    NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_BANDS
+)
+
+
+# Pack sizes and counts that distinguish variants, not products ("50ml", "pack of 2", "60 capsules")
+_SIZE_TOKENS = re.compile(
+    r"\b(?:pack of \d+|\d+(?:\.\d+)?\s*(?:ml|l|g|gm|kg|mg|oz|fl oz|capsules?|tablets?|caps|pcs|pieces|count|ct|x))\b"
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Universal hash family (a * x + b) mod p over 32-bit shingle hashes; with
+# a < 2^31 and b < 2^32 the arithmetic cannot overflow uint64
+_HASH_PRIME = np.uint64(4294967311)  # smallest prime above 2^32
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Shingle sets per vectorised signature block (bounds the (shingles, num_perm) matrix)
+_SIGNATURE_BLOCK = 1024
+
+
+def _words(text: Optional[str]) -> List[str]:
+    return _WORD.findall(_SIZE_TOKENS.sub(" ", (text or "").lower()))
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def product_shingles(product: ProductModel) -> Set[str]:
+    """
+    Normalised features of a product, prefixed by field
+
+    Name words (sizes and counts removed), category, canonical ingredient IDs,
+    benefits, audience, and word pairs of the usage and side effect text.
+    Price is left out: variants of one product differ mainly in price.
+    """
+    shingles = {f"name:{word}" for word in _words(product.name)}
+    if product.category:
+        shingles.add(f"category:{product.category.strip().lower()}")
+    shingles.update(
+        f"ingredient:{INGREDIENT_INDEX.canonical_id(ing.name)}" for ing in product.key_ingredients or []
+    )
+    shingles.update(f"benefit:{benefit.strip().lower()}" for benefit in product.benefits or [])
+    shingles.update(f"audience:{audience.strip().lower()}" for audience in product.target_audience or [])
+    for field in ("usage_instructions", "side_effects"):
+        words = _words(getattr(product, field))
+        shingles.update(f"{field}:{a} {b}" for a, b in zip(words, words[1:]))
+        if len(words) == 1:
+            shingles.add(f"{field}:{words[0]}")
+    return shingles
+
+
+class MinHashLSH:
+    """
+    MinHash signatures of shingle sets, bucketed by LSH bands, updated one key at a time
+
+    Each signature is split into bands; keys sharing any band bucket are
+    candidates, and candidates whose estimated Jaccard similarity reaches the
+    threshold are near-duplicates. Lookups touch only the matching buckets,
+    so cost does not grow with the number of indexed keys. Found pairs are
+    kept for clusters().
+    """
+
+    def __init__(
+        self,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        num_perm: int = NEAR_DUPLICATE_NUM_PERM,
+        bands: int = NEAR_DUPLICATE_BANDS,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._parent: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def signature_of(self, shingles: Set[str]) -> np.ndarray:
+        """MinHash signature of a shingle set"""
+        return self.signatures_of([shingles])[0]
+
+    def signatures_of(self, shingle_sets: List[Set[str]]) -> np.ndarray:
+        """
+        MinHash signatures of many shingle sets, one row each
+
+        Each distinct shingle is hashed once; the permutations and minima run
+        over blocks of _SIGNATURE_BLOCK sets at a time.
+        """
+        signatures = np.full((len(shingle_sets), len(self._a)), _MAX_HASH, dtype=np.uint64)
+        positions: Dict[str, int] = {}
+        set_positions = [[positions.setdefault(s, len(positions)) for s in shingles] for shingles in shingle_sets]
+        hashes = np.array([_shingle_hash(s) for s in positions], dtype=np.uint64)
+
+        for start in range(0, len(shingle_sets), _SIGNATURE_BLOCK):
+            block = set_positions[start:start + _SIGNATURE_BLOCK]
+            lengths = np.array([len(members) for members in block], dtype=np.int64)
+            if not lengths.any():
+                continue
+            flat = hashes[np.fromiter(chain.from_iterable(block), dtype=np.int64, count=int(lengths.sum()))]
+            permuted = (np.outer(flat, self._a) + self._b) % _HASH_PRIME
+            permuted &= _MAX_HASH
+            # One minimum per non-empty set; empty sets keep _MAX_HASH
+            non_empty = lengths > 0
+            offsets = (np.cumsum(lengths) - lengths)[non_empty]
+            rows = np.arange(start, start + len(block))[non_empty]
+            signatures[rows] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return signatures
+
+    def query_shingles(self, shingles: Set[str], exclude: Optional[str] = None) -> List[str]:
+        """Indexed near-duplicates of a shingle set, most similar first"""
+        with self._lock:
+            return self._query(exclude, self.signature_of(shingles))
+
+    def add_shingles(self, key: str, shingles: Set[str]) -> List[str]:
+        """
+        Index a shingle set under key (replacing its previous entry) and return its near-duplicates
+
+        The returned pairs are recorded for clusters().
+        """
+        return self._add_signature(key, self.signature_of(shingles))
+
+    def add_shingle_sets(self, shingle_sets: Dict[str, Set[str]]) -> None:
+        """Index many shingle sets (as add_shingles for each key in turn), hashing them in vectorised blocks"""
+        signatures = self.signatures_of(list(shingle_sets.values()))
+        for key, signature in zip(shingle_sets, signatures):
+            self._add_signature(key, signature)
+
+    def similar_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Near-duplicate row pairs (i < j) of a signature matrix, shaped (pairs, 2)
+
+        The pairs add_shingles would link if every row were added, found by
+        sorting each band's keys instead of filling buckets, for one-off
+        clustering of a whole catalog.
+        """
+        band_key = np.dtype((np.void, self.rows * signatures.itemsize))
+        candidates = set()
+        for band in range(self.bands):
+            keys = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows]).view(band_key).ravel()
+            _, buckets, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            buckets = buckets.ravel()
+            # Rows of buckets with two or more members, grouped by bucket
+            shared = np.flatnonzero(counts[buckets] > 1)
+            shared = shared[np.argsort(buckets[shared], kind="stable")]
+            starts = np.flatnonzero(np.diff(buckets[shared], prepend=-1))
+            for members in np.split(shared, starts[1:]):
+                candidates.update(combinations(members.tolist(), 2))
+        if not candidates:
+            return np.zeros((0, 2), dtype=np.int64)
+
+        pairs = np.array(sorted(candidates), dtype=np.int64)
+        similarity = np.concatenate([
+            (signatures[block[:, 0]] == signatures[block[:, 1]]).mean(axis=1)
+            for block in np.array_split(pairs, max(1, len(pairs) // _SIGNATURE_BLOCK))
+        ])
+        return pairs[similarity >= self.threshold]
+
+    def matches(self, signature: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+        """Rows of a signature matrix that are near-duplicates of one signature, most similar first"""
+        shape = (len(signatures), self.bands, self.rows)
+        candidates = np.flatnonzero(
+            (signatures.reshape(shape) == signature.reshape(shape[1:])).all(axis=2).any(axis=1)
+        )
+        similarity = (signatures[candidates] == signature).mean(axis=1)
+        order = np.argsort(-similarity, kind="stable")
+        return candidates[order][similarity[order] >= self.threshold]
+
+    def clusters(self) -> List[List[str]]:
+        """Groups of two or more near-duplicate keys, largest first"""
+        with self._lock:
+            groups: Dict[str, List[str]] = {}
+            for key in self._signatures:
+                groups.setdefault(self._find(key), []).append(key)
+        return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+    def similarity(self, key_a: str, key_b: str) -> float:
+        """Estimated Jaccard similarity of two indexed keys"""
+        return float(np.mean(self._signatures[key_a] == self._signatures[key_b]))
+
+    def _add_signature(self, key: str, signature: np.ndarray) -> List[str]:
+        with self._lock:
+            self._remove(key)
+            duplicates = self._query(key, signature)
+
+            self._signatures[key] = signature
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+            self._parent.setdefault(key, key)
+            for duplicate in duplicates:
+                self._union(key, duplicate)
+            return duplicates
+
+    def _query(self, key: Optional[str], signature: np.ndarray) -> List[str]:
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates |= self._buckets[band].get(band_key, set())
+        candidates.discard(key)
+
+        scored = [
+            (float(np.mean(self._signatures[candidate] == signature)), candidate)
+            for candidate in candidates
+        ]
+        return [candidate for score, candidate in sorted(scored, reverse=True) if score >= self.threshold]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _remove(self, key: str) -> None:
+        """Drop a key's buckets (its cluster links stay, as in a relaunch)"""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def _find(self, key: str) -> str:
+        root = key
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[key] != root:
+            self._parent[key], key = root, self._parent[key]
+        return root
+
+    def _union(self, key_a: str, key_b: str) -> None:
+        root_a, root_b = self._find(key_a), self._find(key_b)
+        if root_a != root_b:
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class NearDuplicateIndex(MinHashLSH):
+    """Near-duplicate products (size variants, relaunches) keyed by product ID"""
+
+    def signature(self, product: ProductModel) -> np.ndarray:
+        """MinHash signature of the product's shingles"""
+        return self.signature_of(product_shingles(product))
+
+    def query(self, product: ProductModel) -> List[str]:
+        """Indexed near-duplicates of a product (never the product itself), most similar first"""
+        return self.query_shingles(product_shingles(product), exclude=product.product_id)
+
+    def add(self, product: ProductModel) -> List[str]:
+        """Index a product (replacing its previous entry) and return its near-duplicates"""
+        return self.add_shingles(product.product_id, product_shingles(product))
+
+    def add_all(self, products: Iterable[ProductModel]) -> None:
+        """Index many products (see add_shingle_sets)"""
+        self.add_shingle_sets({product.product_id: product_shingles(product) for product in products})
+
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+_near_duplicate_lock = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """Shared index, built from the product store on first use and updated as products are saved"""
+    global _near_duplicate_index
+    with _near_duplicate_lock:
+        if _near_duplicate_index is None:
+            index = NearDuplicateIndex()
+            index.add_all(PRODUCT_STORE.product_models())
+            _near_duplicate_index = index
+        return _near_duplicate_index
+
+
+def index_saved_product(product: ProductModel) -> None:
+    """Keep the shared index current after a product is saved (no-op until it is first used)"""
+    with _near_duplicate_lock:
+        index = _near_duplicate_index
+    if index is not None:
+        index.add(product)
@@ -0,0 +1,241 @@
+"""
+Question Deduplication
+Drops paraphrased duplicate FAQ questions ("Is it safe for sensitive skin?" /
+"Can sensitive skin use this?") and keeps a catalog-wide index of canonical
+question forms
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import re
+import hashlib
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+from src.models.question_model import QuestionModel
+from src.content_logic.near_duplicates import MinHashLSH
+from src.storage.output_paths import atomic_write_json
+from src.utils.metrics import METRICS
+from src.config import QUESTION_DEDUP_THRESHOLD, QUESTION_INDEX_FILE
+
+
+# Leading words mapped to the kind of answer they ask for
+_QUESTION_KINDS = {
+    "how": "how", "when": "when", "where": "where", "why": "why", "who": "who",
+    "what": "what", "which": "what",
+    "is": "yes_no", "are": "yes_no", "can": "yes_no", "could": "yes_no", "does": "yes_no",
+    "do": "yes_no", "will": "yes_no", "should": "yes_no", "would": "yes_no", "may": "yes_no"
+}
+
+_STOPWORDS = {
+    "a", "an", "the", "it", "its", "this", "that", "these", "those", "i", "me", "my", "we", "our",
+    "you", "your", "for", "of", "to", "in", "on", "at", "by", "with", "and", "or", "be", "been",
+    "there", "any", "product", "much", "many", "often", "long", *_QUESTION_KINDS
+}
+
+# Words asking whether the product suits someone, counted as one
+_SUITABILITY_WORDS = {"safe", "suitable", "use", "okay", "ok", "good"}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def question_kind(question_text: str) -> str:
+    """
+    The kind of answer a question asks for, from its leading word
+
+    "how often"/"how long" count as "when". Questions of different kinds are
+    never duplicates.
+    """
+    words = _WORD.findall(question_text.lower())
+    if words[:2] in (["how", "often"], ["how", "long"]):
+        return "when"
+    return _QUESTION_KINDS.get(words[0], "other") if words else "other"
+
+
+def question_shingles(question_text: str, product_name: Optional[str] = None) -> Set[str]:
+    """
+    Normalised shingles of a question
+
+    Its content words, singularised, without stopwords or the product's own
+    name. The question kind is not a shingle: with only a few content words
+    it would push short distinct questions ("Is it suitable for sensitive
+    skin?" / "... oily skin?") over the threshold, so it is compared
+    separately (see question_kind).
+    """
+    name_words = set(_WORD.findall(product_name.lower())) if product_name else set()
+    shingles = set()
+    for word in _WORD.findall(question_text.lower()):
+        if word in _STOPWORDS or word in name_words:
+            continue
+        if word in _SUITABILITY_WORDS:
+            word = "suitable"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        shingles.add(word)
+    return shingles
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def dedupe_questions(
+    questions: List[QuestionModel],
+    product_name: Optional[str] = None,
+    existing: Optional[List[QuestionModel]] = None,
+    threshold: float = QUESTION_DEDUP_THRESHOLD
+) -> Tuple[List[QuestionModel], List[QuestionModel]]:
+    """
+    Keep the first of every group of paraphrased questions
+
+    Questions of the same kind are compared in order by Jaccard similarity
+    of their shingles.
+    existing questions (e.g. template answers) are already accepted: they are
+    never dropped, and new questions paraphrasing them are.
+
+    Returns:
+        (kept questions, dropped duplicates)
+    """
+    kept: List[QuestionModel] = []
+    kept_shingles = [
+        (question_kind(q.question_text), question_shingles(q.question_text, product_name)) for q in existing or []
+    ]
+    dropped: List[QuestionModel] = []
+
+    for question in questions:
+        kind = question_kind(question.question_text)
+        shingles = question_shingles(question.question_text, product_name)
+        if any(kind == other_kind and _jaccard(shingles, other) >= threshold for other_kind, other in kept_shingles):
+            dropped.append(question)
+        else:
+            kept.append(question)
+            kept_shingles.append((kind, shingles))
+
+    if dropped:
+        METRICS.increment("questions.duplicates_dropped", len(dropped))
+    return kept, dropped
+
+
+class CanonicalQuestionIndex:
+    """
+    Canonical question forms across the catalog
+
+    Each form is stored with the product name replaced by "this product" and
+    a count of how many generated questions mapped onto it. A MinHash/LSH
+    index narrows each lookup to a few candidates, so it stays fast as the
+    catalog grows. Changes are kept in memory and written by flush(), once
+    per run or batch.
+    """
+
+    def __init__(self, path: Path = QUESTION_INDEX_FILE, threshold: float = QUESTION_DEDUP_THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self._forms: Dict[str, Dict[str, Any]] = {}
+        self._kinds: Dict[str, str] = {}
+        self._shingles: Dict[str, Set[str]] = {}
+        # LSH only narrows the candidates; they are verified with exact Jaccard
+        self._lsh = MinHashLSH(threshold=0.0)
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def canonical_id(self, question_text: str, product_name: Optional[str] = None) -> str:
+        """Canonical form ID for a question, registering a new form if none is close enough"""
+        with self._lock:
+            self._ensure_loaded()
+            canonical_id = self._match(question_text, product_name)
+            self._dirty = True
+            return canonical_id
+
+    def assign(self, questions: List[QuestionModel], product_name: Optional[str] = None) -> List[QuestionModel]:
+        """
+        The questions with canonical_id set
+
+        Questions that already carry a canonical_id (answers reused from a
+        previous run) are returned unchanged and not counted again.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            assigned = [
+                question if question.canonical_id else question.model_copy(update={
+                    "canonical_id": self._match(question.question_text, product_name)
+                })
+                for question in questions
+            ]
+            self._dirty = self._dirty or any(not question.canonical_id for question in questions)
+            return assigned
+
+    def get(self, canonical_id: str) -> Optional[Dict[str, Any]]:
+        """Stored form (text and count)"""
+        with self._lock:
+            self._ensure_loaded()
+            form = self._forms.get(canonical_id)
+            return dict(form) if form else None
+
+    def most_common(self, n: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+        """The n most frequently asked canonical questions"""
+        with self._lock:
+            self._ensure_loaded()
+            ranked = sorted(self._forms.items(), key=lambda item: item[1]["count"], reverse=True)
+            return [(canonical_id, dict(form)) for canonical_id, form in ranked[:n]]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._forms)
+
+    def _match(self, question_text: str, product_name: Optional[str]) -> str:
+        kind = question_kind(question_text)
+        shingles = question_shingles(question_text, product_name)
+        scored = [
+            (_jaccard(shingles, self._shingles[candidate]), candidate)
+            for candidate in self._lsh.query_shingles(shingles)
+            if self._kinds[candidate] == kind
+        ]
+        best_score, best = max(scored, default=(0.0, None))
+        if best is not None and best_score >= self.threshold:
+            canonical_id = best
+        else:
+            text = question_text
+            if product_name:
+                text = re.sub(re.escape(product_name), "this product", text, flags=re.IGNORECASE)
+            key = " ".join(sorted(shingles | {f"kind:{kind}"}))
+            canonical_id = "cq_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+            self._forms.setdefault(canonical_id, {"text": text, "count": 0})
+            self._kinds[canonical_id] = kind
+            self._shingles[canonical_id] = shingles
+            self._lsh.add_shingles(canonical_id, shingles)
+        self._forms[canonical_id]["count"] += 1
+        return canonical_id
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._forms = json.load(f).get("questions", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not load canonical question index: {e}")
+            self._forms = {}
+        for canonical_id, form in self._forms.items():
+            self._kinds[canonical_id] = question_kind(form["text"])
+            self._shingles[canonical_id] = question_shingles(form["text"])
+            self._lsh.add_shingles(canonical_id, self._shingles[canonical_id])
+
+    def flush(self) -> None:
+        """Write the index to disk if it changed since the last flush"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.path, {"questions": self._forms})
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠️  Could not save canonical question index: {e}")
+
+
+# Shared catalog-wide index
+QUESTION_INDEX = CanonicalQuestionIndex()
@@ -0,0 +1,139 @@
+"""
+Product Similarity Scorer
+Fast local scoring of Product B against Product A, used to enforce
+PRODUCT_B_SIMILARITY_THRESHOLD without an LLM call
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import re
+from typing import Dict, Any, List, Optional, Set
+from src.models.product_model import ProductModel
+from src.content_logic.ingredient_index import INGREDIENT_INDEX
+from src.config import (
+    PRODUCT_B_SIMILARITY_THRESHOLD, PRODUCT_B_SIMILARITY_TOLERANCE,
+    PRODUCT_B_MAX_PRICE_DIFFERENCE, SIMILARITY_WEIGHTS
+)
+
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Fields that an LLM repair call can rewrite (category and price are fixed locally)
+LLM_REPAIRABLE_FIELDS = ["key_ingredients", "benefits", "target_audience"]
+
+
+def score_product_similarity(product_a: ProductModel, product_b: ProductModel) -> Dict[str, Any]:
+    """
+    Score how similar Product B is to Product A
+
+    Returns:
+        {
+          "score": weighted similarity (0-1),
+          "field_scores": per-field similarity (0-1),
+          "in_bounds": score within threshold ± tolerance,
+          "offending_fields": fields that break the Product B rules
+        }
+    """
+    features_a = product_feature_sets(product_a)
+    features_b = product_feature_sets(product_b)
+    field_scores = {
+        "category": 1.0 if _normalize(product_a.category) == _normalize(product_b.category) else 0.0,
+        **{field: _jaccard(features_a[field], features_b[field]) for field in features_a},
+        "price": _price_similarity(product_a.price, product_b.price)
+    }
+
+    score = sum(SIMILARITY_WEIGHTS[field] * value for field, value in field_scores.items())
+    score = round(score, 4)
+
+    lower = PRODUCT_B_SIMILARITY_THRESHOLD - PRODUCT_B_SIMILARITY_TOLERANCE
+    upper = PRODUCT_B_SIMILARITY_THRESHOLD + PRODUCT_B_SIMILARITY_TOLERANCE
+    in_bounds = lower <= score <= upper
+
+    offending = _offending_fields(product_a, product_b, field_scores)
+
+    # Out of bounds without a hard rule violation: point at the fields that move the score
+    if not in_bounds and not offending:
+        if score > upper:
+            offending = ["key_ingredients", "benefits"]
+        else:
+            offending = sorted(
+                ["benefits", "target_audience"],
+                key=lambda field: field_scores[field]
+            )
+
+    return {
+        "score": score,
+        "field_scores": {field: round(value, 4) for field, value in field_scores.items()},
+        "in_bounds": in_bounds,
+        "offending_fields": offending
+    }
+
+
+def product_feature_sets(product: ProductModel) -> Dict[str, Set[str]]:
+    """Set-valued features compared by Jaccard in score_product_similarity"""
+    return {
+        "key_ingredients": _ingredient_names(product),
+        "benefits": _words(product.benefits),
+        "target_audience": _words(product.target_audience)
+    }
+
+
+def _offending_fields(
+    product_a: ProductModel,
+    product_b: ProductModel,
+    field_scores: Dict[str, float]
+) -> List[str]:
+    """Fields that violate the hard Product B rules"""
+    offending = []
+
+    if field_scores["category"] < 1.0:
+        offending.append("category")
+
+    # Product B must not reuse Product A ingredients
+    if _ingredient_names(product_a) & _ingredient_names(product_b):
+        offending.append("key_ingredients")
+
+    # Benefits should be comparable but distinct
+    if product_a.benefits and field_scores["benefits"] >= 1.0:
+        offending.append("benefits")
+
+    # Same market: at least some audience overlap when both are known
+    if product_a.target_audience and field_scores["target_audience"] == 0.0:
+        offending.append("target_audience")
+
+    if abs(product_b.price - product_a.price) / product_a.price > PRODUCT_B_MAX_PRICE_DIFFERENCE:
+        offending.append("price")
+
+    return offending
+
+
+def _price_similarity(price_a: float, price_b: float) -> float:
+    """1.0 for equal prices, falling to 0.0 at the maximum allowed gap"""
+    gap = abs(price_b - price_a) / price_a
+    return max(0.0, 1.0 - gap / PRODUCT_B_MAX_PRICE_DIFFERENCE)
+
+
+def _ingredient_names(product: ProductModel) -> Set[str]:
+    """Canonical ingredient IDs (synonyms collapse to one ID)"""
+    if not product.key_ingredients:
+        return set()
+    return INGREDIENT_INDEX.canonical_ids(ing.name for ing in product.key_ingredients)
+
+
+def _words(values: Optional[List[str]]) -> Set[str]:
+    """Lowercased word set across a list of short phrases"""
+    words = set()
+    for value in values or []:
+        words.update(_WORD_PATTERN.findall(value.lower()))
+    return words
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
@@ -0,0 +1,226 @@
+"""
+Template Question Engine
+Deterministic questions and answers built directly from ProductModel fields
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from functools import partial
+from typing import Dict, Any, List, Optional
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+from src.config import TEMPLATE_QUESTION_CATEGORIES, MAX_TEMPLATE_INGREDIENT_QUESTIONS
+
+
+# custom_fields keys that carry storage information
+STORAGE_FIELD_HINTS = ["storage", "shelf_life", "expiry", "best_before"]
+
+
+def generate_template_questions(
+    product: ProductModel,
+    ingredient_knowledge: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[QuestionModel]:
+    """
+    Generate questions for the field-lookup categories without any LLM call
+
+    Categories covered: see TEMPLATE_QUESTION_CATEGORIES in config.
+    ingredient_knowledge maps ingredient names to knowledge base entries and
+    fills in purposes and safety notes the product data does not give.
+    """
+    builders = {
+        "Purchase": _purchase_questions,
+        "Value": _value_questions,
+        "Usage": _usage_questions,
+        "Safety": _safety_questions,
+        "Ingredients": partial(_ingredient_questions, ingredient_knowledge=ingredient_knowledge or {}),
+        "Storage": _storage_questions
+    }
+
+    questions = []
+    for category in TEMPLATE_QUESTION_CATEGORIES:
+        builder = builders.get(category)
+        if builder:
+            questions.extend(builder(product))
+
+    return questions
+
+
+def _purchase_questions(product: ProductModel) -> List[QuestionModel]:
+    """Price lookup"""
+    return [
+        QuestionModel(
+            question_text=f"How much does {product.name} cost?",
+            answer=f"{product.name} is priced at {product.currency}{product.price}.",
+            category="Purchase",
+            related_fields=["price", "currency"],
+            priority="high",
+            generated_from="template"
+        )
+    ]
+
+
+def _value_questions(product: ProductModel) -> List[QuestionModel]:
+    """Value proposition from price tier and benefit count (same tiers as the price block)"""
+    if product.price < 300:
+        tier = "an affordable"
+    elif product.price < 800:
+        tier = "a reasonably priced"
+    else:
+        tier = "a premium"
+
+    answer = f"At {product.currency}{product.price}, {product.name} is {tier} option"
+    if product.benefits:
+        answer += f" that offers {len(product.benefits)} key benefit{'s' if len(product.benefits) != 1 else ''}: "
+        answer += f"{', '.join(product.benefits).lower()}."
+    else:
+        answer += "."
+
+    return [
+        QuestionModel(
+            question_text=f"Is {product.name} worth the price?",
+            answer=answer,
+            category="Value",
+            related_fields=["price", "currency", "benefits"],
+            priority="medium",
+            generated_from="rule-based"
+        )
+    ]
+
+
+def _usage_questions(product: ProductModel) -> List[QuestionModel]:
+    """Usage instructions lookup"""
+    if not product.usage_instructions:
+        return []
+
+    return [
+        QuestionModel(
+            question_text=f"How do I use {product.name}?",
+            answer=product.usage_instructions,
+            category="Usage",
+            related_fields=["usage_instructions"],
+            priority="high",
+            generated_from="template"
+        )
+    ]
+
+
+def _safety_questions(product: ProductModel) -> List[QuestionModel]:
+    """Side effects lookup, with the safety block's generic fallback"""
+    if product.side_effects:
+        answer = product.side_effects
+        generated_from = "template"
+    else:
+        answer = (
+            f"No specific side effects are listed for {product.name}. "
+            "As with any product, discontinue use if irritation or any adverse reaction occurs."
+        )
+        generated_from = "rule-based"
+
+    return [
+        QuestionModel(
+            question_text=f"Does {product.name} have any side effects?",
+            answer=answer,
+            category="Safety",
+            related_fields=["side_effects"],
+            priority="high",
+            generated_from=generated_from
+        )
+    ]
+
+
+def _ingredient_questions(
+    product: ProductModel,
+    ingredient_knowledge: Dict[str, Dict[str, Any]]
+) -> List[QuestionModel]:
+    """Ingredient list plus one question per ingredient with a known purpose"""
+    if not product.key_ingredients:
+        return []
+
+    names = [ing.name for ing in product.key_ingredients]
+    questions = [
+        QuestionModel(
+            question_text=f"What are the key ingredients in {product.name}?",
+            answer=f"The key ingredients in {product.name} are {_join_names(names)}.",
+            category="Ingredients",
+            related_fields=["key_ingredients"],
+            priority="high",
+            generated_from="template"
+        )
+    ]
+
+    # Product-specific purposes first, then general knowledge base descriptions
+    described = [ing for ing in product.key_ingredients if ing.purpose]
+    described += [
+        ing for ing in product.key_ingredients
+        if not ing.purpose and ing.name in ingredient_knowledge
+    ]
+    for ing in described[:MAX_TEMPLATE_INGREDIENT_QUESTIONS]:
+        knowledge = ingredient_knowledge.get(ing.name, {})
+        detail = ing.name
+        if ing.concentration:
+            detail += f" ({ing.concentration})"
+
+        if ing.purpose:
+            answer = f"{detail} is included for {ing.purpose.lower()}."
+            generated_from = "template"
+        else:
+            answer = f"{detail}: {knowledge['purpose']}"
+            generated_from = "rule-based"
+        if knowledge.get("safety_notes"):
+            answer += f" {knowledge['safety_notes']}"
+
+        questions.append(
+            QuestionModel(
+                question_text=f"What does {ing.name} do in {product.name}?",
+                answer=answer,
+                category="Ingredients",
+                related_fields=["key_ingredients"],
+                priority="medium",
+                generated_from=generated_from
+            )
+        )
+
+    return questions
+
+
+def _storage_questions(product: ProductModel) -> List[QuestionModel]:
+    """Storage info from custom fields, otherwise general storage guidance"""
+    storage_value = _find_custom_field(product, STORAGE_FIELD_HINTS)
+
+    if storage_value:
+        answer = f"Storage information for {product.name}: {storage_value}."
+        generated_from = "template"
+    else:
+        answer = (
+            f"Store {product.name} in a cool, dry place away from direct sunlight, "
+            "and keep the packaging tightly closed after use."
+        )
+        generated_from = "rule-based"
+
+    return [
+        QuestionModel(
+            question_text=f"How should I store {product.name}?",
+            answer=answer,
+            category="Storage",
+            related_fields=["custom_fields"],
+            priority="low",
+            generated_from=generated_from
+        )
+    ]
+
+
+def _find_custom_field(product: ProductModel, hints: List[str]) -> Optional[str]:
+    """Return the first custom field value whose key contains one of the hints"""
+    for key, value in product.custom_fields.items():
+        normalized_key = key.lower().replace(" ", "_")
+        if any(hint in normalized_key for hint in hints):
+            return f"{key.replace('_', ' ')} - {value}"
+    return None
+
+
+def _join_names(names: List[str]) -> str:
+    """Join names as natural language (a, b and c)"""
+    if len(names) == 1:
+        return names[0]
+    return f"{', '.join(names[:-1])} and {names[-1]}"
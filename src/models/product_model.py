@@ -1,6 +1,7 @@
 """
 Product data model with validation
 """
+import hashlib
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
@@ -94,7 +95,13 @@ class ProductModel(BaseModel):
         """Calculate metadata after initialization"""
         # Generate product ID if not provided
         if not self.product_id:
-            self.product_id = f"prod_{self.name.lower().replace(' ', '_')[:20]}"
+            slug = self.name.lower().replace(' ', '_')
+            self.product_id = f"prod_{slug[:20]}"
+            # Truncated names get a hash of the full name, so variants
+            # ("... Serum 30ml" / "... Serum 50ml") never share an ID
+            if len(slug) > 20:
+                full_name = " ".join(self.name.lower().split())
+                self.product_id += "_" + hashlib.sha1(full_name.encode("utf-8")).hexdigest()[:8]
         
         # Calculate completeness score
         standard_fields = [
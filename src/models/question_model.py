@@ -32,6 +32,7 @@ class QuestionModel(BaseModel):
     
     # System tracking
     question_id: Optional[str] = Field(None, description="Unique identifier")
+    canonical_id: Optional[str] = Field(None, description="Catalog-wide canonical question form")
     generated_from: str = Field(
         default="template",
         description="Generation method: template, llm, rule-based"
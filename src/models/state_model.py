@@ -41,6 +41,23 @@ class WorkflowState(TypedDict):
     product_page: Optional[Dict[str, Any]]  # Product page JSON structure
     comparison_page: Optional[Dict[str, Any]]  # Comparison page JSON structure
     
+    # ==================== INCREMENTAL RUN SECTION ====================
+    # Populated by the orchestrator when a previous snapshot exists
+    previous_outputs: Optional[Dict[str, Any]]  # Last stored models, questions, blocks and pages
+    changed_fields: Optional[List[str]]  # ProductModel fields changed since the snapshot (None = full run)
+    skip_nodes: Optional[List[str]]  # Nodes whose inputs are unchanged and reuse previous outputs
+    
+    # ==================== OUTPUT SECTION ====================
+    # run_id and manifest_file are set by the orchestrator; the rest by the Output Formatter Agent
+    run_id: Optional[str]  # Namespaces this run's output files
+    written_files: Optional[List[str]]  # Paths of the written page files
+    serialized_pages: Optional[Dict[str, bytes]]  # File name → the exact bytes written
+    changed_pages: Optional[List[str]]  # Files whose content changed since the product's previous run
+    manifest_entries: Optional[List[Dict[str, Any]]]  # Output manifest entry per page (hash, size, schema version)
+    output_directory: Optional[str]  # Directory of this run's files
+    manifest_file: Optional[str]  # Run manifest of a single-product run (batch runs write one per batch)
+    html_files: Optional[List[str]]  # Rendered HTML pages (HTML Renderer Agent, when enabled)
+    
     # ==================== METADATA SECTION ====================
     # System tracking
     workflow_status: str  # Current stage: initialized, parsed, generating, building, complete, error
@@ -3,8 +3,17 @@ LangGraph Orchestrator
 Coordinates all agents in the content generation workflow
 """
 import sys
+import io
+import os
+import re
+import copy
+import time
 from pathlib import Path
-from typing import Dict, Any
+from datetime import datetime
+from contextlib import redirect_stdout
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
@@ -14,14 +23,108 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 load_dotenv()
 
 from src.models.state_model import WorkflowState
-from src.agents.data_parser_agent import parse_product_data
-from src.agents.question_generator_agent import generate_questions
-from src.agents.product_b_generator_agent import generate_product_b
-from src.agents.content_logic_agent import generate_content_blocks
-from src.agents.faq_builder_agent import build_faq_page
-from src.agents.product_page_builder_agent import build_product_page
-from src.agents.comparison_page_builder_agent import build_comparison_page
-from src.agents.output_formatter_agent import write_output_files
+from src.models.product_model import ProductModel
+from src.agents.data_parser_agent import parse_product_data, AGENT_INFO as DATA_PARSER_INFO
+from src.agents.question_generator_agent import generate_questions, AGENT_INFO as QUESTION_GENERATOR_INFO
+from src.agents.product_b_generator_agent import generate_product_b, AGENT_INFO as PRODUCT_B_GENERATOR_INFO
+from src.agents.content_logic_agent import generate_content_blocks, AGENT_INFO as CONTENT_LOGIC_INFO
+from src.agents.faq_builder_agent import build_faq_page, AGENT_INFO as FAQ_BUILDER_INFO
+from src.agents.product_page_builder_agent import build_product_page, AGENT_INFO as PRODUCT_PAGE_BUILDER_INFO
+from src.agents.comparison_page_builder_agent import build_comparison_page, AGENT_INFO as COMPARISON_PAGE_BUILDER_INFO
+from src.agents.output_formatter_agent import (
+    write_output_files, output_pages, sink_pages, index_faq, AGENT_INFO as OUTPUT_FORMATTER_INFO
+)
+from src.agents.html_renderer_agent import (
+    render_html_pages, write_html_pages, page_templates, AGENT_INFO as HTML_RENDERER_INFO
+)
+from src.storage.product_store import PRODUCT_STORE, PAGE_KEYS, diff_product_fields, serialize_content_blocks
+from src.storage.block_cache import block_cache_hit_rates
+from src.storage.output_paths import new_run_id, atomic_write_json, write_changes_manifest
+from src.storage.output_manifest import write_run_manifest, manifest_file_path
+from src.storage.run_sinks import open_run_sink, close_run_sink
+from src.content_logic.catalog_index import CatalogIndex, set_catalog_index
+from src.content_logic.bulk_comparison import build_bulk_comparison_pages
+from src.content_logic.near_duplicates import get_near_duplicate_index, index_saved_product
+from src.content_logic.competitor_library import COMPETITOR_LIBRARY
+from src.content_logic.question_dedup import QUESTION_INDEX
+from src.content_logic.ingredient_knowledge import INGREDIENT_KB
+from src.utils.llm_client import LLM_CIRCUIT_BREAKER
+from src.utils.metrics import METRICS
+from src.config import (
+    BATCH_MAX_WORKERS, REBUILD_CHUNKS_PER_WORKER, COMPETITOR_SOURCE,
+    BULK_COMPARISON_MAX_PRICE_DIFFERENCE, BULK_COMPARISON_DIR, NEAR_DUPLICATE_ENABLED,
+    OUTPUT_COMPACT_JSON, OUTPUT_SINK, HTML_RENDERING_ENABLED, HTML_OUTPUT_DIR
+)
+
+
+# Node name -> agent metadata, in execution (topological) order
+NODE_AGENT_INFO = {
+    "data_parser": DATA_PARSER_INFO,
+    "question_generator": QUESTION_GENERATOR_INFO,
+    "product_b_generator": PRODUCT_B_GENERATOR_INFO,
+    "content_logic": CONTENT_LOGIC_INFO,
+    "faq_builder": FAQ_BUILDER_INFO,
+    "product_page_builder": PRODUCT_PAGE_BUILDER_INFO,
+    "comparison_page_builder": COMPARISON_PAGE_BUILDER_INFO,
+    "output_formatter": OUTPUT_FORMATTER_INFO,
+    "html_renderer": HTML_RENDERER_INFO  # Only in the graph with HTML_RENDERING_ENABLED
+}
+
+# Nodes that run on every invocation (input parsing, the output sink and HTML rendering)
+ALWAYS_RUN_NODES = {"data_parser", "output_formatter", "html_renderer"}
+
+# State keys that track the run rather than carry node outputs
+BOOKKEEPING_KEYS = {"agent_trace", "timestamp", "errors", "warnings", "workflow_status"}
+
+
+def plan_skipped_nodes(changed_fields: List[str]) -> List[str]:
+    """
+    Decide which nodes can reuse their previous outputs
+    
+    A node is dirty when a ProductModel field it reads changed (AGENT_INFO
+    "reads_product_fields"; any change if the agent does not declare them) or
+    when it reads a state key written by a dirty node.
+    """
+    changed = set(changed_fields)
+    dirty_keys = set()
+    skipped = []
+    
+    for node_name, info in NODE_AGENT_INFO.items():
+        if node_name in ALWAYS_RUN_NODES:
+            continue
+        
+        reads = set(info["reads_from_state"])
+        dirty = bool(reads & dirty_keys)
+        
+        if "product_model" in reads and changed:
+            product_fields = info.get("reads_product_fields")
+            dirty = dirty or product_fields is None or bool(changed & set(product_fields))
+        
+        if dirty:
+            dirty_keys.update(set(info["writes_to_state"]) - BOOKKEEPING_KEYS)
+        else:
+            skipped.append(node_name)
+    
+    return skipped
+
+
+def _reusable_node(node_name: str, agent_fn):
+    """Wrap an agent so it returns its previous outputs when listed in skip_nodes"""
+    info = NODE_AGENT_INFO[node_name]
+    output_keys = [key for key in info["writes_to_state"] if key not in BOOKKEEPING_KEYS]
+    
+    def node(state: WorkflowState) -> Dict[str, Any]:
+        if node_name in (state.get("skip_nodes") or []):
+            previous = state.get("previous_outputs") or {}
+            if all(previous.get(key) is not None for key in output_keys):
+                print(f"\n♻️  {info['name']}: inputs unchanged - reusing previous output")
+                outputs = {key: previous[key] for key in output_keys}
+                outputs["agent_trace"] = [f"{node_name}_agent (reused)"]
+                outputs["timestamp"] = datetime.now().isoformat()
+                return outputs
+        return agent_fn(state)
+    
+    return node
 
 
 def create_workflow() -> StateGraph:
@@ -34,6 +137,7 @@ def create_workflow() -> StateGraph:
     3. Content Logic Agent (generate blocks)
     4. FAQ Builder + Product Page Builder + Comparison Page Builder (parallel)
     5. Output Formatter (write files)
+    6. HTML Renderer (static HTML, only with HTML_RENDERING_ENABLED)
     """
     
     # Initialize workflow
@@ -41,13 +145,15 @@ def create_workflow() -> StateGraph:
     
     # Add nodes (agents)
     workflow.add_node("data_parser", parse_product_data)
-    workflow.add_node("question_generator", generate_questions)
-    workflow.add_node("product_b_generator", generate_product_b)
-    workflow.add_node("content_logic", generate_content_blocks)
-    workflow.add_node("faq_builder", build_faq_page)
-    workflow.add_node("product_page_builder", build_product_page)
-    workflow.add_node("comparison_page_builder", build_comparison_page)
+    workflow.add_node("question_generator", _reusable_node("question_generator", generate_questions))
+    workflow.add_node("product_b_generator", _reusable_node("product_b_generator", generate_product_b))
+    workflow.add_node("content_logic", _reusable_node("content_logic", generate_content_blocks))
+    workflow.add_node("faq_builder", _reusable_node("faq_builder", build_faq_page))
+    workflow.add_node("product_page_builder", _reusable_node("product_page_builder", build_product_page))
+    workflow.add_node("comparison_page_builder", _reusable_node("comparison_page_builder", build_comparison_page))
     workflow.add_node("output_formatter", write_output_files)
+    if HTML_RENDERING_ENABLED:
+        workflow.add_node("html_renderer", render_html_pages)
     
     # Define edges (execution flow)
     
@@ -72,8 +178,12 @@ def create_workflow() -> StateGraph:
     workflow.add_edge("product_page_builder", "output_formatter")
     workflow.add_edge("comparison_page_builder", "output_formatter")
     
-    # Step 6: End after output
-    workflow.add_edge("output_formatter", END)
+    # Step 6: Optionally render HTML, then end
+    if HTML_RENDERING_ENABLED:
+        workflow.add_edge("output_formatter", "html_renderer")
+        workflow.add_edge("html_renderer", END)
+    else:
+        workflow.add_edge("output_formatter", END)
     
     # Compile workflow
     app = workflow.compile()
@@ -81,13 +191,28 @@ def create_workflow() -> StateGraph:
     return app
 
 
-def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict[str, Any]:
+def run_workflow(
+    product_data: Dict[str, Any],
+    input_mode: str = "json",
+    incremental: bool = False,
+    reuse_from: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Run the complete content generation workflow
     
     Args:
         product_data: Product information as dictionary
         input_mode: "json" or "form"
+        incremental: Diff against the stored snapshot and re-run only nodes
+            and blocks whose inputs changed
+        reuse_from: Product ID of a stored near-duplicate; its outputs are
+            adapted to this product the same way as an incremental run
+            (LLM answers mentioning its name are rewritten)
+        run_id: Output namespace (default: a new run ID). Runs given a
+            run_id are part of a batch, which writes the run manifest and
+            flushes the shared stores; other runs do both themselves
+            (manifest_file in the final state)
     
     Returns:
         Final state with all generated content and file paths
@@ -99,6 +224,29 @@ def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict
     print(f"\n📦 Input Product: {product_data.get('name', 'Unknown')}")
     print(f"💰 Price: {product_data.get('currency', '₹')}{product_data.get('price', 0)}")
     print(f"📝 Input Mode: {input_mode}")
+    
+    previous_outputs, changed_fields, skip_nodes = None, None, []
+    if reuse_from:
+        previous_outputs, changed_fields = _load_previous_snapshot(product_data, reuse_from)
+        if changed_fields is not None:
+            skip_nodes = plan_skipped_nodes(changed_fields)
+            # Variants share their representative's competitor (a catalog
+            # competitor is picked per product, never among its own variants)
+            if COMPETITOR_SOURCE != "catalog" and "product_b_generator" not in skip_nodes:
+                skip_nodes.append("product_b_generator")
+            METRICS.increment("near_duplicates.adapted")
+            print(f"🧬 Near-duplicate of {reuse_from} - adapting its outputs")
+            print(f"   Changed fields: {', '.join(changed_fields) or 'none'}")
+            print(f"   Reusing: {', '.join(skip_nodes) or 'nothing'}")
+        else:
+            print(f"⚠️  Warning: No stored outputs for {reuse_from}, generating from scratch")
+    elif incremental:
+        previous_outputs, changed_fields = _load_previous_snapshot(product_data)
+        if changed_fields is not None:
+            skip_nodes = plan_skipped_nodes(changed_fields)
+            print(f"♻️  Incremental run - changed fields: {', '.join(changed_fields) or 'none'}")
+            print(f"   Reusing: {', '.join(skip_nodes) or 'nothing'}")
+    
     print("\n" + "=" * 70)
     
     # Initialize state
@@ -113,6 +261,10 @@ def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict
         "faq_page": None,
         "product_page": None,
         "comparison_page": None,
+        "previous_outputs": previous_outputs,
+        "changed_fields": changed_fields,
+        "skip_nodes": skip_nodes,
+        "run_id": run_id or new_run_id(),
         "workflow_status": "initialized",
         "errors": [],
         "warnings": [],
@@ -136,6 +288,15 @@ def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict
                 print(f"   ❌ {error}")
         else:
             print("\n✅ Workflow completed successfully!")
+            # Snapshot for future incremental runs
+            PRODUCT_STORE.save(final_state)
+            if NEAR_DUPLICATE_ENABLED:
+                index_saved_product(final_state["product_model"])
+        
+        if run_id is None and final_state.get("manifest_entries"):
+            final_state["manifest_file"] = str(
+                write_run_manifest(final_state["run_id"], final_state["manifest_entries"])
+            )
         
         # Summary
         print("\n" + "=" * 70)
@@ -151,6 +312,8 @@ def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict
             for file_path in final_state['written_files']:
                 print(f"   ✅ {Path(file_path).name}")
             print(f"\n📁 Location: {final_state.get('output_directory')}")
+        if final_state.get('manifest_file'):
+            print(f"📋 Output manifest: {final_state['manifest_file']}")
         
         print("\n" + "=" * 70)
         
@@ -159,6 +322,37 @@ def run_workflow(product_data: Dict[str, Any], input_mode: str = "json") -> Dict
     except Exception as e:
         print(f"\n❌ Workflow execution failed: {str(e)}")
         raise
+    finally:
+        # Batch members leave this to the batch
+        if run_id is None:
+            _flush_shared_stores()
+
+
+def _flush_shared_stores() -> None:
+    """Write the catalog-wide stores that buffer their updates during a run"""
+    COMPETITOR_LIBRARY.flush()
+    QUESTION_INDEX.flush()
+    INGREDIENT_KB.flush()
+
+
+def _load_previous_snapshot(product_data: Dict[str, Any], source_id: Optional[str] = None):
+    """
+    Load the stored snapshot for this product (or source_id) and diff it against the new input
+    
+    Returns (previous_outputs, changed_fields); changed_fields is None when
+    there is no usable snapshot and everything must be generated.
+    """
+    try:
+        current = ProductModel(**copy.deepcopy(product_data))
+    except Exception:
+        # Let the Data Parser Agent report invalid input
+        return None, None
+    
+    snapshot = PRODUCT_STORE.load(source_id or current.product_id)
+    if not snapshot:
+        return None, None
+    
+    return snapshot, diff_product_fields(snapshot["product_model"], current)
 
 
 def run_workflow_from_json_file(json_file_path: str) -> Dict[str, Any]:
@@ -179,6 +373,447 @@ def run_workflow_from_json_file(json_file_path: str) -> Dict[str, Any]:
     return run_workflow(product_data, input_mode="json")
 
 
+def run_batch_workflow(
+    products: List[Dict[str, Any]],
+    max_workers: int = BATCH_MAX_WORKERS,
+    incremental: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the workflow for many products concurrently
+
+    All workflows share one LLM circuit breaker, so during a provider incident
+    later products short-circuit to their fallbacks instead of waiting on timeouts.
+    Near-duplicate products (size variants, relaunches) are generated once
+    per cluster; the other variants adapt the representative's outputs.
+    With OUTPUT_SINK = "jsonl", "archive" or "sqlite", pages are appended to
+    the run's JSONL shards (JSONL_OUTPUT_DIR/<run_id>), page archive
+    (ARCHIVE_OUTPUT_DIR/<run_id>.zip) or the result store (RESULT_STORE_FILE)
+    instead of per-product files.
+
+    Args:
+        products: List of product data dictionaries
+        max_workers: Number of workflows to run in parallel
+        incremental: Re-run only what changed since each product's last snapshot
+
+    Returns:
+        Dictionary with per-product final states, failures, metrics, block
+        cache hit rates, near-duplicate clusters, the output sink path,
+        the IDs of products whose pages changed and the output manifest file
+    """
+    run_id = new_run_id()
+    
+    print("=" * 70)
+    print(f"📦 BATCH RUN: {len(products)} products ({max_workers} workers)")
+    print(f"   Run ID: {run_id}")
+    print("=" * 70)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(products)
+    failures = []
+
+    if COMPETITOR_SOURCE == "catalog":
+        _prepare_catalog_index(products)
+
+    variant_sources, duplicate_clusters = {}, []
+    if NEAR_DUPLICATE_ENABLED:
+        variant_sources, duplicate_clusters = _plan_variant_runs(products, incremental)
+
+    # Cluster representatives first, then the variants adapting their outputs
+    phases = [
+        [index for index in range(len(products)) if index not in variant_sources],
+        sorted(variant_sources)
+    ]
+
+    # Workflows append to one shared sink instead of writing per-product files
+    sink_path = open_run_sink(run_id, OUTPUT_SINK).path if OUTPUT_SINK != "files" else None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for phase in phases:
+                futures = {
+                    executor.submit(
+                        run_workflow, products[index], "json", incremental, variant_sources.get(index), run_id
+                    ): index
+                    for index in phase
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        failures.append({
+                            "index": index,
+                            "product_name": products[index].get("name", "Unknown"),
+                            "error": str(e)
+                        })
+    finally:
+        if sink_path is not None:
+            close_run_sink(run_id)
+        _flush_shared_stores()
+
+    # Products whose pages changed, for incremental downstream sync
+    changed_product_ids = [
+        result["product_model"].product_id
+        for result in results
+        if result and result.get("product_model") and result.get("changed_pages")
+    ]
+    changes_file = write_changes_manifest(run_id, changed_product_ids, len(products))
+    manifest_file = write_run_manifest(
+        run_id, (entry for result in results if result for entry in result.get("manifest_entries") or [])
+    )
+
+    metrics = METRICS.snapshot()
+
+    print("\n" + "=" * 70)
+    print("📊 BATCH SUMMARY")
+    print("=" * 70)
+    print(f"   Completed: {len(products) - len(failures)}/{len(products)}")
+    print(f"   LLM circuit state: {LLM_CIRCUIT_BREAKER.state}")
+    for name, value in metrics.items():
+        print(f"   {name}: {value}")
+    block_cache_rates = block_cache_hit_rates(metrics)
+    for scope, rate in block_cache_rates.items():
+        print(f"   Block cache hit rate ({scope}): {rate:.0%}")
+    if sink_path:
+        print(f"   Output sink: {sink_path}")
+    print(f"   Changed products: {len(changed_product_ids)} (see {changes_file})")
+    print(f"   Output manifest: {manifest_file}")
+    if duplicate_clusters:
+        print(f"   Near-duplicate clusters: {len(duplicate_clusters)} "
+              f"({len(variant_sources)} variants adapted instead of generated)")
+        for cluster in duplicate_clusters:
+            print(f"      {cluster['representative']} → {', '.join(cluster['variants'])}")
+
+    return {
+        "run_id": run_id,
+        "results": results,
+        "failures": failures,
+        "metrics": metrics,
+        "block_cache_hit_rates": block_cache_rates,
+        "duplicate_clusters": duplicate_clusters,
+        "output_sink_path": str(sink_path) if sink_path else None,
+        "changed_product_ids": changed_product_ids,
+        "changes_file": str(changes_file),
+        "manifest_file": str(manifest_file)
+    }
+
+
+def _plan_variant_runs(products: List[Dict[str, Any]], incremental: bool):
+    """
+    Find near-duplicates in a batch and the product each one adapts
+
+    Each product is added to the shared near-duplicate index. A variant of a
+    stored product adapts that product's snapshot; within the batch, the
+    first product of a cluster is generated and later ones adapt it. With
+    incremental runs, a product's own snapshot takes precedence.
+
+    Returns ({batch index: source product ID}, [{"representative", "variants"}])
+    """
+    index = get_near_duplicate_index()
+    stored_ids = set(PRODUCT_STORE.product_ids())
+    source_of: Dict[str, Optional[str]] = {}
+    variant_sources: Dict[int, str] = {}
+
+    for position, product in enumerate(products):
+        try:
+            model = ProductModel(**copy.deepcopy(product))
+        except Exception:
+            # Invalid input fails later in the data parser with a proper error
+            continue
+
+        duplicates = index.add(model)
+        source = None
+        if not (incremental and model.product_id in stored_ids):
+            for duplicate in duplicates:
+                if duplicate in source_of:
+                    source = source_of[duplicate] or duplicate
+                    break
+                if duplicate in stored_ids:
+                    source = duplicate
+                    break
+
+        source_of.setdefault(model.product_id, source)
+        if source:
+            variant_sources[position] = source
+
+    clusters: Dict[str, List[str]] = {}
+    for product_id, source in source_of.items():
+        if source:
+            clusters.setdefault(source, []).append(product_id)
+    duplicate_clusters = [
+        {"representative": source, "variants": variants} for source, variants in clusters.items()
+    ]
+    return variant_sources, duplicate_clusters
+
+
+def _prepare_catalog_index(products: List[Dict[str, Any]]) -> None:
+    """Index stored and batch products together and pick every partner in one vectorised pass"""
+    catalog = PRODUCT_STORE.product_models()
+    for product in products:
+        try:
+            catalog.append(ProductModel(**product))
+        except Exception:
+            # Invalid input fails later in the data parser with a proper error
+            continue
+
+    index = CatalogIndex(catalog)
+    index.best_partners(k=1)
+    set_catalog_index(index)
+    print(f"🗂️  Catalog index: {len(index)} products")
+
+
+def rebuild_catalog(
+    product_ids: Optional[List[str]] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild all pages from stored content blocks without any LLM calls
+    
+    Re-runs only the three page builders and the output formatter for every
+    stored product snapshot, spread across a process pool. Use after a page
+    schema change. With an output sink (OUTPUT_SINK = "jsonl", "archive" or "sqlite"),
+    workers return their encoded pages and this process, the single writer,
+    appends them to the run's sink.
+    
+    Args:
+        product_ids: Stored product IDs to rebuild (default: whole catalog)
+        max_workers: Worker processes (default: CPU count)
+    
+    Returns:
+        Dictionary with rebuilt count, per-product failures, the output sink
+        path, the IDs of products whose pages changed and the output
+        manifest file
+    """
+    if product_ids is None:
+        product_ids = PRODUCT_STORE.product_ids()
+    max_workers = max_workers or os.cpu_count() or 1
+    run_id = new_run_id()
+    
+    print("=" * 70)
+    print(f"🔁 REBUILD: {len(product_ids)} stored products ({max_workers} processes)")
+    print(f"   Run ID: {run_id}")
+    print("=" * 70)
+    
+    failures = []
+    rebuilt = 0
+    changed_product_ids = []
+    manifest_entries = []
+    chunksize = max(1, len(product_ids) // (max_workers * REBUILD_CHUNKS_PER_WORKER))
+    sink_type = OUTPUT_SINK if OUTPUT_SINK != "files" else None
+    sink = open_run_sink(run_id, sink_type) if sink_type else None
+    
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(
+                _rebuild_product, product_ids, repeat(run_id), repeat(sink_type), chunksize=chunksize
+            ):
+                serialized_pages = result.pop("serialized_pages", None)
+                entries = result.pop("manifest_entries", [])
+                if serialized_pages:
+                    sink_file = sink.append(
+                        result["product_id"], run_id, serialized_pages, entries, result.pop("content_blocks", None)
+                    )
+                    for entry in entries:
+                        entry["file"] = manifest_file_path(sink_file)
+                manifest_entries.extend(entries)
+                if result["errors"]:
+                    failures.append(result)
+                else:
+                    rebuilt += 1
+                if result.get("changed_pages"):
+                    changed_product_ids.append(result["product_id"])
+    finally:
+        if sink is not None:
+            close_run_sink(run_id)
+    
+    print(f"\n✅ Rebuilt {rebuilt}/{len(product_ids)} products")
+    if sink is not None:
+        print(f"   Output sink: {sink.path}")
+    changes_file = write_changes_manifest(run_id, changed_product_ids, len(product_ids))
+    print(f"   Changed products: {len(changed_product_ids)} (see {changes_file})")
+    manifest_file = write_run_manifest(run_id, manifest_entries)
+    print(f"   Output manifest: {manifest_file}")
+    for failure in failures[:10]:
+        print(f"   ❌ {failure['product_id']}: {failure['errors'][0]}")
+    
+    return {
+        "run_id": run_id,
+        "rebuilt_count": rebuilt,
+        "failures": failures,
+        "output_sink_path": str(sink.path) if sink else None,
+        "changed_product_ids": changed_product_ids,
+        "changes_file": str(changes_file),
+        "manifest_file": str(manifest_file)
+    }
+
+
+def _rebuild_product(product_id: str, run_id: str, sink_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the page builders and output formatter for one stored snapshot (process pool worker)
+    
+    With a sink_type, no files are written; the compact pages are returned as
+    "serialized_pages" for the parent process to append to the run's sink
+    (plus "content_blocks" for the SQLite result store).
+    """
+    snapshot = PRODUCT_STORE.load(product_id)
+    if not snapshot:
+        return {"product_id": product_id, "errors": ["No stored snapshot"], "written_files": []}
+    
+    state = {**snapshot, "run_id": run_id, "errors": [], "warnings": [], "agent_trace": []}
+    previous_pages = {key: snapshot.get(key) for key in PAGE_KEYS}
+    errors = []
+    
+    # Agent logging per product would dominate the runtime of a catalog rebuild
+    with redirect_stdout(io.StringIO()):
+        for builder in (build_faq_page, build_product_page, build_comparison_page):
+            update = builder(state)
+            errors.extend(update.get("errors", []))
+            state.update({k: v for k, v in update.items() if k not in BOOKKEEPING_KEYS})
+        
+        if sink_type:
+            serialized_pages, entries, changed_pages = sink_pages(
+                product_id, run_id, output_pages(state), previous_pages
+            )
+            output = {
+                "serialized_pages": serialized_pages, "changed_pages": changed_pages, "manifest_entries": entries
+            }
+            # Only the result store keeps blocks; don't ship them between processes otherwise
+            if sink_type == "sqlite":
+                output["content_blocks"] = serialize_content_blocks(state.get("content_blocks"))
+            index_faq(product_id, state.get("faq_page"))
+        else:
+            output = write_output_files(state)
+            errors.extend(output.get("errors", []))
+    
+    if not errors:
+        PRODUCT_STORE.save(state)
+    
+    return {
+        "product_id": product_id,
+        "errors": errors,
+        "written_files": output.get("written_files", []),
+        "changed_pages": output.get("changed_pages", []),
+        "manifest_entries": output.get("manifest_entries", []),
+        "serialized_pages": output.get("serialized_pages") if sink_type else None,
+        "content_blocks": output.get("content_blocks")
+    }
+
+
+def render_catalog_html(
+    product_ids: Optional[List[str]] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Render the stored pages of every product to static HTML
+    
+    Products are spread across a process pool; each worker compiles the
+    templates once when it starts. Pages come from the product store, so
+    no LLM calls are made and no JSON outputs are touched. Use for static
+    site deploys or after a template change.
+    
+    Args:
+        product_ids: Stored product IDs to render (default: whole catalog)
+        max_workers: Worker processes (default: CPU count)
+    
+    Returns:
+        Dictionary with rendered product and page counts, per-product
+        failures, throughput and the site directory
+    """
+    if product_ids is None:
+        product_ids = PRODUCT_STORE.product_ids()
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    print("=" * 70)
+    print(f"🌐 HTML RENDER: {len(product_ids)} stored products ({max_workers} processes)")
+    print("=" * 70)
+    
+    failures = []
+    rendered = 0
+    page_count = 0
+    chunksize = max(1, len(product_ids) // (max_workers * REBUILD_CHUNKS_PER_WORKER))
+    started = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=page_templates) as executor:
+        for result in executor.map(_render_product_html, product_ids, chunksize=chunksize):
+            if result["errors"]:
+                failures.append(result)
+            else:
+                rendered += 1
+            page_count += len(result["html_files"])
+    
+    elapsed = time.perf_counter() - started
+    pages_per_minute = page_count / elapsed * 60 if elapsed else 0.0
+    print(f"\n✅ Rendered {page_count} pages for {rendered}/{len(product_ids)} products "
+          f"in {elapsed:.1f}s ({pages_per_minute:,.0f} pages/min)")
+    print(f"   Site: {HTML_OUTPUT_DIR}")
+    for failure in failures[:10]:
+        print(f"   ❌ {failure['product_id']}: {failure['errors'][0]}")
+    
+    return {
+        "rendered_count": rendered,
+        "page_count": page_count,
+        "failures": failures,
+        "pages_per_minute": pages_per_minute,
+        "output_directory": str(HTML_OUTPUT_DIR)
+    }
+
+
+def _render_product_html(product_id: str) -> Dict[str, Any]:
+    """Render one stored product's pages (process pool worker)"""
+    pages = PRODUCT_STORE.load_pages(product_id)
+    if not pages:
+        return {"product_id": product_id, "errors": ["No stored snapshot"], "html_files": []}
+    try:
+        html_files = write_html_pages(product_id, output_pages(pages))
+    except Exception as e:
+        return {"product_id": product_id, "errors": [f"Failed to render HTML pages: {str(e)}"], "html_files": []}
+    return {"product_id": product_id, "errors": [], "html_files": html_files}
+
+
+def run_bulk_comparisons(
+    product_ids: Optional[List[str]] = None,
+    max_price_difference: float = BULK_COMPARISON_MAX_PRICE_DIFFERENCE
+) -> Dict[str, Any]:
+    """
+    Comparison pages for every meaningful pair of stored products per category
+    
+    Pages are computed from the stored product models without any LLM call
+    and written to BULK_COMPARISON_DIR/<category>/<comparison_id>.json.
+    
+    Args:
+        product_ids: Stored product IDs to compare (default: whole catalog)
+        max_price_difference: Max price gap relative to the cheaper product
+    
+    Returns:
+        Dictionary with pages per category and written file paths
+    """
+    if product_ids is None:
+        product_ids = PRODUCT_STORE.product_ids()
+    snapshots = (PRODUCT_STORE.load(product_id) for product_id in product_ids)
+    products = [snapshot["product_model"] for snapshot in snapshots if snapshot]
+    
+    print("=" * 70)
+    print(f"⚖️  BULK COMPARISONS: {len(products)} stored products")
+    print("=" * 70)
+    
+    pages_by_category = build_bulk_comparison_pages(products, max_price_difference)
+    
+    written_files = []
+    for category, pages in pages_by_category.items():
+        category_dir = BULK_COMPARISON_DIR / (re.sub(r"[^a-z0-9]+", "-", category).strip("-") or "general")
+        for page in pages:
+            path = category_dir / f"{page['metadata']['comparison_id']}.json"
+            atomic_write_json(path, page, compact=OUTPUT_COMPACT_JSON)
+            written_files.append(str(path))
+        print(f"   {category}: {len(pages)} comparison pages")
+    
+    print(f"\n✅ Wrote {len(written_files)} comparison pages to {BULK_COMPARISON_DIR}")
+    
+    return {
+        "page_counts": {category: len(pages) for category, pages in pages_by_category.items()},
+        "written_files": written_files
+    }
+
+
 # For visualization (optional)
 def visualize_workflow():
     """
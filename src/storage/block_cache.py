@@ -0,0 +1,139 @@
+"""
+Block Cache
+Content-addressed cache of generated content blocks, shared across products
+and runs. Keys hash the block type, generator version and the exact values
+of the block's source fields, so identical ingredient lists, usage text or
+safety text produce the block once for the whole catalog.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from src.models.content_block_model import ContentBlock
+from src.utils.metrics import METRICS
+from src.config import BLOCK_CACHE_DIR, BLOCK_CACHE_MEMORY_SIZE
+
+
+def block_cache_key(block_type: str, generator_version: str, source_values: Dict[str, Any]) -> str:
+    """sha256 over block type, generator version and canonical JSON of the source values"""
+    payload = json.dumps(
+        {"block_type": block_type, "version": generator_version, "sources": source_values},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BlockCache:
+    """
+    In-memory LRU in front of one JSON file per key on disk
+
+    Files are sharded by the first two hex characters of the key. Only
+    reusable blocks are cached; callers get a deep copy, never the cached
+    instance.
+    """
+
+    def __init__(self, root: Optional[Path] = BLOCK_CACHE_DIR, memory_size: int = BLOCK_CACHE_MEMORY_SIZE):
+        self.root = Path(root) if root else None
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, ContentBlock]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """On-disk location for a key (None for a memory-only cache)"""
+        if self.root is None:
+            return None
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str, block_type: str) -> Optional[ContentBlock]:
+        """Cached block for a key, or None (counts hits and misses per block type)"""
+        block = self._get_from_memory(key)
+        if block is None:
+            block = self._get_from_disk(key)
+            if block is not None:
+                self._remember(key, block)
+
+        if block is None:
+            METRICS.increment("block_cache.misses")
+            METRICS.increment(f"block_cache.{block_type}.misses")
+            return None
+
+        METRICS.increment("block_cache.hits")
+        METRICS.increment(f"block_cache.{block_type}.hits")
+        return block.model_copy(deep=True)
+
+    def put(self, key: str, block: ContentBlock) -> None:
+        """Store a reusable block under its key"""
+        if not block.reusable:
+            return
+        self._remember(key, block.model_copy(deep=True))
+
+        path = self.path_for(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(exist_ok=True, parents=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(block.model_dump(mode="json"), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not persist cached block {key[:12]}: {e}")
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory layer (disk entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def _get_from_memory(self, key: str) -> Optional[ContentBlock]:
+        with self._lock:
+            block = self._memory.get(key)
+            if block is not None:
+                self._memory.move_to_end(key)
+            return block
+
+    def _get_from_disk(self, key: str) -> Optional[ContentBlock]:
+        path = self.path_for(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return ContentBlock(**json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable cached block {key[:12]}: {e}")
+            return None
+
+    def _remember(self, key: str, block: ContentBlock) -> None:
+        with self._lock:
+            self._memory[key] = block
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+
+def block_cache_hit_rates(metrics: Dict[str, int]) -> Dict[str, float]:
+    """Hit rate overall ("all") and per block type from a METRICS snapshot"""
+    totals: Dict[str, Dict[str, int]] = {}
+    for name, value in metrics.items():
+        if not name.startswith("block_cache."):
+            continue
+        scope, _, outcome = name[len("block_cache."):].rpartition(".")
+        if outcome in ("hits", "misses"):
+            totals.setdefault(scope or "all", {"hits": 0, "misses": 0})[outcome] = value
+
+    return {
+        scope: counts["hits"] / (counts["hits"] + counts["misses"])
+        for scope, counts in sorted(totals.items())
+        if counts["hits"] + counts["misses"]
+    }
+
+
+# Shared cache instance
+BLOCK_CACHE = BlockCache()
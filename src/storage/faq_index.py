@@ -0,0 +1,179 @@
+"""
+FAQ Search Index
+Incremental SQLite FTS5 index over every product's FAQ entries, with ranked
+question / answer search across the catalog
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from src.utils.serialization import content_hash
+from src.config import FAQ_INDEX_FILE, FAQ_SEARCH_DEFAULT_LIMIT
+
+
+# faq_entries holds the rows; faq_search is an external-content FTS5 table
+# kept in sync by triggers, so it stores only the inverted index.
+# Questions weigh twice as much as answers in the bm25 rank.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS faq_products (
+    product_id TEXT PRIMARY KEY,
+    product_name TEXT,
+    content_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS faq_entries (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS faq_entries_by_product ON faq_entries (product_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS faq_search USING fts5(
+    question, answer, content='faq_entries', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS faq_entries_insert AFTER INSERT ON faq_entries BEGIN
+    INSERT INTO faq_search (rowid, question, answer) VALUES (new.id, new.question, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS faq_entries_delete AFTER DELETE ON faq_entries BEGIN
+    INSERT INTO faq_search (faq_search, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer);
+END;
+INSERT INTO faq_search (faq_search, rank) VALUES ('rank', 'bm25(2.0, 1.0)');
+"""
+
+_TERM = re.compile(r"\w+")
+
+
+def fts_query(text: str, match_all: bool = False) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text (None if it has no words)
+
+    Every word is quoted, so user input never reaches the FTS5 query syntax.
+    Words are OR-ed by default (bm25 ranks entries matching more of them
+    first); match_all requires every word.
+    """
+    terms = [f'"{term}"' for term in _TERM.findall(text.lower())]
+    if not terms:
+        return None
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+class FaqIndex:
+    """
+    FAQ entries of every product in one SQLite database (WAL mode)
+
+    index_faq_page replaces a product's entries in one transaction and skips
+    FAQs whose content hash is unchanged. Each thread (and each worker
+    process) uses its own connection.
+    """
+
+    def __init__(self, path: Path = FAQ_INDEX_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def index_faq_page(self, product_id: str, faq_page: Dict[str, Any]) -> bool:
+        """Replace a product's indexed entries with those of its FAQ page; False if it was unchanged"""
+        faq_hash = content_hash(faq_page)
+        rows = [
+            (product_id, position, faq.get("question", ""), faq.get("answer", ""), faq.get("category"))
+            for position, faq in enumerate(faq_page.get("faqs") or [])
+        ]
+        connection = self._connection()
+        with connection:
+            stored = connection.execute(
+                "SELECT content_hash FROM faq_products WHERE product_id = ?", (product_id,)
+            ).fetchone()
+            if stored and stored[0] == faq_hash:
+                return False
+            connection.execute("DELETE FROM faq_entries WHERE product_id = ?", (product_id,))
+            connection.executemany(
+                "INSERT INTO faq_entries (product_id, position, question, answer, category) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO faq_products VALUES (?, ?, ?, ?)",
+                (product_id, faq_page.get("product_name"), faq_hash, datetime.now().isoformat())
+            )
+        return True
+
+    def remove_product(self, product_id: str) -> None:
+        """Drop a product's entries from the index"""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM faq_entries WHERE product_id = ?", (product_id,))
+            connection.execute("DELETE FROM faq_products WHERE product_id = ?", (product_id,))
+
+    def search(
+        self,
+        query: str,
+        limit: int = FAQ_SEARCH_DEFAULT_LIMIT,
+        category: Optional[str] = None,
+        product_id: Optional[str] = None,
+        match_all: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Best-matching FAQ entries for free text, best first
+
+        Each hit has product_id, product_name, question, answer, category and
+        score (higher is better). category and product_id narrow the search.
+        """
+        expression = fts_query(query, match_all)
+        if expression is None or not self.path.exists():
+            return []
+
+        sql = (
+            "SELECT e.product_id, p.product_name, e.question, e.answer, e.category, -faq_search.rank"
+            " FROM faq_search"
+            " JOIN faq_entries e ON e.id = faq_search.rowid"
+            " JOIN faq_products p ON p.product_id = e.product_id"
+            " WHERE faq_search MATCH ?"
+        )
+        parameters: List[Any] = [expression]
+        if category is not None:
+            sql += " AND e.category = ?"
+            parameters.append(category)
+        if product_id is not None:
+            sql += " AND e.product_id = ?"
+            parameters.append(product_id)
+        sql += " ORDER BY faq_search.rank LIMIT ?"
+        parameters.append(limit)
+
+        columns = ("product_id", "product_name", "question", "answer", "category", "score")
+        return [dict(zip(columns, row)) for row in self._connection().execute(sql, parameters).fetchall()]
+
+    def entry_count(self) -> int:
+        """Indexed FAQ entries across all products"""
+        if not self.path.exists():
+            return 0
+        return self._connection().execute("SELECT COUNT(*) FROM faq_entries").fetchone()[0]
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork into process pool workers
+        if getattr(self._local, "connection", None) is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("SELECT name FROM sqlite_master WHERE name = 'faq_products'").fetchone() is None:
+                connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+
+# Shared index instance (connections are opened on first use)
+FAQ_INDEX = FaqIndex()
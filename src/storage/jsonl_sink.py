@@ -0,0 +1,175 @@
+"""
+JSONL Output Sink
+Catalog runs append one line per product to rolling, optionally gzip-compressed
+JSONL shards, with a byte-offset index for random access by product ID
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import os
+import gzip
+import threading
+from typing import Dict, Any, List, Optional
+from src.storage.output_paths import atomic_write_json
+from src.utils.serialization import encode_page, decode_page
+from src.config import (
+    JSONL_SHARD_MAX_BYTES, JSONL_COMPRESS, JSONL_GZIP_LEVEL, JSONL_BUFFER_SIZE
+)
+
+
+# Index file in each sink directory: product ID → shard, byte offset, length
+INDEX_FILE = "index.json"
+
+
+def encode_record(product_id: str, run_id: str, serialized_pages: Dict[str, bytes]) -> bytes:
+    """
+    One JSONL line for a product from its already-encoded compact pages
+
+    The page bytes are spliced in as-is, so pages are not encoded twice.
+    Pages are keyed by file stem ("faq", "product_page", "comparison_page").
+    """
+    pages = b",".join(
+        encode_page(Path(file_name).stem) + b":" + data for file_name, data in serialized_pages.items()
+    )
+    return (
+        b'{"product_id":' + encode_page(product_id) +
+        b',"run_id":' + encode_page(run_id) +
+        b',"pages":{' + pages + b"}}\n"
+    )
+
+
+class JsonlSink:
+    """
+    Append-only JSONL shards in one directory
+
+    Records go through a buffered file; when a shard would grow past
+    shard_max_bytes it is flushed, fsynced and closed, and the next shard is
+    started. The index is only saved at shard boundaries and on close, so it
+    never points at data that is not yet on disk.
+
+    With compress, every record is its own gzip member: the shard is still a
+    valid .jsonl.gz file, and a record can be read by seeking to its offset
+    and decompressing just that member.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_max_bytes: int = JSONL_SHARD_MAX_BYTES,
+        compress: bool = JSONL_COMPRESS,
+        buffer_size: int = JSONL_BUFFER_SIZE
+    ):
+        self.directory = Path(directory)
+        self.path = self.directory
+        self.shard_max_bytes = shard_max_bytes
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._index: Dict[str, Dict[str, Any]] = load_index(self.directory)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Never append to shards of an earlier session; continue the numbering
+        self._shard_number = len(list(self.directory.glob("part-*.jsonl*")))
+        self._file = None
+        self._shard_name = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def write(self, product_id: str, line: bytes) -> Dict[str, Any]:
+        """
+        Append one record (a JSONL line) and return its location
+
+        A later record for the same product ID replaces it in the index.
+        """
+        data = gzip.compress(line, compresslevel=JSONL_GZIP_LEVEL) if self.compress else line
+        with self._lock:
+            if self._file is None:
+                self._open_shard()
+            elif self._offset and self._offset + len(data) > self.shard_max_bytes:
+                self._close_shard()
+                self._open_shard()
+
+            self._file.write(data)
+            location = {"shard": self._shard_name, "offset": self._offset, "length": len(data)}
+            self._offset += len(data)
+            self._pending[product_id] = location
+            return dict(location)
+
+    def append(
+        self,
+        product_id: str,
+        run_id: str,
+        serialized_pages: Dict[str, bytes],
+        entries: Optional[List[Dict[str, Any]]] = None,
+        content_blocks: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Append a product's encoded pages as one record and return the shard holding it
+
+        entries and content_blocks are only kept by the result store sink.
+        """
+        location = self.write(product_id, encode_record(product_id, run_id, serialized_pages))
+        return self.directory / location["shard"]
+
+    def close(self) -> None:
+        """Sync the open shard and save the index"""
+        with self._lock:
+            if self._file is not None:
+                self._close_shard()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open_shard(self) -> None:
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        self._shard_name = f"part-{self._shard_number:05d}{suffix}"
+        self._shard_number += 1
+        self._file = open(self.directory / self._shard_name, 'wb', buffering=self.buffer_size)
+        self._offset = 0
+
+    def _close_shard(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+        self._index.update(self._pending)
+        self._pending = {}
+        atomic_write_json(self.directory / INDEX_FILE, {"products": self._index}, compact=True)
+
+
+def load_index(directory: Path) -> Dict[str, Dict[str, Any]]:
+    """Product ID → {shard, offset, length} of a sink directory (empty if none saved yet)"""
+    try:
+        with open(Path(directory) / INDEX_FILE, 'rb') as f:
+            return decode_page(f.read())["products"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def read_record(
+    directory: Path,
+    product_id: str,
+    index: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    A product's record from a sink directory, read by seeking to its offset
+
+    Pass a loaded index to avoid re-reading it for every lookup.
+    """
+    index = load_index(directory) if index is None else index
+    location = index.get(product_id)
+    if location is None:
+        return None
+
+    with open(Path(directory) / location["shard"], 'rb') as f:
+        f.seek(location["offset"])
+        data = f.read(location["length"])
+    if location["shard"].endswith(".gz"):
+        data = gzip.decompress(data)
+    return decode_page(data)
+
@@ -0,0 +1,105 @@
+"""
+Output Manifest
+Per-run list of every page with its content hash, size, schema version and
+generation time, mergeable across batch shards so publishers sync only deltas
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Tuple
+from src.storage.output_paths import atomic_write_json
+from src.utils.serialization import decode_page
+from src.config import OUTPUTS_DIR, OUTPUT_MANIFEST_DIR
+
+
+# Bump when the manifest layout itself changes
+MANIFEST_FORMAT_VERSION = 1
+
+
+def manifest_file_path(path: Path) -> str:
+    """Page location as stored in manifests (relative to OUTPUTS_DIR where possible)"""
+    try:
+        return Path(path).relative_to(OUTPUTS_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def build_manifest(run_ids: Iterable[str], entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Manifest of page entries
+
+    Each entry has product_id, page_type, file, content_hash, size,
+    schema_version, generated_at, run_id and changed. There is one entry per
+    (product_id, page_type); of duplicates, the entry from the latest run
+    (run IDs sort chronologically) is kept.
+    """
+    pages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for entry in entries:
+        key = (entry["product_id"], entry["page_type"])
+        current = pages.get(key)
+        if current is None or (entry["run_id"], entry["generated_at"]) > (current["run_id"], current["generated_at"]):
+            pages[key] = entry
+
+    return {
+        "format_version": MANIFEST_FORMAT_VERSION,
+        "run_ids": sorted(set(run_ids)),
+        "generated_at": datetime.now().isoformat(),
+        "page_count": len(pages),
+        "product_count": len({product_id for product_id, _ in pages}),
+        "pages": [pages[key] for key in sorted(pages)]
+    }
+
+
+def merge_manifests(*manifests: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One manifest covering several (e.g. the shards of a batch run)
+
+    The merge is order-independent: for every page the entry from the
+    latest run wins.
+    """
+    for manifest in manifests:
+        if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+            raise ValueError(f"Unsupported manifest format version: {manifest.get('format_version')}")
+    return build_manifest(
+        (run_id for manifest in manifests for run_id in manifest["run_ids"]),
+        (entry for manifest in manifests for entry in manifest["pages"])
+    )
+
+
+def manifest_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    What a publisher has to sync to go from one manifest to the next
+
+    Returns:
+        "upserts": entries that are new or whose content hash changed;
+        "removals": (product_id, page_type) entries that are no longer listed
+    """
+    previous_hashes = {(entry["product_id"], entry["page_type"]): entry["content_hash"] for entry in previous["pages"]}
+    current_keys = set()
+    upserts = []
+    for entry in current["pages"]:
+        key = (entry["product_id"], entry["page_type"])
+        current_keys.add(key)
+        if previous_hashes.get(key) != entry["content_hash"]:
+            upserts.append(entry)
+
+    removals = [
+        {"product_id": product_id, "page_type": page_type}
+        for product_id, page_type in sorted(previous_hashes.keys() - current_keys)
+    ]
+    return {"upserts": upserts, "removals": removals}
+
+
+def write_run_manifest(run_id: str, entries: Iterable[Dict[str, Any]]) -> Path:
+    """Write OUTPUT_MANIFEST_DIR/<run_id>.json for a run"""
+    path = OUTPUT_MANIFEST_DIR / f"{run_id}.json"
+    atomic_write_json(path, build_manifest([run_id], entries))
+    return path
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    """Read a manifest file"""
+    with open(path, 'rb') as f:
+        return decode_page(f.read())
@@ -0,0 +1,156 @@
+"""
+Output Paths
+Per-product, per-run output directories in a sharded layout, with atomic
+writes so concurrent runs never clobber each other and readers never see
+half-written files
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from src.utils.serialization import encode_page
+from src.config import OUTPUT_PRODUCTS_DIR, OUTPUT_SHARD_WIDTH, OUTPUT_RUNS_TO_KEEP, OUTPUT_CHANGES_DIR
+
+
+# Pointer file in each product directory naming its most recent run
+LATEST_RUN_FILE = "latest.json"
+
+
+def new_run_id() -> str:
+    """Sortable, collision-free run ID (timestamp plus random suffix)"""
+    return f"{datetime.now():%Y%m%dT%H%M%S%f}_{uuid.uuid4().hex[:8]}"
+
+
+def safe_path_component(product_id: str) -> str:
+    """
+    A product ID usable as one file or directory name
+
+    Characters outside [A-Za-z0-9_.-] (path separators included) become "_",
+    and "", "." and ".." get a "_" prefix so the name never leaves its
+    parent directory.
+    """
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", product_id)
+    return f"_{safe_id}" if safe_id in {"", ".", ".."} else safe_id
+
+
+def product_output_root(product_id: str) -> Path:
+    """
+    Directory holding all runs of a product
+
+    Products are spread over hash-prefix shard directories
+    (OUTPUTS_DIR/products/<shard>/<product_id>) so no single directory grows
+    to hundreds of thousands of entries.
+    """
+    shard = hashlib.sha1(product_id.encode("utf-8")).hexdigest()[:OUTPUT_SHARD_WIDTH]
+    return OUTPUT_PRODUCTS_DIR / shard / safe_path_component(product_id)
+
+
+def run_output_dir(product_id: str, run_id: str) -> Path:
+    """Directory for one run's files of a product"""
+    return product_output_root(product_id) / run_id
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write to a unique temp file in the same directory, then rename over the target"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_json(path: Path, data: Any, compact: bool = False) -> None:
+    """UTF-8 JSON (pretty-printed unless compact), written atomically"""
+    atomic_write_bytes(path, encode_page(data, compact=compact))
+
+
+def link_unchanged(source: Path, target: Path) -> bool:
+    """
+    Hard-link an unchanged file from an earlier run instead of rewriting it
+
+    The run directory stays complete while the file keeps its inode and
+    modification time. Returns False (and the caller writes the file) when
+    the source is gone or the file system cannot link.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        return False
+
+
+def mark_latest_run(
+    product_id: str,
+    run_id: str,
+    file_names: List[str],
+    pages: Optional[Dict[str, Dict[str, Any]]] = None
+) -> None:
+    """
+    Point the product's latest.json at a finished run and prune old runs
+
+    pages (file name → manifest entry with content hash, size, schema
+    version) are kept so the next run can tell which pages changed. Only the
+    newest OUTPUT_RUNS_TO_KEEP run directories are kept (run IDs sort
+    chronologically).
+    """
+    root = product_output_root(product_id)
+    atomic_write_json(root / LATEST_RUN_FILE, {
+        "product_id": product_id,
+        "run_id": run_id,
+        "files": file_names,
+        "pages": pages or {},
+        "updated_at": datetime.now().isoformat()
+    })
+
+    runs = sorted(entry.name for entry in os.scandir(root) if entry.is_dir())
+    for old_run in runs[:-OUTPUT_RUNS_TO_KEEP]:
+        if old_run != run_id:
+            shutil.rmtree(root / old_run, ignore_errors=True)
+
+
+def latest_run_manifest(product_id: str) -> Optional[Dict[str, Any]]:
+    """The product's latest.json (run ID, files, page manifest entries), if any"""
+    try:
+        with open(product_output_root(product_id) / LATEST_RUN_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if "run_id" in manifest else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def latest_run_dir(product_id: str) -> Optional[Path]:
+    """Directory of the product's most recent finished run, if any"""
+    manifest = latest_run_manifest(product_id)
+    return product_output_root(product_id) / manifest["run_id"] if manifest else None
+
+
+def write_changes_manifest(run_id: str, changed_product_ids: List[str], product_count: int) -> Path:
+    """
+    Record which products' pages changed in a catalog run
+
+    Written to OUTPUT_CHANGES_DIR/<run_id>.json for incremental downstream sync.
+    """
+    path = OUTPUT_CHANGES_DIR / f"{run_id}.json"
+    atomic_write_json(path, {
+        "run_id": run_id,
+        "product_count": product_count,
+        "changed_count": len(changed_product_ids),
+        "changed_product_ids": sorted(changed_product_ids),
+        "generated_at": datetime.now().isoformat()
+    })
+    return path
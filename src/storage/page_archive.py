@@ -0,0 +1,181 @@
+"""
+Page Archive
+One zip file per catalog run holding every page, with a central index by
+product ID and page type for memory-mapped random access without extracting
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import os
+import mmap
+import uuid
+import struct
+import zlib
+import zipfile
+import threading
+from typing import Dict, Any, List, Optional
+from src.utils.serialization import encode_page, decode_page
+from src.storage.output_paths import safe_path_component
+from src.config import ARCHIVE_COMPRESS
+
+
+# Index member written last; its location is kept in the zip comment
+INDEX_MEMBER = "index.json"
+ARCHIVE_FORMAT_VERSION = 1
+
+# Local file header: signature, version, flags, method, time, date, crc, sizes, name and extra lengths
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_END_OF_CENTRAL_DIRECTORY = b"PK\x05\x06"
+_MAX_EOCD_SIZE = 22 + 0xFFFF  # Fixed part plus the longest comment
+
+
+class ArchiveSink:
+    """
+    Writes a run's pages into one zip archive (members <product_id>/<file name>)
+
+    Pages are stored uncompressed by default so a reader can slice them
+    straight out of a memory map. The archive is written under a temp name
+    and renamed into place on close, after the index member is added and the
+    file is fsynced, so readers never see a partial archive.
+    """
+
+    def __init__(self, path: Path, compress: bool = ARCHIVE_COMPRESS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.tmp")
+        self._file = open(self._tmp_path, 'w+b')
+        self._zip = zipfile.ZipFile(
+            self._file, 'w', compression=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        )
+        self._index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def append(
+        self,
+        product_id: str,
+        run_id: str,
+        serialized_pages: Dict[str, bytes],
+        entries: Optional[List[Dict[str, Any]]] = None,
+        content_blocks: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Add a product's encoded pages (file name → bytes) and return the archive path
+
+        A later append for the same product replaces its pages in the index
+        (zipfile warns about the duplicate member name).
+        entries and content_blocks are only kept by the result store sink.
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Archive already closed: {self.path}")
+            pages = self._index.setdefault(product_id, {})
+            for file_name, data in serialized_pages.items():
+                self._zip.writestr(f"{safe_path_component(product_id)}/{file_name}", data)
+                info = self._zip.filelist[-1]
+                pages[Path(file_name).stem] = {
+                    "header_offset": info.header_offset,
+                    "size": info.compress_size,
+                    "length": info.file_size
+                }
+        return self.path
+
+    def close(self) -> None:
+        """Add the index, sync and move the archive into place"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            index = encode_page(
+                {"format_version": ARCHIVE_FORMAT_VERSION, "products": self._index}, compact=True
+            )
+            self._zip.writestr(INDEX_MEMBER, index, compress_type=zipfile.ZIP_STORED)
+            info = self._zip.filelist[-1]
+            self._zip.comment = encode_page(
+                {"index_offset": info.header_offset, "index_size": info.file_size}, compact=True
+            )
+            self._zip.close()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+
+    def __enter__(self) -> "ArchiveSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PageArchive:
+    """
+    Read pages from an archive through a memory map
+
+    Opening reads only the end-of-archive record and the index member (not
+    the zip central directory), so it stays fast for archives with hundreds
+    of thousands of pages. The archive is also a regular zip file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self._load_index()
+        except (ValueError, OSError, KeyError, struct.error) as e:
+            self._file.close()
+            raise ValueError(f"Not a page archive: {self.path} ({e})") from e
+
+    def read(self, product_id: str, page_type: str) -> Optional[bytes]:
+        """Encoded page bytes (page_type is the file stem, e.g. "faq"), or None if absent"""
+        location = self._index.get(product_id, {}).get(page_type)
+        if location is None:
+            return None
+        return self._member_data(location["header_offset"], location["size"])
+
+    def page(self, product_id: str, page_type: str) -> Optional[Dict[str, Any]]:
+        """Decoded page, or None if absent"""
+        data = self.read(product_id, page_type)
+        return decode_page(data) if data is not None else None
+
+    def products(self) -> List[str]:
+        """Product IDs in the archive"""
+        return list(self._index)
+
+    def page_types(self, product_id: str) -> List[str]:
+        """Page types stored for a product"""
+        return list(self._index.get(product_id, {}))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load_index(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        eocd = self._map.rfind(_END_OF_CENTRAL_DIRECTORY, max(0, len(self._map) - _MAX_EOCD_SIZE))
+        if eocd < 0:
+            raise ValueError("no end of central directory record")
+        (comment_length,) = struct.unpack_from("<H", self._map, eocd + 20)
+        pointer = decode_page(self._map[eocd + 22:eocd + 22 + comment_length])
+        index = decode_page(self._member_data(pointer["index_offset"], pointer["index_size"]))
+        if index.get("format_version") != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {index.get('format_version')}")
+        return index["products"]
+
+    def _member_data(self, header_offset: int, size: int) -> bytes:
+        header = _LOCAL_HEADER.unpack_from(self._map, header_offset)
+        method, name_length, extra_length = header[3], header[9], header[10]
+        start = header_offset + _LOCAL_HEADER.size + name_length + extra_length
+        data = self._map[start:start + size]
+        if method == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        return data
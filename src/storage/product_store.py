@@ -0,0 +1,174 @@
+"""
+Product Store
+Persists each product's last successful snapshot (models, questions, content
+blocks and pages) so later runs can diff inputs and reuse unchanged outputs
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+from src.models.content_block_model import ContentBlock
+from src.storage.output_paths import safe_path_component
+from src.config import PRODUCT_STORE_DIR
+
+
+# ProductModel fields that are system-generated and never count as a change
+SNAPSHOT_IGNORED_FIELDS = {"product_id", "created_at", "field_count", "completeness_score"}
+
+# Page keys persisted alongside the models
+PAGE_KEYS = ["faq_page", "product_page", "comparison_page"]
+
+
+def diff_product_fields(previous: Optional[ProductModel], current: ProductModel) -> Optional[List[str]]:
+    """
+    List the ProductModel fields whose values differ
+
+    Returns None when there is no previous snapshot (everything must be generated).
+    """
+    if previous is None:
+        return None
+
+    old = previous.model_dump(mode="json", exclude=SNAPSHOT_IGNORED_FIELDS)
+    new = current.model_dump(mode="json", exclude=SNAPSHOT_IGNORED_FIELDS)
+
+    return sorted(field for field in new if old.get(field) != new.get(field))
+
+
+def serialize_content_blocks(blocks: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """ContentBlock dict (values may be lists of blocks) to plain JSON data"""
+    serialized = {}
+    for key, value in (blocks or {}).items():
+        if isinstance(value, list):
+            serialized[key] = [block.model_dump(mode="json") for block in value]
+        else:
+            serialized[key] = value.model_dump(mode="json")
+    return serialized
+
+
+def deserialize_content_blocks(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Inverse of serialize_content_blocks"""
+    blocks = {}
+    for key, value in (data or {}).items():
+        if isinstance(value, list):
+            blocks[key] = [ContentBlock(**block) for block in value]
+        else:
+            blocks[key] = ContentBlock(**value)
+    return blocks
+
+
+class ProductStore:
+    """One JSON snapshot file per product ID"""
+
+    def __init__(self, root: Path = PRODUCT_STORE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path_for(self, product_id: str) -> Path:
+        """Snapshot path for a product (IDs are sanitised for the filesystem)"""
+        return self.root / f"{safe_path_component(product_id)}.json"
+
+    def load(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a snapshot with models rebuilt
+
+        Returns a dict with product_model, product_b_model, questions,
+        questions_by_category, content_blocks, the page dicts and updated_at,
+        or None if not stored.
+        """
+        path = self.path_for(product_id)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not load snapshot for {product_id}: {e}")
+            return None
+
+        questions = [QuestionModel(**q) for q in data.get("questions", [])]
+        questions_by_category = {}
+        for question in questions:
+            questions_by_category.setdefault(question.category, []).append(question)
+
+        snapshot = {
+            "product_model": ProductModel(**data["product_model"]),
+            "product_b_model": ProductModel(**data["product_b_model"]) if data.get("product_b_model") else None,
+            "questions": questions,
+            "questions_by_category": questions_by_category,
+            "content_blocks": deserialize_content_blocks(data.get("content_blocks")),
+            "updated_at": data.get("updated_at")
+        }
+        for key in PAGE_KEYS:
+            snapshot[key] = data.get(key)
+        return snapshot
+
+    def load_pages(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Only the stored page dicts (no models are rebuilt), or None if not stored"""
+        data = self._read(product_id)
+        return {key: data.get(key) for key in PAGE_KEYS} if data is not None else None
+
+    def load_product_model(self, product_id: str) -> Optional[ProductModel]:
+        """Only the stored ProductModel (questions, blocks and Product B are not rebuilt), or None"""
+        data = self._read(product_id)
+        return ProductModel(**data["product_model"]) if data is not None else None
+
+    def product_models(self) -> List[ProductModel]:
+        """Every stored ProductModel, e.g. to build a catalog-wide index"""
+        models = (self.load_product_model(product_id) for product_id in self.product_ids())
+        return [model for model in models if model is not None]
+
+    def save(self, state: Dict[str, Any]) -> Optional[Path]:
+        """Persist the models, questions, blocks and pages from a final workflow state"""
+        product_model = state.get("product_model")
+        if not product_model:
+            return None
+
+        product_b_model = state.get("product_b_model")
+        data = {
+            "product_model": product_model.model_dump(mode="json"),
+            "product_b_model": product_b_model.model_dump(mode="json") if product_b_model else None,
+            "questions": [q.model_dump(mode="json") for q in state.get("questions") or []],
+            "content_blocks": serialize_content_blocks(state.get("content_blocks")),
+            "updated_at": datetime.now().isoformat()
+        }
+        for key in PAGE_KEYS:
+            data[key] = state.get(key)
+
+        path = self.path_for(product_model.product_id)
+        with self._lock:
+            self.root.mkdir(exist_ok=True, parents=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        return path
+
+    def product_ids(self) -> List[str]:
+        """Stored product IDs (as sanitised for the filesystem; valid for load)"""
+        if not self.root.exists():
+            return []
+        return sorted(path.stem for path in self.root.glob("*.json"))
+
+
+    def _read(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Raw snapshot JSON, or None if not stored or unreadable"""
+        try:
+            with open(self.path_for(product_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not load snapshot for {product_id}: {e}")
+            return None
+
+
+# Shared store instance
+PRODUCT_STORE = ProductStore()
@@ -0,0 +1,254 @@
+"""
+Result Store
+SQLite database (WAL mode) of generated pages, content blocks and run
+metadata, indexed by product ID, page type and run
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from src.utils.serialization import encode_page, decode_page
+from src.config import RESULT_STORE_FILE, RESULT_STORE_BATCH_SIZE
+
+
+# Run IDs sort chronologically, so "latest" is the largest run_id
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    product_count INTEGER NOT NULL DEFAULT 0,
+    page_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pages (
+    product_id TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    content_hash TEXT,
+    schema_version TEXT,
+    generated_at TEXT,
+    data BLOB NOT NULL,
+    PRIMARY KEY (product_id, page_type, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_by_run ON pages (run_id, product_id);
+CREATE TABLE IF NOT EXISTS blocks (
+    product_id TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    block_key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (product_id, run_id, block_key)
+) WITHOUT ROWID;
+"""
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the database in WAL mode (readers never block the writer) and create the tables"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only fsyncs at checkpoints; committed batches survive a process crash
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class ResultStoreSink:
+    """
+    Writes a run's pages and content blocks into the result store
+
+    Products are buffered and inserted batch_size at a time, each batch in
+    one transaction. The run's row in the runs table is written on open and
+    completed (finish time, counts) on close.
+    """
+
+    def __init__(self, run_id: str, path: Path = RESULT_STORE_FILE, batch_size: int = RESULT_STORE_BATCH_SIZE):
+        self.path = Path(path)
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self._connection = connect(self.path)
+        self._page_rows: List[Tuple] = []
+        self._block_rows: List[Tuple] = []
+        self._buffered_products = 0
+        self._product_count = 0
+        self._page_count = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO runs (run_id, started_at) VALUES (?, ?)",
+                (run_id, datetime.now().isoformat())
+            )
+
+    def append(
+        self,
+        product_id: str,
+        run_id: str,
+        serialized_pages: Dict[str, bytes],
+        entries: Optional[List[Dict[str, Any]]] = None,
+        content_blocks: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Buffer a product's encoded pages and return the database path
+
+        entries are the pages' manifest entries in the same order (for content
+        hash, schema version and generation time); content_blocks is the
+        serialized block dict.
+        """
+        entries = entries or [{}] * len(serialized_pages)
+        page_rows = [
+            (
+                product_id, Path(file_name).stem, run_id, entry.get("content_hash"),
+                entry.get("schema_version"), entry.get("generated_at"), data
+            )
+            for (file_name, data), entry in zip(serialized_pages.items(), entries)
+        ]
+        block_rows = [
+            (product_id, run_id, key, encode_page(value, compact=True))
+            for key, value in (content_blocks or {}).items()
+        ]
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Result store sink already closed for run {self.run_id}")
+            self._page_rows.extend(page_rows)
+            self._block_rows.extend(block_rows)
+            self._buffered_products += 1
+            if self._buffered_products >= self.batch_size:
+                self._flush()
+        return self.path
+
+    def close(self) -> None:
+        """Insert the remaining buffer and record the run's counts"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush()
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE runs SET finished_at = ?, product_count = ?, page_count = ? WHERE run_id = ?",
+                    (datetime.now().isoformat(), self._product_count, self._page_count, self.run_id)
+                )
+            self._connection.close()
+
+    def __enter__(self) -> "ResultStoreSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _flush(self) -> None:
+        if not self._buffered_products:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", self._page_rows
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)", self._block_rows
+            )
+        self._product_count += self._buffered_products
+        self._page_count += len(self._page_rows)
+        self._page_rows, self._block_rows, self._buffered_products = [], [], 0
+
+
+class ResultStore:
+    """
+    Queries over stored runs
+
+    Each thread gets its own read connection; with WAL they see the last
+    committed batch while a sink keeps writing.
+    """
+
+    def __init__(self, path: Path = RESULT_STORE_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def page(self, product_id: str, page_type: str, run_id: Optional[str] = None) -> Optional[bytes]:
+        """
+        Encoded page (page_type is the file stem, e.g. "faq") from a run
+
+        Without run_id, the page from the product's latest run is returned.
+        """
+        row = self._page_row("data", product_id, page_type, run_id)
+        return row[0] if row else None
+
+    def page_info(self, product_id: str, page_type: str, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """run_id, content_hash, schema_version and generated_at of a stored page (latest run by default)"""
+        row = self._page_row("run_id, content_hash, schema_version, generated_at", product_id, page_type, run_id)
+        if not row:
+            return None
+        return dict(zip(("run_id", "content_hash", "schema_version", "generated_at"), row))
+
+    def product_pages(self, product_id: str, run_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Decoded pages of a product (page type → page) from a run, latest run by default"""
+        run_id = run_id or self._latest_run(product_id)
+        rows = self._query(
+            "SELECT page_type, data FROM pages WHERE product_id = ? AND run_id = ?", (product_id, run_id)
+        )
+        return {page_type: decode_page(data) for page_type, data in rows}
+
+    def content_blocks(self, product_id: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Serialized content blocks of a product (block key → data), latest run by default"""
+        run_id = run_id or self._latest_run(product_id)
+        rows = self._query(
+            "SELECT block_key, data FROM blocks WHERE product_id = ? AND run_id = ?", (product_id, run_id)
+        )
+        return {key: decode_page(data) for key, data in rows}
+
+    def product_ids(self, run_id: Optional[str] = None) -> List[str]:
+        """Product IDs with stored pages (in one run, or in any)"""
+        if run_id is None:
+            rows = self._query("SELECT DISTINCT product_id FROM pages ORDER BY product_id")
+        else:
+            rows = self._query(
+                "SELECT DISTINCT product_id FROM pages WHERE run_id = ? ORDER BY product_id", (run_id,)
+            )
+        return [product_id for (product_id,) in rows]
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Run metadata, oldest first"""
+        columns = ("run_id", "started_at", "finished_at", "product_count", "page_count")
+        rows = self._query(f"SELECT {', '.join(columns)} FROM runs ORDER BY run_id")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self) -> None:
+        """Close this thread's read connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _page_row(self, columns: str, product_id: str, page_type: str, run_id: Optional[str]) -> Optional[Tuple]:
+        if run_id is None:
+            rows = self._query(
+                f"SELECT {columns} FROM pages WHERE product_id = ? AND page_type = ? ORDER BY run_id DESC LIMIT 1",
+                (product_id, page_type)
+            )
+        else:
+            rows = self._query(
+                f"SELECT {columns} FROM pages WHERE product_id = ? AND page_type = ? AND run_id = ?",
+                (product_id, page_type, run_id)
+            )
+        return rows[0] if rows else None
+
+    def _latest_run(self, product_id: str) -> Optional[str]:
+        rows = self._query("SELECT MAX(run_id) FROM pages WHERE product_id = ?", (product_id,))
+        return rows[0][0]
+
+    def _query(self, sql: str, parameters: Iterable[Any] = ()) -> List[Tuple]:
+        if not self.path.exists():
+            return []
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect(self.path)
+            self._local.connection = connection
+        return connection.execute(sql, tuple(parameters)).fetchall()
+
+
+# Shared store instance (connections are opened on first query)
+RESULT_STORE = ResultStore()
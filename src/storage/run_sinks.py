@@ -0,0 +1,61 @@
+"""
+Run Sinks
+Shared per-run output sinks (JSONL shards, a page archive or the result store)
+that catalog runs write to instead of per-product files
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+from typing import Dict, Optional, Union
+from src.storage.jsonl_sink import JsonlSink
+from src.storage.page_archive import ArchiveSink
+from src.storage.result_store import ResultStoreSink
+from src.config import OUTPUT_SINK, JSONL_OUTPUT_DIR, ARCHIVE_OUTPUT_DIR, RESULT_STORE_FILE
+
+
+# All expose path, append(product_id, run_id, serialized_pages, entries, content_blocks) -> Path and close()
+RunSink = Union[JsonlSink, ArchiveSink, ResultStoreSink]
+
+_run_sinks: Dict[str, RunSink] = {}
+_run_sinks_lock = threading.Lock()
+
+
+def run_sink_path(run_id: str, sink_type: str = OUTPUT_SINK) -> Path:
+    """Sink location of a catalog run (a JSONL directory, an archive file or the shared result store)"""
+    if sink_type == "jsonl":
+        return JSONL_OUTPUT_DIR / run_id
+    if sink_type == "archive":
+        return ARCHIVE_OUTPUT_DIR / f"{run_id}.zip"
+    if sink_type == "sqlite":
+        return RESULT_STORE_FILE
+    raise ValueError(f"Unknown output sink: {sink_type}")
+
+
+def open_run_sink(run_id: str, sink_type: str = OUTPUT_SINK) -> RunSink:
+    """Open the shared sink for a run; the Output Formatter Agent appends to it instead of writing files"""
+    with _run_sinks_lock:
+        if run_id not in _run_sinks:
+            path = run_sink_path(run_id, sink_type)
+            if sink_type == "jsonl":
+                _run_sinks[run_id] = JsonlSink(path)
+            elif sink_type == "archive":
+                _run_sinks[run_id] = ArchiveSink(path)
+            else:
+                _run_sinks[run_id] = ResultStoreSink(run_id, path)
+        return _run_sinks[run_id]
+
+
+def get_run_sink(run_id: Optional[str]) -> Optional[RunSink]:
+    """The open sink of a run, if any"""
+    with _run_sinks_lock:
+        return _run_sinks.get(run_id)
+
+
+def close_run_sink(run_id: str) -> None:
+    """Close a run's sink (syncs the data and saves its index)"""
+    with _run_sinks_lock:
+        sink = _run_sinks.pop(run_id, None)
+    if sink is not None:
+        sink.close()
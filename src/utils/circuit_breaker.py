@@ -0,0 +1,140 @@
+"""
+Circuit Breaker
+Stops calling a degraded provider once its error ratio crosses a threshold
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from src.utils.metrics import METRICS
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker
+
+    States:
+    - closed: calls go through, outcomes are recorded in a rolling window
+    - open: calls are rejected immediately until reset_timeout has elapsed
+    - half_open: a limited number of probe calls decide whether to close or re-open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_ratio: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._outcomes = deque(maxlen=window_size)  # True = failure
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half_open once the cooldown has elapsed"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, reserving a probe slot if half-open"""
+        with self._lock:
+            self._refresh_state()
+
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # Probe succeeded - provider has recovered
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._state = self.CLOSED
+                self._outcomes.clear()
+                print(f"🟢 Circuit '{self.name}' closed (probe succeeded)")
+                return
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the error ratio is exceeded"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # Probe failed - back to open for another cooldown
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._trip()
+                return
+
+            self._outcomes.append(True)
+
+            if len(self._outcomes) >= self.min_calls:
+                ratio = sum(self._outcomes) / len(self._outcomes)
+                if ratio >= self.failure_ratio:
+                    self._trip()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func through the breaker
+
+        Raises CircuitOpenError without calling func when the circuit is open
+        """
+        if not self.allow_request():
+            METRICS.increment(f"{self.name}.short_circuited")
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            METRICS.increment(f"{self.name}.failures")
+            self.record_failure()
+            raise
+
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        """Force the breaker back to closed with an empty window"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._half_open_in_flight = 0
+
+    def _trip(self) -> None:
+        """Open the circuit (caller holds the lock)"""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        METRICS.increment(f"{self.name}.opened")
+        print(f"🔴 Circuit '{self.name}' opened - short-circuiting calls for {self.reset_timeout}s")
+
+    def _refresh_state(self) -> None:
+        """Move open -> half_open after the cooldown (caller holds the lock)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_in_flight = 0
@@ -0,0 +1,98 @@
+"""
+JSON Patch
+RFC 6902 patches between two versions of a page, so consumers can apply
+small deltas instead of re-downloading full documents
+"""
+import copy
+from typing import Any, Dict, List
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    RFC 6902 operations turning old into new
+
+    Objects are compared key by key and arrays index by index (extra
+    elements are added at the end or removed from the end), so a changed
+    price is a single "replace" rather than a new document. Only add, remove
+    and replace are emitted.
+    """
+    operations: List[Dict[str, Any]] = []
+    _diff(old, new, "", operations)
+    return operations
+
+
+def _diff(old: Any, new: Any, path: str, operations: List[Dict[str, Any]]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                operations.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff(old[key], value, child, operations)
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for index in range(common):
+            _diff(old[index], new[index], f"{path}/{index}", operations)
+        for index in range(len(old) - 1, common - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{index}"})
+        for value in new[common:]:
+            operations.append({"op": "add", "path": f"{path}/-", "value": value})
+    elif type(old) is not type(new) or old != new:
+        # type check keeps 1 and 1.0 or 1 and True distinct, as they are in JSON
+        operations.append({"op": "replace", "path": path, "value": new})
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    Apply add / remove / replace operations to a copy of document
+
+    Raises:
+        ValueError: For unsupported operations or paths that do not resolve
+    """
+    document = copy.deepcopy(document)
+    for operation in patch:
+        op, path = operation["op"], operation["path"]
+        if op not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported patch operation: {op}")
+        if path == "":
+            if op == "remove":
+                raise ValueError("Cannot remove the whole document")
+            document = copy.deepcopy(operation["value"])
+            continue
+
+        *parents, last = [_unescape(token) for token in path.split("/")[1:]]
+        target = document
+        try:
+            for token in parents:
+                target = target[int(token)] if isinstance(target, list) else target[token]
+            if isinstance(target, list):
+                index = len(target) if last == "-" else int(last)
+                if not 0 <= index <= len(target):
+                    raise IndexError(index)
+                if op == "add":
+                    target.insert(index, copy.deepcopy(operation["value"]))
+                elif op == "remove":
+                    del target[index]
+                else:
+                    target[index] = copy.deepcopy(operation["value"])
+            else:
+                if op != "add" and last not in target:
+                    raise KeyError(last)
+                if op == "remove":
+                    del target[last]
+                else:
+                    target[last] = copy.deepcopy(operation["value"])
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Patch path does not resolve: {path} ({e})") from e
+    return document
@@ -0,0 +1,126 @@
+"""
+LLM Client
+Single entry point for every LLM call, guarded by a shared circuit breaker
+and coalescing identical in-flight prompts
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from openai import OpenAIError
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.singleflight import SingleFlight
+from src.utils.metrics import METRICS
+from src.config import (
+    OPENAI_MODEL, OPENAI_TEMPERATURE, LLM_REQUEST_TIMEOUT, LLM_MAX_RETRIES,
+    CIRCUIT_BREAKER_FAILURE_RATIO, CIRCUIT_BREAKER_WINDOW_SIZE,
+    CIRCUIT_BREAKER_MIN_CALLS, CIRCUIT_BREAKER_RESET_TIMEOUT,
+    LLM_RESPONSE_CACHE_SIZE
+)
+
+
+# Shared across all agents and workflows in this process
+LLM_CIRCUIT_BREAKER = CircuitBreaker(
+    name="llm",
+    failure_ratio=CIRCUIT_BREAKER_FAILURE_RATIO,
+    window_size=CIRCUIT_BREAKER_WINDOW_SIZE,
+    min_calls=CIRCUIT_BREAKER_MIN_CALLS,
+    reset_timeout=CIRCUIT_BREAKER_RESET_TIMEOUT
+)
+
+# Errors an LLM call can raise: the open circuit, provider API errors
+# (timeouts, connection failures, rate limits) and socket-level failures
+LLM_ERRORS = (CircuitOpenError, OpenAIError, TimeoutError, ConnectionError)
+
+# Identical prompts issued concurrently (from any agent) share one request
+_in_flight = SingleFlight()
+
+_llm: Optional[ChatOpenAI] = None
+_llm_lock = threading.Lock()
+
+# Last successful response per prompt hash (fallback while the circuit is open)
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_llm() -> ChatOpenAI:
+    """Lazily create the shared chat model"""
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = ChatOpenAI(
+                model=OPENAI_MODEL,
+                temperature=OPENAI_TEMPERATURE,
+                timeout=LLM_REQUEST_TIMEOUT,
+                max_retries=LLM_MAX_RETRIES
+            )
+        return _llm
+
+
+def prompt_hash(messages: List[BaseMessage]) -> str:
+    """Stable hash of the model settings and message contents"""
+    payload = {
+        "model": OPENAI_MODEL,
+        "temperature": OPENAI_TEMPERATURE,
+        "messages": [[message.type, message.content] for message in messages]
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def invoke_llm(messages: List[BaseMessage]) -> str:
+    """
+    Send messages to the LLM and return the stripped response text
+
+    Concurrent calls with the same prompt hash share a single request.
+    While the circuit is open, the last cached response for the same prompt is
+    returned instead. Raises CircuitOpenError when no cached response exists,
+    so callers can fall back to template content or skip.
+    """
+    key = prompt_hash(messages)
+
+    def _call_provider() -> str:
+        METRICS.increment("llm.calls")
+        response = LLM_CIRCUIT_BREAKER.call(lambda: get_llm().invoke(messages))
+        return response.content.strip()
+
+    try:
+        response_text, shared = _in_flight.do(key, _call_provider)
+    except CircuitOpenError:
+        cached = _get_cached_response(key)
+        if cached is not None:
+            METRICS.increment("llm.fallback_cached")
+            print("♻️  LLM circuit open - using cached response")
+            return cached
+        raise
+
+    if shared:
+        METRICS.increment("llm.coalesced")
+        print("🔗 Shared in-flight LLM response for identical prompt")
+    else:
+        _cache_response(key, response_text)
+
+    return response_text
+
+
+def _get_cached_response(key: str) -> Optional[str]:
+    """Look up a cached response"""
+    with _cache_lock:
+        return _response_cache.get(key)
+
+
+def _cache_response(key: str, response_text: str) -> None:
+    """Store a response, evicting the oldest entries beyond the cache size"""
+    with _cache_lock:
+        _response_cache[key] = response_text
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > LLM_RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
@@ -0,0 +1,38 @@
+"""
+Metrics Registry
+Thread-safe in-process counters shared by all agents and workflows
+"""
+import threading
+from typing import Dict
+
+
+class MetricsRegistry:
+    """Simple named counters (e.g. llm.calls, llm.short_circuited)"""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter by the given amount"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get(self, name: str) -> int:
+        """Current value of a counter (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of all counters, sorted by name"""
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self) -> None:
+        """Clear all counters"""
+        with self._lock:
+            self._counters.clear()
+
+
+# Process-wide registry
+METRICS = MetricsRegistry()
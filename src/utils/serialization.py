@@ -0,0 +1,65 @@
+"""
+Page Serialization
+Encodes each page once into UTF-8 JSON bytes that are shared by the disk
+writer, the Streamlit download button and any API response. Uses orjson
+when installed (pip install orjson), otherwise the standard json module.
+"""
+import json
+import hashlib
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Fields that change on every run without the content changing (section → keys)
+VOLATILE_FIELDS: Dict[str, Tuple[str, ...]] = {"metadata": ("generated_at",)}
+
+
+def encode_page(page: Any, compact: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    UTF-8 JSON bytes of a page
+
+    The default output is indented by two spaces (as json.dump(indent=2)); compact
+    mode leaves out all whitespace, for machine consumers. Non-ASCII text such
+    as "₹" is written as-is.
+    """
+    if orjson is not None:
+        option = 0 if compact else orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(page, option=option)
+        except TypeError:
+            # Values orjson rejects (e.g. non-string keys, huge ints) go through json
+            pass
+
+    if compact:
+        return json.dumps(page, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(page, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def content_hash(page: Dict[str, Any]) -> str:
+    """
+    Stable SHA-256 of a page's content
+
+    Volatile fields (metadata.generated_at) are left out and keys are sorted,
+    so regenerating an unchanged page gives the same hash. The hash is taken
+    over the standard json encoding, not encode_page, so it does not depend
+    on whether orjson is installed (the two differ e.g. in float formatting).
+    """
+    stable = dict(page)
+    for section, keys in VOLATILE_FIELDS.items():
+        if isinstance(stable.get(section), dict):
+            stable[section] = {k: v for k, v in stable[section].items() if k not in keys}
+    canonical = json.dumps(stable, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def decode_page(data: bytes) -> Any:
+    """Parse page bytes back into Python objects"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
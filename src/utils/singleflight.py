@@ -0,0 +1,69 @@
+"""
+Singleflight
+Coalesces concurrent identical calls into a single in-flight execution
+"""
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _InFlightCall:
+    """State of one in-flight execution shared by all waiters"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Duplicate-call suppression keyed on a string
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is running block and receive the same result (or error).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func once per concurrent key
+
+        Returns (result, shared) where shared is True if this caller received
+        the result of another caller's execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing"""
+        with self._lock:
+            return len(self._calls)
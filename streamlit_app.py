@@ -18,7 +18,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.orchestrator import run_workflow
-from src.config import OUTPUTS_DIR
+from src.utils.serialization import decode_page
 
 # Load environment variables
 load_dotenv()
@@ -372,22 +372,23 @@ def run_content_generation(product_data, input_mode):
         # Display generated files
         st.markdown("### 📁 Generated Files")
         
-        output_files = list(OUTPUTS_DIR.glob("*.json"))
+        output_files = [Path(path) for path in final_state.get('written_files') or []]
+        # The exact bytes written to disk, so nothing is re-read or re-encoded
+        serialized_pages = final_state.get('serialized_pages') or {}
         
         if output_files:
             tabs = st.tabs([f.stem.replace('_', ' ').title() for f in output_files])
             
             for tab, file_path in zip(tabs, output_files):
                 with tab:
-                    # Read and display JSON
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
-                        file_data = json.loads(file_content)
+                    file_content = serialized_pages.get(file_path.name)
+                    if file_content is None:
+                        file_content = file_path.read_bytes()
                     
                     col_preview, col_download = st.columns([3, 1])
                     
                     with col_preview:
-                        st.json(file_data)
+                        st.json(decode_page(file_content))
                     
                     with col_download:
                         st.download_button(
@@ -398,11 +399,11 @@ def run_content_generation(product_data, input_mode):
                             use_container_width=True
                         )
                         
-                        file_size = file_path.stat().st_size / 1024
+                        file_size = len(file_content) / 1024
                         st.caption(f"Size: {file_size:.1f} KB")
             
             st.success(f"✅ Successfully generated {len(output_files)} files!")
-            st.info(f"📂 Files saved to: `{OUTPUTS_DIR}`")
+            st.info(f"📂 Files saved to: `{final_state.get('output_directory')}`")
         else:
             st.warning("⚠️ No output files found")
         
@@ -0,0 +1,161 @@
+"""
+Test Batch Output Sink
+Tests catalog batch runs that append pages to the run's JSONL shards instead of per-product files,
+and change detection for sink runs and rebuilds
+"""
+import sys
+import json
+import re
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.utils.llm_client as llm_client
+import src.orchestrator as orchestrator
+import src.agents.question_generator_agent as question_generator_agent
+import src.agents.product_b_generator_agent as product_b_generator_agent
+import src.agents.content_logic_agent as content_logic_agent
+import src.agents.output_formatter_agent as output_formatter_agent
+import src.storage.output_paths as output_paths
+import src.storage.output_manifest as output_manifest
+import src.storage.run_sinks as run_sinks
+from src.storage.jsonl_sink import load_index, read_record
+from src.storage.product_store import ProductStore
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class OfflineLLM:
+    """Answers the question, competitor and overview prompts of a workflow run"""
+
+    def invoke(self, messages):
+        prompt = "\n".join(message.content for message in messages)
+        if "fictional competitor" in prompt:
+            return Response(json.dumps({
+                "name": "RadiantSkin Niacinamide Serum", "price": 799, "category": "Serum",
+                "key_ingredients": [{"name": "Niacinamide"}, {"name": "Zinc PCA"}],
+                "benefits": ["Brightening", "Controls oil"], "target_audience": ["Oily skin"]
+            }))
+        if "question generator" in prompt:
+            count = int(re.search(r"Generate (\d+) diverse", prompt).group(1))
+            categories = re.search(r"VALID CATEGORIES: (.+)", prompt).group(1).split(", ")
+            topics = ["results", "layering", "travel", "pregnancy", "fragrance", "shelf life", "patch testing",
+                      "makeup", "climate", "price per use"]
+            return Response(json.dumps({"questions": [
+                {"question_text": f"What about {topics[i % len(topics)]}?", "answer": f"Answer {i}.",
+                 "category": categories[i % len(categories)], "related_fields": ["benefits"]}
+                for i in range(count)
+            ]}))
+        return Response("A concise overview of the product.")
+
+
+products = [
+    {
+        "name": "GlowBoost Vitamin C Serum", "price": 699, "category": "Serum",
+        "key_ingredients": [{"name": "Vitamin C", "concentration": "10%"}, {"name": "Hyaluronic Acid"}],
+        "benefits": ["Brightening", "Fades dark spots"],
+        "usage_instructions": "Apply 2-3 drops in the morning.", "target_audience": ["Oily skin"]
+    },
+    {
+        "name": "Calm Barrier Cream", "price": 450, "category": "Moisturizer",
+        "key_ingredients": [{"name": "Ceramides"}], "benefits": ["Hydration"], "target_audience": ["Dry skin"]
+    }
+]
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+    output_paths.OUTPUT_PRODUCTS_DIR = tmp / "products"
+    output_paths.OUTPUT_CHANGES_DIR = tmp / "changes"
+    output_manifest.OUTPUT_MANIFEST_DIR = tmp / "manifests"
+    run_sinks.JSONL_OUTPUT_DIR = tmp / "jsonl"
+    orchestrator.PRODUCT_STORE = output_formatter_agent.PRODUCT_STORE = ProductStore(root=tmp / "store")
+    orchestrator.OUTPUT_SINK = "jsonl"
+    orchestrator.COMPETITOR_SOURCE = "generated"
+    orchestrator.NEAR_DUPLICATE_ENABLED = False
+    question_generator_agent.INGREDIENT_KB_ENABLED = False
+    question_generator_agent.QUESTION_DEDUP_ENABLED = False
+    product_b_generator_agent.COMPETITOR_SOURCE = "generated"
+    product_b_generator_agent.COMPETITOR_LIBRARY_ENABLED = False
+    content_logic_agent.BLOCK_CACHE_ENABLED = False
+    content_logic_agent.INGREDIENT_KB_ENABLED = False
+    output_formatter_agent.FAQ_INDEX_ENABLED = False
+    llm_client._llm = OfflineLLM()
+
+    # ============================================================
+    # TEST 1: Batch run into JSONL shards
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Batch run into JSONL shards")
+    print("=" * 70)
+
+    batch = orchestrator.run_batch_workflow(products, max_workers=2)
+    sink_dir = Path(batch["output_sink_path"])
+    index = load_index(sink_dir)
+    product_ids = [result["product_model"].product_id for result in batch["results"]]
+    records = {product_id: read_record(sink_dir, product_id, index) for product_id in product_ids}
+    manifest = output_manifest.load_manifest(batch["manifest_file"])
+    print(f"Sink: {sink_dir}, indexed products: {sorted(index)}")
+
+    # ============================================================
+    # TEST 2: Unchanged and changed products in later sink runs
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Unchanged and changed products in later sink runs")
+    print("=" * 70)
+
+    rerun = orchestrator.run_batch_workflow(products, max_workers=2)
+    rerun_manifest = output_manifest.load_manifest(rerun["manifest_file"])
+    rerun_indexed = sorted(load_index(Path(rerun["output_sink_path"])))
+    repriced = orchestrator.run_batch_workflow([{**products[0], "price": 749}, products[1]], max_workers=2)
+    repriced_manifest = output_manifest.load_manifest(repriced["manifest_file"])
+    rebuild = orchestrator.rebuild_catalog(max_workers=2)
+    rebuild_manifest = output_manifest.load_manifest(rebuild["manifest_file"])
+    print(f"Changed after rerun: {rerun['changed_product_ids']}, after repricing: {repriced['changed_product_ids']}, "
+          f"after rebuild: {rebuild['changed_product_ids']}")
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Batch completed", not batch["failures"] and all(not result.get("errors") for result in batch["results"])),
+    ("Sink is the run's JSONL directory", sink_dir == tmp / "jsonl" / batch["run_id"]),
+    ("One record per product", sorted(index) == sorted(product_ids)),
+    ("Records hold every page", all(
+        set(record["pages"]) == {"faq", "product_page", "comparison_page"} for record in records.values()
+    )),
+    ("Record pages match the run", all(
+        records[result["product_model"].product_id]["pages"]["faq"]["product_name"] == result["product_model"].name
+        for result in batch["results"]
+    )),
+    ("No per-product files written", not (tmp / "products").exists()),
+    ("Manifest points at the shards", manifest["page_count"] == 6
+        and all(entry["file"].endswith(".jsonl") or entry["file"].endswith(".jsonl.gz") for entry in manifest["pages"])),
+    ("First sink run reports every product changed", sorted(batch["changed_product_ids"]) == sorted(product_ids)
+        and all(entry["changed"] for entry in manifest["pages"])),
+    ("Unchanged rerun reports no changes", rerun["changed_product_ids"] == []
+        and not any(entry["changed"] for entry in rerun_manifest["pages"])
+        and rerun_indexed == sorted(product_ids)),
+    ("Repriced product reported changed", repriced["changed_product_ids"] == [product_ids[0]]
+        and {entry["product_id"] for entry in repriced_manifest["pages"] if entry["changed"]} == {product_ids[0]}),
+    ("Sink rebuild reports no changes", rebuild["rebuilt_count"] == 2 and rebuild["changed_product_ids"] == []
+        and not any(entry["changed"] for entry in rebuild_manifest["pages"]))
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,136 @@
+"""
+Test Block Cache
+Tests content-addressed block reuse across products and hit-rate reporting
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import tempfile
+import src.agents.content_logic_agent as content_logic_agent
+from src.agents.content_logic_agent import ContentBlockGenerator
+from src.storage.block_cache import BlockCache, block_cache_hit_rates
+from src.models.product_model import ProductModel
+from src.utils.metrics import METRICS
+
+
+shared_fields = {
+    "category": "Serum",
+    "key_ingredients": [{"name": "Vitamin C", "concentration": "10%"}],
+    "usage_instructions": "Apply 2-3 drops in the morning",
+    "side_effects": "Mild tingling for sensitive skin"
+}
+product_1 = ProductModel(name="GlowBoost Vitamin C Serum", price=699, **shared_fields)
+product_2 = ProductModel(name="BrightDay Vitamin C Serum", price=899, **shared_fields)
+
+METRICS.reset()
+cache_dir = Path(tempfile.mkdtemp())
+generator = ContentBlockGenerator(use_llm_enhancement=False, block_cache=BlockCache(root=cache_dir))
+
+
+# ============================================================
+# TEST 1: Identical source values hit across products
+# ============================================================
+print("=" * 70)
+print("TEST 1: Identical source values hit across products")
+print("=" * 70)
+
+usage_1 = generator.generate_usage_block(product_1)
+usage_2 = generator.generate_usage_block(product_2)
+ingredients_1 = generator.generate_ingredients_block(product_1)
+ingredients_2 = generator.generate_ingredients_block(product_2)
+
+print(f"Usage hits/misses: {METRICS.get('block_cache.usage.hits')}/{METRICS.get('block_cache.usage.misses')}")
+print(f"Same usage content: {usage_1.content == usage_2.content}")
+
+
+# ============================================================
+# TEST 2: Product-specific fields miss
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Product-specific fields miss")
+print("=" * 70)
+
+price_1 = generator.generate_price_block(product_1)
+price_2 = generator.generate_price_block(product_2)
+
+print(f"Price 1: {price_1.content['formatted_price']}")
+print(f"Price 2: {price_2.content['formatted_price']}")
+
+
+# ============================================================
+# TEST 3: Disk layer survives a cold memory cache
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Disk layer survives a cold memory cache")
+print("=" * 70)
+
+cold_generator = ContentBlockGenerator(use_llm_enhancement=False, block_cache=BlockCache(root=cache_dir))
+hits_before = METRICS.get("block_cache.safety.hits")
+generator.generate_safety_block(product_1)
+cold_generator.generate_safety_block(product_2)
+hits_after = METRICS.get("block_cache.safety.hits")
+
+rates = block_cache_hit_rates(METRICS.snapshot())
+print(f"Hit rates: {rates}")
+
+
+# ============================================================
+# TEST 4: Failed LLM enhancement is not cached
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Failed LLM enhancement is not cached")
+print("=" * 70)
+
+
+def failing_llm(messages):
+    raise TimeoutError("Request timed out")
+
+
+def working_llm(messages):
+    return "GlowBoost brightens and evens skin tone with 10% Vitamin C."
+
+
+enhancing_generator = ContentBlockGenerator(use_llm_enhancement=True, block_cache=BlockCache(root=cache_dir))
+content_logic_agent.invoke_llm = failing_llm
+fallback_overview = enhancing_generator.generate_overview_block(product_1)
+content_logic_agent.invoke_llm = working_llm
+retried_overview = enhancing_generator.generate_overview_block(product_1)
+cached_overview = enhancing_generator.generate_overview_block(product_1)
+print(f"Fallback: {fallback_overview.content} ({fallback_overview.validation_status})")
+print(f"Retried: {retried_overview.content} ({retried_overview.validation_status})")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Usage block reused across products", METRICS.get("block_cache.usage.hits") == 1),
+    ("Ingredients block reused across products", ingredients_1.content == ingredients_2.content),
+    ("Cached block is a copy", usage_1 is not usage_2),
+    ("Different price is not a hit", price_1.content != price_2.content),
+    ("Cold cache hits from disk", hits_after == hits_before + 1),
+    ("Overall hit rate reported", 0 < rates.get("all", 0) < 1),
+    ("Price hit rate is zero", rates.get("price") == 0.0),
+    ("Failed enhancement falls back to the rule-based overview", fallback_overview.validation_status == "partial"
+        and fallback_overview.content.startswith("GlowBoost Vitamin C Serum is a Serum")),
+    ("Fallback not cached, LLM retried", retried_overview.content == working_llm(None)
+        and retried_overview.validation_status == "complete"),
+    ("Enhanced overview cached", cached_overview.content == retried_overview.content
+        and METRICS.get("block_cache.overview.hits") == 1)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,149 @@
+"""
+Test Bulk Comparison Engine
+Tests N×N comparison pages per category from encoded feature matrices
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.content_logic.bulk_comparison as bulk_comparison
+from src.content_logic.bulk_comparison import build_bulk_comparison_pages, comparison_matrix
+from src.agents.comparison_page_builder_agent import _compare_ingredients
+from src.models.product_model import ProductModel
+
+
+products = [
+    ProductModel(name="GlowBoost Vitamin C Serum", price=699, category="Serum",
+                 key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+                 benefits=["Brightening", "Hydration"]),
+    ProductModel(name="Ascorbic Bright Serum", price=749, category="Serum",
+                 key_ingredients=[{"name": "Ascorbic Acid"}, {"name": "Ferulic Acid"}],
+                 benefits=["Brightening"]),
+    ProductModel(name="Calm Niacinamide Serum", price=599, category="Serum",
+                 key_ingredients=[{"name": "Niacinamide"}], benefits=["Controls oil"]),
+    ProductModel(name="Luxury Gold Serum", price=4999, category="Serum",
+                 key_ingredients=[{"name": "Vitamin C"}], benefits=["Brightening"]),
+    ProductModel(name="Daily Moisturizer", price=699, category="Moisturizer",
+                 key_ingredients=[{"name": "Vitamin C"}], benefits=["Brightening"])
+]
+
+
+# ============================================================
+# TEST 1: Pages per category
+# ============================================================
+print("=" * 70)
+print("TEST 1: Pages per category")
+print("=" * 70)
+
+pages = build_bulk_comparison_pages(products, max_price_difference=1.0)
+for category, category_pages in pages.items():
+    print(f"{category}: {len(category_pages)} pages")
+    for page in category_pages:
+        print(f"  {page['product_a']['name']} vs {page['product_b']['name']}")
+serum_pages = pages.get("serum", [])
+pair_names = {(page["product_a"]["name"], page["product_b"]["name"]) for page in serum_pages}
+
+
+# ============================================================
+# TEST 2: Page contents match the single-pair builder
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Page contents match the single-pair builder")
+print("=" * 70)
+
+glow_vs_ascorbic = next(
+    page for page in serum_pages
+    if page["product_a"]["name"] == "GlowBoost Vitamin C Serum" and page["product_b"]["name"] == "Ascorbic Bright Serum"
+)
+bulk_ingredients = glow_vs_ascorbic["comparison"]["ingredients"]
+single_ingredients = _compare_ingredients(products[0], products[1])
+print(f"Bulk:   {bulk_ingredients['common_ingredients']} ({bulk_ingredients['similarity_score']:.2f})")
+print(f"Single: {single_ingredients['common_ingredients']} ({single_ingredients['similarity_score']:.2f})")
+print(f"Recommendations: {len(glow_vs_ascorbic['recommendations'])}")
+
+
+# ============================================================
+# TEST 3: Comparison matrix
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Comparison matrix")
+print("=" * 70)
+
+matrix = comparison_matrix(products[:3])
+print(f"Common ingredients:\n{matrix['common_ingredients']}")
+print(f"Price difference:\n{matrix['price_difference']}")
+
+
+# ============================================================
+# TEST 4: Chunked price windows
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Chunked price windows")
+print("=" * 70)
+
+
+def pair_keys(category_pages):
+    return sorted(
+        (page["product_a"]["name"], page["product_b"]["name"], page["comparison"]["price"]["difference"])
+        for page in category_pages
+    )
+
+
+catalog = [
+    ProductModel(name=f"Serum {i}", price=price, category="Serum",
+                 key_ingredients=[{"name": ["Vitamin C", "Niacinamide", "Retinol"][i % 3]}], benefits=["Brightening"])
+    for i, price in enumerate([499, 699, 699, 520, 1499, 999, 650, 2999, 700, 699, 1200, 560])
+]
+whole = build_bulk_comparison_pages(catalog, max_price_difference=0.5)["serum"]
+bulk_comparison.BULK_COMPARISON_CHUNK_BUDGET = 3
+chunked = build_bulk_comparison_pages(catalog, max_price_difference=0.5)["serum"]
+bulk_comparison.BULK_COMPARISON_CHUNK_BUDGET = 1
+single_rows = build_bulk_comparison_pages(catalog, max_price_difference=0.5)["serum"]
+equal_price_pairs = [
+    (page["product_a"]["name"], page["product_b"]["name"]) for page in whole
+    if page["product_a"]["name"] in ("Serum 1", "Serum 2", "Serum 9") and page["product_b"]["name"] in ("Serum 1", "Serum 2", "Serum 9")
+]
+print(f"Pages: {len(whole)} whole, {len(chunked)} chunked, {len(single_rows)} one row per chunk")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Only categories with pairs", set(pages) == {"serum"}),
+    ("Three serum pairs within the price gap", len(serum_pages) == 3),
+    ("Premium serum excluded by price gap", not any("Luxury Gold Serum" in pair for pair in pair_names)),
+    ("Cheaper product is A", ("Calm Niacinamide Serum", "GlowBoost Vitamin C Serum") in pair_names),
+    ("Synonyms are common ingredients", bulk_ingredients["common_ingredients"] == ["Vitamin C"]),
+    ("Same ingredient comparison as builder", {
+        key: sorted(value) if isinstance(value, list) else value for key, value in bulk_ingredients.items()
+    } == {
+        key: sorted(value) if isinstance(value, list) else value for key, value in single_ingredients.items()
+    }),
+    ("Recommendations generated", len(glow_vs_ascorbic["recommendations"]) > 0),
+    ("Matrix counts synonyms", matrix["common_ingredients"][0, 1] == 1),
+    ("Matrix price difference", matrix["price_difference"][0, 1] == 50),
+    ("Chunks give the same pairs", pair_keys(chunked) == pair_keys(whole) and pair_keys(single_rows) == pair_keys(whole)),
+    ("Every pair within the gap, once", len(whole) == sum(
+        1 for i, a in enumerate(catalog) for b in catalog[i + 1:]
+        if abs(a.price - b.price) / min(a.price, b.price) <= 0.5
+    )),
+    ("Equal prices keep input order", sorted(equal_price_pairs) == [
+        ("Serum 1", "Serum 2"), ("Serum 1", "Serum 9"), ("Serum 2", "Serum 9")
+    ])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
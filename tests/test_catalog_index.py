@@ -0,0 +1,189 @@
+"""
+Test Catalog Competitor Index
+Tests vectorised top-k retrieval of real competitors from the catalog
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import random
+import src.content_logic.catalog_index as catalog_index
+from src.content_logic.catalog_index import CatalogIndex
+from src.content_logic.near_duplicates import NearDuplicateIndex
+from src.content_logic.similarity import score_product_similarity
+from src.models.product_model import ProductModel
+
+
+catalog = [
+    ProductModel(name="GlowBoost Vitamin C Serum", price=699, category="Serum",
+                 key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+                 benefits=["Brightening", "Hydration"], target_audience=["Oily skin"]),
+    ProductModel(name="Ascorbic Bright Serum", price=749, category="Serum",
+                 key_ingredients=[{"name": "Ascorbic Acid"}, {"name": "Ferulic Acid"}],
+                 benefits=["Brightening"], target_audience=["Oily skin", "Dull skin"]),
+    ProductModel(name="Calm Niacinamide Serum", price=599, category="Serum",
+                 key_ingredients=[{"name": "Niacinamide"}],
+                 benefits=["Controls oil"], target_audience=["Acne-prone skin"]),
+    ProductModel(name="Luxury Gold Serum", price=4999, category="Serum",
+                 key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+                 benefits=["Brightening", "Hydration"], target_audience=["Oily skin"]),
+    ProductModel(name="Daily Moisturizer", price=699, category="Moisturizer",
+                 key_ingredients=[{"name": "Vitamin C"}], benefits=["Brightening"],
+                 target_audience=["Oily skin"])
+]
+index = CatalogIndex(catalog)
+
+
+# ============================================================
+# TEST 1: Top-k for a catalog product
+# ============================================================
+print("=" * 70)
+print("TEST 1: Top-k for a catalog product")
+print("=" * 70)
+
+top = index.top_k(catalog[0], k=3)
+for product, score in top:
+    print(f"  {product.name}: {score:.4f}")
+reference = score_product_similarity(catalog[0], top[0][0])["score"]
+print(f"Reference score: {reference}")
+
+
+# ============================================================
+# TEST 2: Bulk partners match single searches
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Bulk partners match single searches")
+print("=" * 70)
+
+partners = index.best_partners(k=2)
+for product_id, found in partners.items():
+    print(f"  {product_id} → {found}")
+single = {
+    product.product_id: [(p.product_id, score) for p, score in index.top_k(product, k=2)]
+    for product in catalog
+}
+
+
+# ============================================================
+# TEST 3: Products outside the catalog
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Products outside the catalog")
+print("=" * 70)
+
+newcomer = ProductModel(name="New Vitamin C Serum", price=720, category="serum",
+                        key_ingredients=[{"name": "L-Ascorbic Acid"}], benefits=["Brightening"])
+newcomer_partner = index.partner_for(newcomer)
+no_group = index.top_k(ProductModel(name="Earbuds", price=2999, category="Audio"))
+print(f"Newcomer partner: {newcomer_partner[0].name if newcomer_partner else None}")
+print(f"Unknown category: {no_group}")
+
+
+# ============================================================
+# TEST 4: Size variants are never partners
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Size variants are never partners")
+print("=" * 70)
+
+variant_fields = {
+    "category": "Serum", "key_ingredients": [{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+    "benefits": ["Brightening", "Hydration"], "target_audience": ["Oily skin"],
+    "usage_instructions": "Apply 2-3 drops in the morning before sunscreen"
+}
+serum_30 = ProductModel(name="GlowBoost Vitamin C Serum 30ml", price=699, product_id="glow_30", **variant_fields)
+serum_50 = ProductModel(name="GlowBoost Vitamin C Serum 50ml", price=899, product_id="glow_50", **variant_fields)
+competitor = ProductModel(name="Ascorbic Bright Serum", price=749, category="Serum",
+                          key_ingredients=[{"name": "Ascorbic Acid"}], benefits=["Brightening"],
+                          target_audience=["Oily skin"])
+variant_index = CatalogIndex([serum_30, serum_50, competitor])
+variant_partners = variant_index.best_partners(k=2)
+variant_single = variant_index.partner_for(serum_30)
+serum_10 = ProductModel(name="GlowBoost Vitamin C Serum 10ml", price=599, product_id="glow_10", **variant_fields)
+outside_partner = variant_index.top_k(serum_10, k=3)
+for product_id, found in variant_partners.items():
+    print(f"  {product_id} → {found}")
+print(f"Unlisted variant: {[(p.product_id, score) for p, score in outside_partner]}")
+
+
+# ============================================================
+# TEST 5: Sparse and dense intersections agree on a larger catalog
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 5: Sparse and dense intersections agree on a larger catalog")
+print("=" * 70)
+
+rng = random.Random(7)
+ingredients = ["Niacinamide", "Zinc PCA", "Ceramides", "Retinol", "Salicylic Acid", "Peptides", "Squalane",
+               "Panthenol", "Allantoin", "Centella Asiatica", "Glycerin", "Vitamin C"]
+large_catalog = []
+for i in range(400):
+    base = i // 2 if i % 3 == 0 else i
+    base_rng = random.Random(base)
+    large_catalog.append(ProductModel(
+        name=f"Formula {base} {'30ml' if i % 2 else '50ml'}", product_id=f"formula_{i}",
+        price=round(base_rng.uniform(300, 1500) * (1.1 if i % 2 else 1.0), 2),
+        category=["Serum", "Moisturizer"][base % 2],
+        key_ingredients=[{"name": name} for name in base_rng.sample(ingredients, base_rng.randint(0, 3))],
+        benefits=base_rng.sample(["Hydration", "Brightening", "Controls oil", "Calms redness"], base_rng.randint(0, 2)),
+        target_audience=base_rng.sample(["Oily skin", "Dry skin", "Sensitive skin"], base_rng.randint(0, 2))
+    ))
+large_index = CatalogIndex(large_catalog)
+by_mode = {}
+for mode, cost in [("sparse", 0), ("dense", float("inf"))]:
+    catalog_index._SPARSE_MATCH_COST, large_index._partners = cost, None
+    by_mode[mode] = large_index.best_partners(k=3)
+catalog_index._SPARSE_MATCH_COST = 16
+large_single = {product.product_id: [(p.product_id, score) for p, score in large_index.top_k(product, k=3)]
+                for product in large_catalog[:40]}
+
+sequential = NearDuplicateIndex()
+for product in large_catalog:
+    sequential.add(product)
+batch_clusters = {}
+for product, cluster in zip(large_index.products, large_index._clusters):
+    batch_clusters.setdefault(int(cluster), []).append(product.product_id)
+batch_clusters = sorted(sorted(members) for members in batch_clusters.values() if len(members) > 1)
+print(f"Near-duplicate clusters: {len(batch_clusters)} (sequential index: {len(sequential.clusters())})")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+top_ids = [product.product_id for product, _ in top]
+test_results = [
+    ("Synonym-sharing serum ranks first", top[0][0].name == "Ascorbic Bright Serum"),
+    ("Score matches score_product_similarity", abs(top[0][1] - reference) < 1e-3),
+    ("Product itself excluded", catalog[0].product_id not in top_ids),
+    ("Price gap excludes premium serum", catalog[3].product_id not in top_ids),
+    ("Other category excluded", catalog[4].product_id not in top_ids),
+    ("Bulk equals single search", all(
+        [pid for pid, _ in partners[pid_a]] == [pid for pid, _ in single[pid_a]] for pid_a in partners
+    )),
+    ("Isolated product has no partner", partners[catalog[3].product_id] == []),
+    ("Newcomer matched in lowercase category", newcomer_partner is not None),
+    ("Unknown category returns nothing", no_group == []),
+    ("Variants not paired with each other", [pid for pid, _ in variant_partners[serum_30.product_id]] == [
+        competitor.product_id
+    ] and [pid for pid, _ in variant_partners[serum_50.product_id]] == [competitor.product_id]),
+    ("Single search skips variants", variant_single[0].product_id == competitor.product_id),
+    ("Unlisted variant skips the whole cluster", [p.product_id for p, _ in outside_partner] == [competitor.product_id]),
+    ("Sparse join equals matrix product", by_mode["sparse"] == by_mode["dense"]),
+    ("Large bulk equals single search", all(by_mode["sparse"][pid] == found for pid, found in large_single.items())),
+    ("Batch clusters equal sequential index", len(batch_clusters) > 0 and batch_clusters == sorted(sequential.clusters()))
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,162 @@
+"""
+Test Catalog Rebuild
+Tests rebuilding pages from stored snapshots across worker processes without LLM calls
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.utils.llm_client as llm_client
+import src.orchestrator as orchestrator
+import src.agents.content_logic_agent as content_logic_agent
+import src.agents.output_formatter_agent as output_formatter_agent
+import src.storage.output_paths as output_paths
+import src.storage.output_manifest as output_manifest
+from src.agents.data_parser_agent import parse_product_data
+from src.agents.faq_builder_agent import build_faq_page
+from src.agents.product_page_builder_agent import build_product_page
+from src.agents.comparison_page_builder_agent import build_comparison_page
+from src.content_logic.template_questions import generate_template_questions
+from src.storage.product_store import ProductStore
+from src.models.product_model import ProductModel
+from src.utils.serialization import decode_page
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class CannedLLM:
+    """Offline chat model for the original run"""
+
+    def invoke(self, messages):
+        return Response("A brightening vitamin C serum that evens skin tone.")
+
+
+class RecordingLLM:
+    """Chat model that records every call in a file (visible across worker processes)"""
+
+    def __init__(self, calls_file):
+        self.calls_file = calls_file
+
+    def invoke(self, messages):
+        with open(self.calls_file, "a", encoding="utf-8") as f:
+            f.write("call\n")
+        return Response("unexpected")
+
+
+products = [
+    {
+        "name": "GlowBoost Vitamin C Serum", "price": 699, "category": "Serum",
+        "key_ingredients": [{"name": "Vitamin C", "concentration": "10%"}, {"name": "Hyaluronic Acid"}],
+        "benefits": ["Brightening", "Fades dark spots"],
+        "usage_instructions": "Apply 2-3 drops in the morning.", "side_effects": "Mild tingling."
+    },
+    {"name": "Daily Barrier Cream", "price": 450, "category": "Moisturizer", "benefits": ["Hydration"]}
+]
+competitor = ProductModel(
+    name="RadiantSkin Niacinamide Serum", price=650, category="Serum",
+    key_ingredients=[{"name": "Niacinamide"}], benefits=["Controls oil"]
+)
+
+
+def original_run(product_data, run_id):
+    """Generate and store a product's pages the way a workflow run does"""
+    state = {"raw_input": product_data, "input_mode": "json", "run_id": run_id, "errors": [], "warnings": []}
+    state.update(parse_product_data(state))
+    state["questions"] = generate_template_questions(state["product_model"])
+    state["product_b_model"] = competitor
+    state.update(content_logic_agent.generate_content_blocks(state))
+    for builder in (build_faq_page, build_product_page, build_comparison_page):
+        state.update(builder(state))
+    state.update(output_formatter_agent.write_output_files(state))
+    orchestrator.PRODUCT_STORE.save(state)
+    return state
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+    output_paths.OUTPUT_PRODUCTS_DIR = tmp / "products"
+    output_paths.OUTPUT_CHANGES_DIR = tmp / "changes"
+    output_manifest.OUTPUT_MANIFEST_DIR = tmp / "manifests"
+    orchestrator.PRODUCT_STORE = ProductStore(root=tmp / "store")
+    orchestrator.OUTPUT_SINK = "files"
+    content_logic_agent.BLOCK_CACHE_ENABLED = False
+    content_logic_agent.INGREDIENT_KB_ENABLED = False
+    output_formatter_agent.FAQ_INDEX_ENABLED = False
+
+    # ============================================================
+    # TEST 1: Original run
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Original run")
+    print("=" * 70)
+
+    llm_client._llm = CannedLLM()
+    originals = {state["product_model"].product_id: state for state in (
+        original_run(product_data, "20260101T000000_original") for product_data in products
+    )}
+    print(f"Stored products: {orchestrator.PRODUCT_STORE.product_ids()}")
+
+    # ============================================================
+    # TEST 2: Rebuild from snapshots
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Rebuild from snapshots")
+    print("=" * 70)
+
+    calls_file = tmp / "llm_calls.txt"
+    llm_client._llm = RecordingLLM(calls_file)
+    rebuild = orchestrator.rebuild_catalog(max_workers=2)
+    llm_calls = calls_file.read_text().count("call") if calls_file.exists() else 0
+
+    rebuilt_pages, original_pages, original_hashes, rebuilt_hashes = {}, {}, {}, {}
+    for product_id, state in originals.items():
+        run_dir = output_paths.run_output_dir(product_id, rebuild["run_id"])
+        for file_name, data in state["serialized_pages"].items():
+            original_pages[(product_id, file_name)] = decode_page(data)
+            rebuilt_pages[(product_id, file_name)] = decode_page((run_dir / file_name).read_bytes())
+        original_hashes.update({(product_id, e["page_type"]): e["content_hash"] for e in state["manifest_entries"]})
+    rebuild_manifest = output_manifest.load_manifest(rebuild["manifest_file"])
+    for entry in rebuild_manifest["pages"]:
+        rebuilt_hashes[(entry["product_id"], entry["page_type"])] = entry["content_hash"]
+    print(f"Rebuilt: {rebuild['rebuilt_count']}, changed: {rebuild['changed_product_ids']}, LLM calls: {llm_calls}")
+
+    # ============================================================
+    # TEST 3: Missing snapshots
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Missing snapshots")
+    print("=" * 70)
+
+    missing = orchestrator.rebuild_catalog(product_ids=["prod_missing"], max_workers=1)
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Every stored product rebuilt", rebuild["rebuilt_count"] == 2 and not rebuild["failures"]),
+    ("No LLM calls during the rebuild", llm_calls == 0),
+    ("Rebuilt pages match the original run", len(rebuilt_pages) == 6 and rebuilt_pages == original_pages),
+    ("Manifest hashes match the original run", rebuilt_hashes == original_hashes),
+    ("Unchanged pages reported as unchanged", rebuild["changed_product_ids"] == []),
+    ("Missing snapshots reported", missing["rebuilt_count"] == 0
+        and missing["failures"][0]["product_id"] == "prod_missing")
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,122 @@
+"""
+Test Circuit Breaker
+Tests open / half-open / closed transitions without calling the LLM
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import time
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def failing_call():
+    raise TimeoutError("provider timeout")
+
+
+def ok_call():
+    return "ok"
+
+
+# ============================================================
+# TEST 1: Circuit opens after error ratio is exceeded
+# ============================================================
+print("=" * 70)
+print("TEST 1: Circuit opens after error ratio is exceeded")
+print("=" * 70)
+
+breaker = CircuitBreaker(name="test", failure_ratio=0.5, window_size=4, min_calls=4, reset_timeout=0.2)
+
+for call in [ok_call, ok_call, failing_call, failing_call]:
+    try:
+        breaker.call(call)
+    except TimeoutError:
+        pass
+
+print(f"State after 2/4 failures: {breaker.state}")
+opened = breaker.state == CircuitBreaker.OPEN
+
+
+# ============================================================
+# TEST 2: Open circuit short-circuits without calling
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Open circuit short-circuits without calling")
+print("=" * 70)
+
+calls_made = []
+short_circuited = False
+try:
+    breaker.call(lambda: calls_made.append(1))
+except CircuitOpenError as e:
+    short_circuited = True
+    print(f"Short-circuited: {e}")
+
+print(f"Underlying calls made: {len(calls_made)}")
+
+
+# ============================================================
+# TEST 3: Half-open probe closes circuit on success
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Half-open probe closes circuit on success")
+print("=" * 70)
+
+time.sleep(0.25)
+print(f"State after cooldown: {breaker.state}")
+half_open = breaker.state == CircuitBreaker.HALF_OPEN
+
+result = breaker.call(ok_call)
+print(f"Probe result: {result}, state: {breaker.state}")
+closed_after_probe = breaker.state == CircuitBreaker.CLOSED
+
+
+# ============================================================
+# TEST 4: Failed probe re-opens circuit
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Failed probe re-opens circuit")
+print("=" * 70)
+
+breaker2 = CircuitBreaker(name="test2", failure_ratio=1.0, window_size=2, min_calls=2, reset_timeout=0.1)
+for _ in range(2):
+    try:
+        breaker2.call(failing_call)
+    except TimeoutError:
+        pass
+
+time.sleep(0.15)
+try:
+    breaker2.call(failing_call)
+except TimeoutError:
+    pass
+
+print(f"State after failed probe: {breaker2.state}")
+reopened = breaker2.state == CircuitBreaker.OPEN
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Opens on error ratio", opened),
+    ("Short-circuits while open", short_circuited and not calls_made),
+    ("Half-open after cooldown", half_open),
+    ("Closes after successful probe", closed_after_probe),
+    ("Re-opens after failed probe", reopened)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
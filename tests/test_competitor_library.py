@@ -0,0 +1,142 @@
+"""
+Test Competitor Library
+Tests reuse of stored Product B competitors, batched persistence and re-priced sources
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import tempfile
+from src.content_logic.competitor_library import CompetitorLibrary
+from src.models.product_model import ProductModel
+
+
+library_path = Path(tempfile.mkdtemp()) / "competitor_library.json"
+
+product_a = ProductModel(
+    name="GlowBoost Vitamin C Serum",
+    price=699,
+    category="Serum",
+    key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}]
+)
+product_b = ProductModel(
+    name="RadiantSkin Niacinamide Serum",
+    price=799,
+    category="Serum",
+    key_ingredients=[{"name": "Niacinamide"}, {"name": "Zinc PCA"}]
+)
+
+
+# ============================================================
+# TEST 1: Stored competitor is reused for a close product
+# ============================================================
+print("=" * 70)
+print("TEST 1: Stored competitor is reused for a close product")
+print("=" * 70)
+
+library = CompetitorLibrary(path=library_path)
+library.add(product_a, product_b)
+
+similar_product = ProductModel(
+    name="GlowBoost Vitamin C Serum 50ml",
+    price=749,
+    category="serum",
+    key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}, {"name": "Ferulic Acid"}]
+)
+match = library.lookup(similar_product)
+print(f"Match: {match.name if match else None}")
+
+
+# ============================================================
+# TEST 2: Different category / price band misses
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Different category / price band misses")
+print("=" * 70)
+
+other_category = ProductModel(name="Protein Bar", price=699, category="Snack",
+                              key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}])
+far_price = ProductModel(name="Luxury Serum", price=4999, category="Serum",
+                         key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}])
+overlapping = ProductModel(name="Niacinamide Booster", price=699, category="Serum",
+                           key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}, {"name": "Niacinamide"}])
+
+miss_category = library.lookup(other_category)
+miss_price = library.lookup(far_price)
+miss_overlap = library.lookup(overlapping)
+print(f"Other category: {miss_category}")
+print(f"Far price: {miss_price}")
+print(f"Overlapping ingredients: {miss_overlap}")
+
+
+# ============================================================
+# TEST 3: Library persists and honours freshness
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Library persists and honours freshness")
+print("=" * 70)
+
+unflushed = CompetitorLibrary(path=library_path)
+print(f"Entries on disk before flush: {len(unflushed)}")
+library.flush()
+reloaded = CompetitorLibrary(path=library_path)
+print(f"Reloaded entries: {len(reloaded)}")
+persisted_match = reloaded.lookup(similar_product)
+
+expired = CompetitorLibrary(path=library_path, max_age_days=-1)
+expired_match = expired.lookup(similar_product)
+print(f"Expired lookup: {expired_match}")
+
+
+# ============================================================
+# TEST 4: Re-priced sources and out-of-bounds competitors
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Re-priced sources and out-of-bounds competitors")
+print("=" * 70)
+
+repriced_library = CompetitorLibrary(path=Path(tempfile.mkdtemp()) / "competitor_library.json")
+repriced_library.add(product_a, product_b)
+repriced_a = product_a.model_copy(update={"price": 2499})
+repriced_b = product_b.model_copy(update={"price": 2799})
+repriced_library.add(repriced_a, repriced_b)
+old_band_match = repriced_library.lookup(similar_product)
+new_band_match = repriced_library.lookup(repriced_a.model_copy(update={"product_id": "prod_other"}))
+print(f"Entries: {len(repriced_library)}, old band: {old_band_match}, new band: {new_band_match}")
+
+scored_library = CompetitorLibrary(path=Path(tempfile.mkdtemp()) / "competitor_library.json")
+scored_library.add(product_a, product_b.model_copy(update={"category": "Moisturizer"}))
+out_of_bounds_match = scored_library.lookup(similar_product)
+print(f"Out-of-bounds competitor: {out_of_bounds_match}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Close product reuses competitor", match is not None and match.name == product_b.name),
+    ("Other category misses", miss_category is None),
+    ("Far price band misses", miss_price is None),
+    ("Ingredient overlap misses", miss_overlap is None),
+    ("Nothing written before flush", len(unflushed) == 0),
+    ("Library persists to disk", persisted_match is not None),
+    ("Stale entries are not reused", expired_match is None),
+    ("Re-priced source leaves its old band", len(repriced_library) == 1 and old_band_match is None
+        and new_band_match is not None and new_band_match.price == 2799),
+    ("Out-of-bounds competitor not reused", out_of_bounds_match is None)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
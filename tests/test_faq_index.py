@@ -0,0 +1,130 @@
+"""
+Test FAQ Index
+Tests incremental FAQ indexing and ranked full-text search
+"""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.storage.faq_index import FaqIndex, fts_query
+
+
+def faq_page(name, faqs, generated_at="2026-01-01T00:00:00"):
+    return {
+        "page_type": "faq",
+        "product_name": name,
+        "faqs": [{"question": q, "answer": a, "category": c, "priority": "medium"} for q, a, c in faqs],
+        "metadata": {"generated_at": generated_at}
+    }
+
+
+serum = faq_page("GlowBoost Vitamin C Serum", [
+    ("Is this serum safe for sensitive skin?", "Patch test first; mild tingling is normal.", "Safety"),
+    ("How do I apply the serum?", "Apply 2-3 drops after cleansing.", "Usage"),
+    ("What does vitamin C do?", "It brightens skin and fades dark spots.", "Informational")
+])
+cream = faq_page("Daily Barrier Cream", [
+    ("Can I use it with retinol?", "Yes, it soothes retinol dryness.", "Usage"),
+    ("Is the cream safe during pregnancy?", "Consult your doctor; it is fragrance free.", "Safety")
+])
+
+with tempfile.TemporaryDirectory() as tmp:
+    index = FaqIndex(Path(tmp) / "faq_index.sqlite3")
+    empty_search = index.search("serum")
+
+    # ============================================================
+    # TEST 1: Indexing
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Indexing")
+    print("=" * 70)
+
+    indexed = [index.index_faq_page("prod_serum", serum), index.index_faq_page("prod_cream", cream)]
+    # Same content, new generation time: nothing to re-index
+    reindexed_unchanged = index.index_faq_page("prod_serum", faq_page(
+        serum["product_name"], [(f["question"], f["answer"], f["category"]) for f in serum["faqs"]],
+        generated_at="2026-02-01T00:00:00"
+    ))
+    print(f"Indexed: {indexed}, unchanged re-index: {reindexed_unchanged}, entries: {index.entry_count()}")
+
+    # ============================================================
+    # TEST 2: Ranked search
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Ranked search")
+    print("=" * 70)
+
+    safe_hits = index.search("is it safe for sensitive skin")
+    for hit in safe_hits:
+        print(f"  {hit['score']:.2f} {hit['product_id']}: {hit['question']}")
+    stemmed_hits = index.search("applying")
+    usage_hits = index.search("safe", category="Usage")
+    cream_hits = index.search("safe", product_id="prod_cream")
+    all_words_hits = index.search("safe pregnancy", match_all=True)
+    syntax_hits = index.search('retinol" OR NEAR(*')
+    print(f"Query expression: {fts_query('safe pregnancy', match_all=True)}")
+
+    # ============================================================
+    # TEST 3: Incremental updates from several threads
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Incremental updates from several threads")
+    print("=" * 70)
+
+    updated_serum = faq_page("GlowBoost Vitamin C Serum", [
+        ("Does the serum oxidise?", "Store it away from light.", "Informational")
+    ])
+    threads = [
+        threading.Thread(target=index.index_faq_page, args=("prod_serum", updated_serum)),
+        threading.Thread(target=index.index_faq_page, args=("prod_toner", faq_page("Toner", [
+            ("Is the toner alcohol free?", "Yes.", "Safety")
+        ])))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    old_serum_hits = index.search("drops")
+    new_serum_hits = index.search("oxidise")
+    index.remove_product("prod_cream")
+    removed_hits = index.search("pregnancy")
+    final_count = index.entry_count()
+    print(f"Entries after updates: {final_count}")
+    index.close()
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Empty index returns no hits", empty_search == []),
+    ("Pages indexed", indexed == [True, True]),
+    ("Unchanged FAQ skipped", reindexed_unchanged is False),
+    ("Best hit first", safe_hits[0]["question"] == "Is this serum safe for sensitive skin?"
+        and safe_hits[0]["product_name"] == "GlowBoost Vitamin C Serum"),
+    ("Scores descending", [hit["score"] for hit in safe_hits] == sorted((hit["score"] for hit in safe_hits), reverse=True)),
+    ("Stemming", [hit["question"] for hit in stemmed_hits] == ["How do I apply the serum?"]),
+    ("Category filter", usage_hits == []),
+    ("Product filter", [hit["product_id"] for hit in cream_hits] == ["prod_cream"]),
+    ("Match all words", [hit["question"] for hit in all_words_hits] == ["Is the cream safe during pregnancy?"]),
+    ("Query syntax is escaped", [hit["product_id"] for hit in syntax_hits] == ["prod_cream"]),
+    ("Re-indexing replaces entries", old_serum_hits == [] and new_serum_hits[0]["product_id"] == "prod_serum"),
+    ("Removed products not found", removed_hits == []),
+    ("Entry count", final_count == 2)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,149 @@
+"""
+Test HTML Renderer Agent
+Tests template rendering, the workflow stage and bulk rendering across processes
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.agents.html_renderer_agent as html_renderer_agent
+import src.orchestrator as orchestrator
+from src.agents.html_renderer_agent import render_html_pages, render_page, page_templates
+from src.storage.product_store import ProductStore
+from src.models.product_model import ProductModel
+
+
+product = ProductModel(name="GlowBoost Vitamin C Serum", price=699, category="Serum")
+
+faq_page = {
+    "page_type": "faq",
+    "product_name": "GlowBoost Vitamin C Serum",
+    "product_overview": "A brightening serum.",
+    "faqs_by_category": {
+        "Safety": [{"question": "Is it safe? <script>alert(1)</script>", "answer": "Patch test first."}],
+        "Usage": [{"question": "How do I apply it?", "answer": "2-3 drops & sunscreen."}]
+    },
+    "metadata": {"generated_at": "2026-01-01T00:00:00"}
+}
+product_page = {
+    "page_type": "product_page",
+    "product": {
+        "name": "GlowBoost Vitamin C Serum",
+        "overview": "A brightening serum.",
+        "key_information": {
+            "ingredients": {"list": [{"name": "Vitamin C", "concentration": "10%", "purpose": "Brightening"}]},
+            "benefits": {"list": ["Fades dark spots"]}
+        },
+        "pricing": {"formatted_price": "₹699"}
+    }
+}
+comparison_page = {
+    "page_type": "comparison",
+    "product_a": {"name": "GlowBoost Vitamin C Serum", "formatted_price": "₹699",
+                  "key_ingredients": [{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}], "benefits": ["Brightening"]},
+    "product_b": {"name": "RadiantSkin Niacinamide Serum", "formatted_price": "₹650"},
+    "comparison": {"summary": "Both are serums."},
+    "recommendations": {"overall": {"recommended_product": "RadiantSkin Niacinamide Serum", "reason": "Cheaper."}}
+}
+
+# ============================================================
+# TEST 1: Rendering pages
+# ============================================================
+print("=" * 70)
+print("TEST 1: Rendering pages")
+print("=" * 70)
+
+faq_html = render_page(faq_page)
+product_html = render_page(product_page)
+comparison_html = render_page(comparison_page)
+unknown_html = render_page({"page_type": "ingredient_deep_dive"})
+print(f"FAQ: {len(faq_html)} chars, product: {len(product_html)} chars, comparison: {len(comparison_html)} chars")
+
+with tempfile.TemporaryDirectory() as tmp:
+    html_renderer_agent.HTML_OUTPUT_DIR = Path(tmp) / "site"
+
+    # ============================================================
+    # TEST 2: Workflow stage
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Workflow stage")
+    print("=" * 70)
+
+    state = {
+        "product_model": product,
+        "faq_page": faq_page,
+        "product_page": product_page,
+        "comparison_page": comparison_page,
+        "changed_pages": None
+    }
+    first = render_html_pages(state)
+    product_dir = Path(tmp) / "site" / product.product_id
+    rendered_names = sorted(Path(path).name for path in first.get("html_files", []))
+
+    # Only the FAQ changed since the last run: the other pages keep their HTML
+    second = render_html_pages({**state, "changed_pages": ["faq.json"]})
+
+    # Product IDs with path separators or dot segments stay inside the site directory
+    site_dir = (Path(tmp) / "site").resolve()
+    unsafe_files = []
+    for unsafe_id in ["../../escape", "..", "a/b"]:
+        unsafe_product = ProductModel(name="Unsafe", price=100, product_id=unsafe_id)
+        unsafe_files += render_html_pages({**state, "product_model": unsafe_product}).get("html_files", [])
+
+    # ============================================================
+    # TEST 3: Bulk rendering across processes
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Bulk rendering across processes")
+    print("=" * 70)
+
+    store = ProductStore(root=Path(tmp) / "store")
+    for i in range(6):
+        store.save({
+            "product_model": ProductModel(name=f"Serum {i}", price=500 + i, category="Serum"),
+            "faq_page": {**faq_page, "product_name": f"Serum {i}"},
+            "product_page": product_page,
+            "comparison_page": comparison_page
+        })
+    orchestrator.PRODUCT_STORE = store
+    bulk = orchestrator.render_catalog_html(max_workers=2)
+    bulk_missing = orchestrator.render_catalog_html(product_ids=["prod_missing"], max_workers=1)
+    serum_3_faq = (Path(tmp) / "site" / "prod_serum_3" / "faq.html").read_text(encoding="utf-8")
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("FAQ rendered by category", "<h2>Safety</h2>" in faq_html and "<summary>How do I apply it?</summary>" in faq_html),
+    ("Page text escaped", "<script>" not in faq_html and "&lt;script&gt;" in faq_html and "&amp; sunscreen" in faq_html),
+    ("Product page sections", "<strong>Vitamin C</strong> (10%): Brightening" in product_html
+        and "<li>Fades dark spots</li>" in product_html),
+    ("Missing fields render empty", "How to Use" not in product_html and "Generated </footer>" in product_html),
+    ("Comparison table", "Vitamin C, Hyaluronic Acid" in comparison_html and "<strong>RadiantSkin" in comparison_html),
+    ("Unknown page types skipped", unknown_html is None),
+    ("Templates compiled once", page_templates() is page_templates()),
+    ("Unsafe product IDs stay in the site directory", len(unsafe_files) == 9 and all(
+        Path(path).resolve().parent.parent == site_dir for path in unsafe_files
+    ) and len({Path(path).parent.name for path in unsafe_files}) == 3),
+    ("All pages written", rendered_names == ["comparison_page.html", "faq.html", "product_page.html"]),
+    ("Unchanged pages not re-rendered", [Path(path).name for path in second["html_files"]] == ["faq.html"]),
+    ("Bulk render", bulk["rendered_count"] == 6 and bulk["page_count"] == 18 and not bulk["failures"]),
+    ("Bulk render uses stored pages", "<title>Serum 3 - Frequently Asked Questions</title>" in serum_3_faq),
+    ("Missing snapshots reported", bulk_missing["failures"][0]["product_id"] == "prod_missing")
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
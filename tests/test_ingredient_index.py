@@ -0,0 +1,114 @@
+"""
+Test Ingredient Normalisation Index
+Tests canonical IDs, alias matching and synonym-aware comparisons
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.content_logic.ingredient_index import IngredientIndex, BUILTIN_INGREDIENT_ALIASES
+from src.agents.comparison_page_builder_agent import _compare_ingredients
+from src.agents.content_logic_agent import ContentBlockGenerator
+from src.models.product_model import ProductModel
+
+
+index = IngredientIndex(BUILTIN_INGREDIENT_ALIASES.items())
+
+
+# ============================================================
+# TEST 1: Canonical IDs for aliases and variants
+# ============================================================
+print("=" * 70)
+print("TEST 1: Canonical IDs for aliases and variants")
+print("=" * 70)
+
+names = ["Vitamin C", "Ascorbic Acid", "L-Ascorbic Acid", "vitamin c (10%)", "Pure Vitamin C Powder", "Ferulic Acid"]
+ids = {name: index.canonical_id(name) for name in names}
+for name, canonical in ids.items():
+    print(f"  {name!r} → {canonical!r}")
+
+
+# ============================================================
+# TEST 2: Ingredient classes are not synonyms
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Ingredient classes are not synonyms")
+print("=" * 70)
+
+class_names = ["Retinol", "Vitamin A", "Vitamin A Palmitate", "Retinyl Palmitate", "Salicylic Acid", "BHA",
+               "2-Hydroxybenzoic Acid", "Glycolic Acid", "AHA", "Lactic Acid (AHA)"]
+class_ids = {name: index.canonical_id(name) for name in class_names}
+for name, canonical in class_ids.items():
+    print(f"  {name!r} → {canonical!r}")
+
+
+# ============================================================
+# TEST 3: Aliases registered after startup
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Aliases registered after startup")
+print("=" * 70)
+
+before = index.canonical_id("Ferulic Acid Complex")
+index.add_aliases("Ferulic Acid", ["Hydroxycinnamic Acid"])
+after = index.canonical_id("Hydroxycinnamic Acid")
+print(f"Before: {before!r}, after: {after!r}")
+
+
+# ============================================================
+# TEST 4: Both comparison paths match synonyms
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Both comparison paths match synonyms")
+print("=" * 70)
+
+product_a = ProductModel(
+    name="GlowBoost Vitamin C Serum",
+    price=699,
+    key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}]
+)
+product_b = ProductModel(
+    name="Ascorbic Glow Serum",
+    price=799,
+    key_ingredients=[{"name": "Ascorbic Acid"}, {"name": "Niacinamide"}]
+)
+
+builder_comparison = _compare_ingredients(product_a, product_b)
+block = ContentBlockGenerator(use_llm_enhancement=False).generate_comparison_block(product_a, product_b)
+block_comparison = block.content["ingredient_comparison"]
+
+print(f"Builder path: {builder_comparison['common_ingredients']} ({builder_comparison['similarity_score']:.2f})")
+print(f"Block path:   {block_comparison['common_ingredients']} ({block_comparison['similarity_score']:.2f})")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Synonyms share one ID", len({ids[n] for n in names[:5]}) == 1),
+    ("Unknown ingredient keeps its own ID", ids["Ferulic Acid"] == "ferulic acid"),
+    ("Vitamin A forms stay distinct from Retinol", len({class_ids[n] for n in class_names[:4]}) == 4),
+    ("Acid classes stay distinct", class_ids["BHA"] != class_ids["Salicylic Acid"]
+        and class_ids["AHA"] != class_ids["Glycolic Acid"] and class_ids["Lactic Acid (AHA)"] == "lactic acid"),
+    ("Chemical synonym still merges", class_ids["2-Hydroxybenzoic Acid"] == class_ids["Salicylic Acid"]),
+    ("Unknown variant not merged before alias", before != "ferulic acid"),
+    ("Late alias resolves", after == "ferulic acid"),
+    ("Builder path matches synonyms", builder_comparison["common_ingredients"] == ["Vitamin C"]),
+    ("Block path matches synonyms", block_comparison["common_ingredients"] == ["Vitamin C"]),
+    ("Both paths agree on score", builder_comparison["similarity_score"] == block_comparison["similarity_score"] == 0.5)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,102 @@
+"""
+Test JSON Patch
+Tests RFC 6902 patch generation and application between page versions
+"""
+import sys
+import copy
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.json_patch import make_patch, apply_patch
+
+
+old_page = {
+    "page_type": "product_page",
+    "product_name": "GlowBoost Vitamin C Serum",
+    "sections": {
+        "pricing": {"price": "₹699", "currency": "₹"},
+        "benefits": ["Brightening", "Fades dark spots", "Evens skin tone"]
+    },
+    "faqs": [{"question": "Is it safe?", "answer": "Yes."}],
+    "a/b~c": 1,
+    "metadata": {"generated_at": "2026-01-01T00:00:00", "discontinued": False}
+}
+
+# ============================================================
+# TEST 1: Small changes give small patches
+# ============================================================
+print("=" * 70)
+print("TEST 1: Small changes give small patches")
+print("=" * 70)
+
+price_change = copy.deepcopy(old_page)
+price_change["sections"]["pricing"]["price"] = "₹749"
+price_patch = make_patch(old_page, price_change)
+print(f"Price patch: {price_patch}")
+
+# ============================================================
+# TEST 2: Structural changes
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Structural changes")
+print("=" * 70)
+
+restructured = copy.deepcopy(old_page)
+restructured["sections"]["benefits"] = ["Brightening"]
+restructured["faqs"].append({"question": "How to use?", "answer": "Daily."})
+restructured["a/b~c"] = 1.0
+restructured["metadata"]["discontinued"] = 0
+del restructured["product_name"]
+restructured["category"] = "Serum"
+structural_patch = make_patch(old_page, restructured)
+for operation in structural_patch:
+    print(f"  {operation}")
+patched = apply_patch(old_page, structural_patch)
+
+try:
+    apply_patch(old_page, [{"op": "replace", "path": "/missing/key", "value": 1}])
+    bad_path_rejected = False
+except ValueError as e:
+    print(f"Rejected: {e}")
+    bad_path_rejected = True
+
+# Cross-check against the jsonpatch library when it is installed (it comes with langchain-core)
+try:
+    import jsonpatch
+    library_agrees = jsonpatch.apply_patch(old_page, structural_patch) == restructured
+except ImportError:
+    library_agrees = True
+print(f"Reference implementation agrees: {library_agrees}")
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Price change is one replace", price_patch == [
+        {"op": "replace", "path": "/sections/pricing/price", "value": "₹749"}
+    ]),
+    ("Price patch applies", apply_patch(old_page, price_patch) == price_change),
+    ("Identical pages give empty patch", make_patch(old_page, copy.deepcopy(old_page)) == []),
+    ("Structural patch applies", patched == restructured),
+    ("Type changes detected", {"op": "replace", "path": "/a~1b~0c", "value": 1.0} in structural_patch
+        and {"op": "replace", "path": "/metadata/discontinued", "value": 0} in structural_patch),
+    ("Appends use '-'", {"op": "add", "path": "/faqs/-", "value": restructured["faqs"][1]} in structural_patch),
+    ("Original left untouched", old_page["sections"]["benefits"][1] == "Fades dark spots"),
+    ("Unresolvable path rejected", bad_path_rejected),
+    ("Matches reference implementation", library_agrees)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
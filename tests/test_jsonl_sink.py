@@ -0,0 +1,115 @@
+"""
+Test JSONL Sink
+Tests rolling JSONL shards, gzip records, the byte-offset index and random access
+"""
+import sys
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.storage.jsonl_sink import JsonlSink, encode_record, load_index, read_record, INDEX_FILE
+from src.utils.serialization import encode_page
+
+
+def record_for(i):
+    pages = {
+        "faq.json": encode_page({"product_name": f"Serum {i}", "faqs": ["₹699"] * 20}, compact=True),
+        "product_page.json": encode_page({"product_name": f"Serum {i}"}, compact=True)
+    }
+    return encode_record(f"prod_{i}", "run_1", pages)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    plain_dir = Path(tmp) / "plain"
+    gzip_dir = Path(tmp) / "gzip"
+
+    # ============================================================
+    # TEST 1: Rolling plain shards
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Rolling plain shards")
+    print("=" * 70)
+
+    line_size = len(record_for(0))
+    sink = JsonlSink(plain_dir, shard_max_bytes=line_size * 3, compress=False)
+    locations = [sink.write(f"prod_{i}", record_for(i)) for i in range(7)]
+    # Shards still open are not in the saved index yet
+    index_before_close = load_index(plain_dir)
+    sink.close()
+
+    index = load_index(plain_dir)
+    shards = sorted(p.name for p in plain_dir.glob("part-*"))
+    lines = [json.loads(line) for shard in shards for line in (plain_dir / shard).read_bytes().splitlines()]
+    print(f"Record size: {line_size} bytes")
+    print(f"Shards: {shards}")
+    print(f"Indexed before close: {len(index_before_close)}, after: {len(index)}")
+
+    # ============================================================
+    # TEST 2: Random access by product ID
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Random access by product ID")
+    print("=" * 70)
+
+    record = read_record(plain_dir, "prod_5", index)
+    print(f"prod_5 at {index['prod_5']}: {record['pages']['product_page']}")
+
+    # A reopened sink continues the shard numbering and updates the index
+    with JsonlSink(plain_dir, shard_max_bytes=line_size * 3, compress=False) as reopened:
+        reopened.write("prod_0", encode_record("prod_0", "run_2", {"faq.json": b"{}"}))
+    reopened_index = load_index(plain_dir)
+    print(f"prod_0 after reopening: {reopened_index['prod_0']}")
+
+    # ============================================================
+    # TEST 3: Gzip records
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Gzip records")
+    print("=" * 70)
+
+    with JsonlSink(gzip_dir, shard_max_bytes=1024 * 1024, compress=True) as gz_sink:
+        for i in range(4):
+            gz_sink.write(f"prod_{i}", record_for(i))
+
+    gz_shards = sorted(p.name for p in gzip_dir.glob("part-*"))
+    with gzip.open(gzip_dir / gz_shards[0], 'rt', encoding='utf-8') as f:
+        gz_lines = [json.loads(line) for line in f]
+    gz_record = read_record(gzip_dir, "prod_2")
+    print(f"Gzip shards: {gz_shards}, size {(gzip_dir / gz_shards[0]).stat().st_size} bytes vs {line_size * 4} plain")
+
+    # ============================================================
+    # SUMMARY
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST SUMMARY")
+    print("=" * 70)
+
+    test_results = [
+        ("Shards roll at size limit", shards == ["part-00000.jsonl", "part-00001.jsonl", "part-00002.jsonl"]),
+        ("One line per product", [line["product_id"] for line in lines] == [f"prod_{i}" for i in range(7)]),
+        ("Records are valid JSON", lines[0]["pages"]["faq"]["faqs"][0] == "₹699"),
+        ("Index only covers synced shards", len(index_before_close) == 6 and len(index) == 7),
+        ("Locations returned", locations[4] == index["prod_4"]),
+        ("Random access read", record["product_id"] == "prod_5"
+            and record["pages"]["product_page"] == {"product_name": "Serum 5"}),
+        ("Unknown product", read_record(plain_dir, "missing", index) is None),
+        ("Reopened sink starts a new shard", reopened_index["prod_0"]["shard"] == "part-00003.jsonl"),
+        ("Reopened sink keeps other entries", reopened_index["prod_5"] == index["prod_5"]),
+        ("Gzip shard is a valid gzip stream", [line["product_id"] for line in gz_lines] == [f"prod_{i}" for i in range(4)]),
+        ("Gzip random access read", gz_record["product_id"] == "prod_2"),
+        ("Gzip compresses", (gzip_dir / gz_shards[0]).stat().st_size < line_size * 4),
+        ("Index file written", (plain_dir / INDEX_FILE).exists() and (gzip_dir / INDEX_FILE).exists())
+    ]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,137 @@
+"""
+Test Near-Duplicate Product Index
+Tests MinHash/LSH detection of size variants and relaunches
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.orchestrator as orchestrator
+import src.content_logic.near_duplicates as near_duplicates
+from src.content_logic.near_duplicates import NearDuplicateIndex, product_shingles
+from src.models.product_model import ProductModel
+from src.storage.product_store import ProductStore
+
+
+base = {
+    "category": "Serum",
+    "key_ingredients": [{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+    "benefits": ["Brightening", "Hydration"],
+    "usage_instructions": "Apply 2-3 drops in the morning before sunscreen",
+    "side_effects": "Mild tingling for sensitive skin",
+    "target_audience": ["Oily skin"]
+}
+original = ProductModel(name="GlowBoost Vitamin C Serum 30ml", price=699, product_id="glow_30", **base)
+size_variant = ProductModel(name="GlowBoost Vitamin C Serum 50 ml", price=999, product_id="glow_50", **base)
+relaunch = ProductModel(
+    name="GlowBoost Vitamin C Serum", price=749, product_id="glow_relaunch",
+    **{**base, "key_ingredients": [{"name": "Ascorbic Acid"}, {"name": "Hyaluronic Acid"}]}
+)
+unrelated = ProductModel(
+    name="Calm Niacinamide Serum", price=599, product_id="calm", category="Serum",
+    key_ingredients=[{"name": "Niacinamide"}], benefits=["Controls oil"]
+)
+
+
+# ============================================================
+# TEST 1: Normalised shingles
+# ============================================================
+print("=" * 70)
+print("TEST 1: Normalised shingles")
+print("=" * 70)
+
+original_shingles = product_shingles(original)
+print(sorted(original_shingles))
+
+
+# ============================================================
+# TEST 2: Incremental detection
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Incremental detection")
+print("=" * 70)
+
+index = NearDuplicateIndex()
+found = {product.product_id: index.add(product) for product in (original, size_variant, unrelated, relaunch)}
+for product_id, duplicates in found.items():
+    print(f"  {product_id}: {duplicates}")
+clusters = index.clusters()
+print(f"Clusters: {clusters}")
+print(f"Estimated similarity glow_30 / glow_relaunch: {index.similarity('glow_30', 'glow_relaunch'):.2f}")
+
+
+# ============================================================
+# TEST 3: Re-adding a changed product
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Re-adding a changed product")
+print("=" * 70)
+
+changed = ProductModel(
+    name="GlowBoost Retinol Night Cream", price=699, product_id="glow_50", category="Cream",
+    key_ingredients=[{"name": "Retinol"}], benefits=["Anti-aging"]
+)
+index.add(changed)
+after_change = index.query(original)
+print(f"Duplicates of glow_30 after change: {after_change}")
+
+
+# ============================================================
+# TEST 4: Default product IDs
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Default product IDs")
+print("=" * 70)
+
+variants = [
+    {"name": "GlowBoost Vitamin C Serum 30ml", "price": 699, **base},
+    {"name": "GlowBoost Vitamin C Serum 50ml", "price": 999, **base}
+]
+default_ids = [ProductModel(**product).product_id for product in variants]
+print(f"Default IDs: {default_ids}")
+
+default_index = NearDuplicateIndex()
+default_found = [default_index.add(ProductModel(**product)) for product in variants]
+with tempfile.TemporaryDirectory() as tmp:
+    orchestrator.PRODUCT_STORE = ProductStore(root=Path(tmp))
+    near_duplicates._near_duplicate_index = NearDuplicateIndex()
+    variant_sources, duplicate_clusters = orchestrator._plan_variant_runs(variants, incremental=False)
+print(f"Variant plan: {variant_sources}, clusters: {duplicate_clusters}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Size removed from name", "name:30ml" not in original_shingles and "name:glowboost" in original_shingles),
+    ("Ingredients use canonical IDs", "ingredient:vitamin c" in original_shingles),
+    ("Size variant found", found["glow_50"] == ["glow_30"]),
+    ("Synonym relaunch found", "glow_30" in found["glow_relaunch"]),
+    ("Unrelated product not matched", found["calm"] == []),
+    ("One cluster of three", clusters == [["glow_30", "glow_50", "glow_relaunch"]]),
+    ("Changed product leaves the buckets", "glow_50" not in after_change and "glow_relaunch" in after_change),
+    ("Product never matches itself", "glow_30" not in after_change),
+    ("Truncated default IDs stay distinct", default_ids[0] != default_ids[1]
+        and all(product_id.startswith("prod_glowboost_vitamin_c_") for product_id in default_ids)),
+    ("Short names keep their plain ID", ProductModel(name="Calm Cream", price=1).product_id == "prod_calm_cream"),
+    ("Size variant found with default IDs", default_found == [[], [default_ids[0]]]
+        and default_index.clusters() == [sorted(default_ids)]),
+    ("Batch plan adapts the variant", variant_sources == {1: default_ids[0]}
+        and duplicate_clusters == [{"representative": default_ids[0], "variants": [default_ids[1]]}])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
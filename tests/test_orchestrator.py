@@ -50,12 +50,7 @@ final_state_1 = run_workflow(product_data_1, input_mode="json")
 
 print("\n📊 Test 1 Results:")
 print(f"   Agents executed: {len(final_state_1.get('agent_trace', []))}")
-# Check both possible locations
 written_files = final_state_1.get('written_files', [])
-if not written_files:
-    # Check if files exist on disk instead
-    from src.config import OUTPUTS_DIR
-    written_files = [str(f) for f in OUTPUTS_DIR.glob("*.json")]
 
 print(f"   Files generated: {len(written_files)}")
 print(f"   Errors: {len(final_state_1.get('errors', []))}")
@@ -184,7 +179,7 @@ if final_state_1.get('written_files'):
     expected_files = ["faq.json", "product_page.json", "comparison_page.json"]
     
     for expected_file in expected_files:
-        file_path = OUTPUTS_DIR / expected_file
+        file_path = Path(final_state_1['output_directory']) / expected_file
         
         if file_path.exists():
             print(f"\n   ✅ {expected_file}")
@@ -283,7 +278,11 @@ test_results = [
     ("Minimal data handled", len(final_state_2.get('written_files', [])) > 0),
     ("Food product processed", len(final_state_3.get('written_files', [])) == 3),
     ("All agents executed", len(final_state_1.get('agent_trace', [])) >= 8),
-    ("All output files valid", (OUTPUTS_DIR / "faq.json").exists()),
+    ("All output files valid", (Path(final_state_1.get('output_directory', '')) / "faq.json").exists()),
+    ("Serialized pages match files", all(
+        Path(path).read_bytes() == final_state_1.get('serialized_pages', {}).get(Path(path).name)
+        for path in final_state_1.get('written_files', [])
+    )),
     ("Workflow structure valid", True),
     ("State complete", final_state_1.get('product_model') is not None)
 ]
@@ -17,6 +17,8 @@ from src.agents.product_page_builder_agent import build_product_page
 from src.agents.comparison_page_builder_agent import build_comparison_page
 from src.agents.output_formatter_agent import write_output_files
 from src.models.state_model import WorkflowState
+from src.storage.output_paths import latest_run_dir
+from src.utils.json_patch import apply_patch
 from src.config import OUTPUTS_DIR
 
 import os
@@ -205,12 +207,16 @@ print("\n\n" + "=" * 70)
 print("TEST 4: File Locations and Structure")
 print("=" * 70)
 
-print(f"\n📂 Output Directory: {OUTPUTS_DIR}")
-print(f"   Exists: {'✅' if OUTPUTS_DIR.exists() else '❌'}")
-print(f"   Is directory: {'✅' if OUTPUTS_DIR.is_dir() else '❌'}")
+run_dir = Path(output_result['output_directory'])
+print(f"\n📂 Output Directory: {run_dir}")
+print(f"   Exists: {'✅' if run_dir.exists() else '❌'}")
+print(f"   Is directory: {'✅' if run_dir.is_dir() else '❌'}")
+print(f"   Namespaced by product: {'✅' if state1['product_model'].product_id in run_dir.parts else '❌'}")
+latest = latest_run_dir(state1['product_model'].product_id)
+print(f"   Latest run pointer: {latest}")
 
-if OUTPUTS_DIR.exists():
-    json_files = list(OUTPUTS_DIR.glob("*.json"))
+if run_dir.exists():
+    json_files = list(run_dir.glob("*.json"))
     print(f"\n   JSON files in directory: {len(json_files)}")
     
     for json_file in json_files:
@@ -281,6 +287,38 @@ if output_result6.get('written_files'):
         print(f"   Currency symbol (₹) preserved: {'✅' if has_rupee else '❌'}")
 
 
+# ============================================================
+# TEST 7: Unchanged Pages Are Not Rewritten
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 7: Unchanged Pages Are Not Rewritten")
+print("=" * 70)
+
+# Rebuilt FAQ page: only metadata.generated_at differs
+state1["faq_page"] = build_faq_page(state1)["faq_page"]
+state1["product_page"] = {**state1["product_page"], "product_name": "GlowBoost Vitamin C Serum (New Look)"}
+output_result7 = write_output_files(state1)
+
+run_dir7 = Path(output_result7['output_directory'])
+faq_linked = (run_dir7 / "faq.json").stat().st_ino == (run_dir / "faq.json").stat().st_ino
+print("\n📊 Results:")
+print(f"   Changed pages: {output_result7.get('changed_pages')}")
+print(f"   FAQ hard-linked from previous run: {'✅' if faq_linked else '❌'}")
+print(f"   Run directory: {sorted(p.name for p in run_dir7.glob('*.json'))}")
+
+# The product page patch turns the previous run's page into the new one
+patch_file = run_dir7 / "product_page.patch.json"
+if patch_file.exists():
+    with open(patch_file, 'r', encoding='utf-8') as f:
+        product_page_patch = json.load(f)
+    with open(run_dir / "product_page.json", 'r', encoding='utf-8') as f:
+        patched_page = apply_patch(json.load(f), product_page_patch)
+    print(f"   Patch operations: {product_page_patch}")
+else:
+    product_page_patch, patched_page = None, None
+    print("   ❌ No patch written")
+
+
 # ============================================================
 # SUMMARY
 # ============================================================
@@ -292,9 +330,27 @@ test_results = [
     ("Complete pipeline writes all files", output_result.get('files_written_count') == 3),
     ("JSON files are valid", len(output_result.get('written_files', [])) > 0),
     ("Partial pages handled", output_result3.get('files_written_count') == 1),
-    ("Output directory created", OUTPUTS_DIR.exists()),
+    ("Output directory created", run_dir.exists()),
+    ("Output namespaced by product and run", run_dir.parent.name == state1['product_model'].product_id),
+    ("Partial run in its own directory", output_result3.get('output_directory') != output_result.get('output_directory')),
     ("No pages handled gracefully", output_result5.get('files_written_count') == 0),
-    ("UTF-8 encoding works", output_result6.get('files_written_count') > 0)
+    ("UTF-8 encoding works", output_result6.get('files_written_count') > 0),
+    ("Unchanged page not rewritten", faq_linked and output_result7.get('files_written_count') == 3),
+    ("Changed pages reported", output_result7.get('changed_pages') == ["product_page.json"]),
+    ("Serialized bytes match linked file",
+        output_result7['serialized_pages']["faq.json"] == (run_dir7 / "faq.json").read_bytes()),
+    ("Patch written for changed page only", patch_file.exists() and not (run_dir7 / "faq.patch.json").exists()),
+    ("Patch reproduces new page", patched_page == state1["product_page"]),
+    ("Patch referenced in manifest entry", any(
+        entry.get("patch", {}).get("base_run_id") == run_dir.name for entry in output_result7.get('manifest_entries', [])
+    )),
+    ("Manifest entries describe pages", {
+        entry["page_type"]: (entry["changed"], entry["size"]) for entry in output_result7.get('manifest_entries', [])
+    } == {
+        "faq": (False, (run_dir7 / "faq.json").stat().st_size),
+        "product_page": (True, (run_dir7 / "product_page.json").stat().st_size),
+        "comparison": (False, (run_dir7 / "comparison_page.json").stat().st_size)
+    })
 ]
 
 print("\nTest Results:")
@@ -314,4 +370,4 @@ if all_passed:
     print("   - Handles UTF-8 encoding")
     print("   - Graceful error handling")
     
-    print(f"\n📁 Output files available at: {OUTPUTS_DIR}")
\ No newline at end of file
+    print(f"\n📁 Output files available at: {run_dir}")
\ No newline at end of file
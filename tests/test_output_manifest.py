@@ -0,0 +1,121 @@
+"""
+Test Output Manifest
+Tests building, merging and diffing run manifests
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.storage.output_manifest as output_manifest
+from src.storage.output_manifest import (
+    build_manifest, merge_manifests, manifest_delta, write_run_manifest, load_manifest, MANIFEST_FORMAT_VERSION
+)
+
+
+def entry(product_id, page_type, content_hash, run_id):
+    return {
+        "product_id": product_id,
+        "page_type": page_type,
+        "file": f"products/00/{product_id}/{run_id}/{page_type}.json",
+        "content_hash": content_hash,
+        "size": 100,
+        "schema_version": "1",
+        "generated_at": f"{run_id}-time",
+        "run_id": run_id,
+        "changed": True
+    }
+
+
+# ============================================================
+# TEST 1: Building a manifest
+# ============================================================
+print("=" * 70)
+print("TEST 1: Building a manifest")
+print("=" * 70)
+
+shard_a = build_manifest(["run_1"], [
+    entry("prod_b", "faq", "h1", "run_1"),
+    entry("prod_a", "faq", "h2", "run_1"),
+    entry("prod_a", "product_page", "h3", "run_1")
+])
+print(f"Pages: {[(e['product_id'], e['page_type']) for e in shard_a['pages']]}")
+
+# ============================================================
+# TEST 2: Merging shards
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Merging shards")
+print("=" * 70)
+
+shard_b = build_manifest(["run_2"], [
+    entry("prod_a", "faq", "h2_new", "run_2"),
+    entry("prod_c", "comparison", "h4", "run_2")
+])
+merged = merge_manifests(shard_a, shard_b)
+merged_reversed = merge_manifests(shard_b, shard_a)
+prod_a_faq = next(e for e in merged["pages"] if e["product_id"] == "prod_a" and e["page_type"] == "faq")
+print(f"Run IDs: {merged['run_ids']}, pages: {merged['page_count']}, products: {merged['product_count']}")
+print(f"prod_a FAQ from: {prod_a_faq['run_id']}")
+
+try:
+    merge_manifests(shard_a, {**shard_b, "format_version": MANIFEST_FORMAT_VERSION + 1})
+    rejected_version = False
+except ValueError as e:
+    print(f"Rejected: {e}")
+    rejected_version = True
+
+# ============================================================
+# TEST 3: Deltas and files
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Deltas and files")
+print("=" * 70)
+
+next_run = build_manifest(["run_3"], [
+    entry("prod_a", "faq", "h2_new", "run_3"),
+    entry("prod_a", "product_page", "h3_changed", "run_3"),
+    entry("prod_c", "comparison", "h4", "run_3")
+])
+delta = manifest_delta(merged, next_run)
+print(f"Upserts: {[(e['product_id'], e['page_type']) for e in delta['upserts']]}")
+print(f"Removals: {delta['removals']}")
+
+with tempfile.TemporaryDirectory() as tmp:
+    output_manifest.OUTPUT_MANIFEST_DIR = Path(tmp)
+    path = write_run_manifest("run_3", next_run["pages"])
+    loaded = load_manifest(path)
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Pages sorted by product and type", [(e["product_id"], e["page_type"]) for e in shard_a["pages"]] == [
+        ("prod_a", "faq"), ("prod_a", "product_page"), ("prod_b", "faq")
+    ]),
+    ("Counts", shard_a["page_count"] == 3 and shard_a["product_count"] == 2),
+    ("Merge keeps all pages", merged["page_count"] == 4 and merged["run_ids"] == ["run_1", "run_2"]),
+    ("Latest run wins", prod_a_faq["content_hash"] == "h2_new"),
+    ("Merge is order-independent", merged["pages"] == merged_reversed["pages"]),
+    ("Unknown format version rejected", rejected_version),
+    ("Delta lists changed pages only", [(e["product_id"], e["page_type"]) for e in delta["upserts"]] == [
+        ("prod_a", "product_page")
+    ]),
+    ("Delta lists removed pages", delta["removals"] == [{"product_id": "prod_b", "page_type": "faq"}]),
+    ("Manifest file round-trip", loaded["pages"] == next_run["pages"] and loaded["run_ids"] == ["run_3"])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,82 @@
+"""
+Test Output Paths
+Tests sharded per-run output directories, atomic writes and run pruning
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.storage.output_paths as output_paths
+from src.storage.output_paths import (
+    new_run_id, product_output_root, run_output_dir, atomic_write_json, mark_latest_run, latest_run_dir
+)
+from src.config import OUTPUT_RUNS_TO_KEEP
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    output_paths.OUTPUT_PRODUCTS_DIR = Path(tmp)
+
+    # ============================================================
+    # TEST 1: Sharded, namespaced paths
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Sharded, namespaced paths")
+    print("=" * 70)
+
+    run_ids = [new_run_id() for _ in range(OUTPUT_RUNS_TO_KEEP + 2)]
+    root = product_output_root("prod/odd id")
+    first_dir = run_output_dir("prod/odd id", run_ids[0])
+    print(f"Product root: {root}")
+    print(f"Run directory: {first_dir}")
+
+    # ============================================================
+    # TEST 2: Atomic writes and latest pointer
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Atomic writes and latest pointer")
+    print("=" * 70)
+
+    for run_id in run_ids:
+        atomic_write_json(run_output_dir("prod/odd id", run_id) / "faq.json", {"run": run_id, "text": "₹699"})
+        mark_latest_run("prod/odd id", run_id, ["faq.json"])
+
+    latest = latest_run_dir("prod/odd id")
+    with open(latest / "faq.json", 'r', encoding='utf-8') as f:
+        latest_page = json.load(f)
+    leftovers = list(root.rglob("*.tmp"))
+    kept_runs = sorted(p.name for p in root.iterdir() if p.is_dir())
+    print(f"Latest run: {latest.name}")
+    print(f"Kept runs: {len(kept_runs)}")
+
+    # ============================================================
+    # SUMMARY
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST SUMMARY")
+    print("=" * 70)
+
+    test_results = [
+        ("Run IDs sort chronologically", run_ids == sorted(run_ids)),
+        ("Run IDs unique", len(set(run_ids)) == len(run_ids)),
+        ("Shard directory under products root", root.parent.parent == Path(tmp) and len(root.parent.name) == 2),
+        ("Product ID sanitised", root.name == "prod_odd_id"),
+        ("Run directory under product root", first_dir.parent == root),
+        ("Latest pointer names last run", latest.name == run_ids[-1] and latest_page["run"] == run_ids[-1]),
+        ("UTF-8 preserved", latest_page["text"] == "₹699"),
+        ("No temp files left", leftovers == []),
+        ("Old runs pruned", kept_runs == run_ids[-OUTPUT_RUNS_TO_KEEP:]),
+        ("Unknown product has no latest run", latest_run_dir("missing") is None)
+    ]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,130 @@
+"""
+Test Page Archive
+Tests writing run archives and memory-mapped random access by product and page type
+"""
+import sys
+import zipfile
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.storage.page_archive import ArchiveSink, PageArchive, INDEX_MEMBER
+from src.utils.serialization import encode_page
+
+
+def pages_for(i):
+    return {
+        "faq.json": encode_page({"product_name": f"Serum {i}", "faqs": ["₹699"] * 20}, compact=True),
+        "product_page.json": encode_page({"product_name": f"Serum {i}"}, compact=True)
+    }
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    stored_path = Path(tmp) / "run_1.zip"
+    deflated_path = Path(tmp) / "run_2.zip"
+
+    # ============================================================
+    # TEST 1: Writing an archive
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Writing an archive")
+    print("=" * 70)
+
+    sink = ArchiveSink(stored_path, compress=False)
+    returned_paths = {sink.append(f"prod_{i}", "run_1", pages_for(i)) for i in range(5)}
+    # Re-generated product: the later pages win
+    sink.append("prod_2", "run_1", {"faq.json": encode_page({"product_name": "Serum 2 v2"}, compact=True)})
+    visible_before_close = stored_path.exists()
+    sink.close()
+    sink.close()
+
+    with zipfile.ZipFile(stored_path) as archive:
+        members = archive.namelist()
+        zip_valid = archive.testzip() is None
+    print(f"Members: {len(members)}, last: {members[-1]}")
+    print(f"Visible before close: {visible_before_close}")
+
+    try:
+        sink.append("prod_9", "run_1", pages_for(9))
+        closed_rejected = False
+    except ValueError as e:
+        print(f"Rejected: {e}")
+        closed_rejected = True
+
+    # ============================================================
+    # TEST 2: Random access by product ID and page type
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Random access by product ID and page type")
+    print("=" * 70)
+
+    with PageArchive(stored_path) as archive:
+        products = archive.products()
+        prod_3_faq = archive.read("prod_3", "faq")
+        prod_2_faq = archive.page("prod_2", "faq")
+        prod_3_types = archive.page_types("prod_3")
+        missing_page = archive.read("prod_3", "comparison_page")
+        missing_product = archive.page("prod_99", "faq")
+    print(f"Products: {products}")
+    print(f"prod_3 page types: {prod_3_types}")
+    print(f"prod_2 FAQ: {prod_2_faq}")
+
+    # ============================================================
+    # TEST 3: Deflated archives and invalid files
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Deflated archives and invalid files")
+    print("=" * 70)
+
+    with ArchiveSink(deflated_path, compress=True) as deflated_sink:
+        for i in range(5):
+            deflated_sink.append(f"prod_{i}", "run_2", pages_for(i))
+    with PageArchive(deflated_path) as archive:
+        deflated_faq = archive.read("prod_3", "faq")
+    stored_size, deflated_size = stored_path.stat().st_size, deflated_path.stat().st_size
+    print(f"Stored: {stored_size} bytes, deflated: {deflated_size} bytes")
+
+    not_archive = Path(tmp) / "not_archive.zip"
+    not_archive.write_bytes(b"{}")
+    try:
+        PageArchive(not_archive)
+        invalid_rejected = False
+    except ValueError as e:
+        print(f"Rejected: {e}")
+        invalid_rejected = True
+
+    leftover_temp_files = list(Path(tmp).glob(".*.tmp"))
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Append returns the archive path", returned_paths == {stored_path}),
+    ("Archive only appears on close", not visible_before_close),
+    ("Archive is a valid zip", zip_valid and members[-1] == INDEX_MEMBER and "prod_0/faq.json" in members),
+    ("Append after close rejected", closed_rejected),
+    ("All products indexed", products == [f"prod_{i}" for i in range(5)]),
+    ("Page read by product and type", prod_3_faq == pages_for(3)["faq.json"]),
+    ("Page types listed", prod_3_types == ["faq", "product_page"]),
+    ("Latest pages win", prod_2_faq == {"product_name": "Serum 2 v2"}),
+    ("Missing pages are None", missing_page is None and missing_product is None),
+    ("Deflated pages read back", deflated_faq == pages_for(3)["faq.json"]),
+    ("Deflate shrinks the archive", deflated_size < stored_size),
+    ("Non-archives rejected", invalid_rejected),
+    ("No temp files left", leftover_temp_files == [])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,121 @@
+"""
+Test Product Store and Incremental Planning
+Tests snapshot persistence, field diffs and node skipping
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import tempfile
+from src.storage.product_store import ProductStore, diff_product_fields
+from src.orchestrator import plan_skipped_nodes
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+from src.models.content_block_model import ContentBlock
+
+
+product_data = {
+    "name": "GlowBoost Vitamin C Serum",
+    "price": 699,
+    "category": "Serum",
+    "key_ingredients": [{"name": "Vitamin C"}],
+    "usage_instructions": "Apply 2-3 drops in the morning"
+}
+
+
+# ============================================================
+# TEST 1: Snapshot round trip
+# ============================================================
+print("=" * 70)
+print("TEST 1: Snapshot round trip")
+print("=" * 70)
+
+store = ProductStore(root=Path(tempfile.mkdtemp()))
+product = ProductModel(**product_data)
+state = {
+    "product_model": product,
+    "product_b_model": None,
+    "questions": [
+        QuestionModel(question_text="How much is it?", answer="₹699", category="Purchase", related_fields=["price"])
+    ],
+    "content_blocks": {
+        "usage": ContentBlock(block_id="usage_block", block_type="usage", content="Apply",
+                              source_fields=["usage_instructions"]),
+        "faq_answers": [
+            ContentBlock(block_id="faq_answer_1", block_type="faq_answer", content={"question": "Q", "answer": "A"})
+        ]
+    },
+    "faq_page": {"page_type": "faq"}
+}
+store.save(state)
+snapshot = store.load(product.product_id)
+stored_model = store.load_product_model(product.product_id)
+
+print(f"Stored IDs: {store.product_ids()}")
+print(f"Questions restored: {len(snapshot['questions'])}")
+print(f"Blocks restored: {list(snapshot['content_blocks'].keys())}")
+
+
+# ============================================================
+# TEST 2: Field diff ignores system metadata
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Field diff ignores system metadata")
+print("=" * 70)
+
+same = diff_product_fields(snapshot["product_model"], ProductModel(**product_data))
+price_changed = diff_product_fields(snapshot["product_model"], ProductModel(**{**product_data, "price": 749}))
+no_snapshot = diff_product_fields(None, product)
+
+print(f"Unchanged: {same}")
+print(f"Price edit: {price_changed}")
+print(f"No snapshot: {no_snapshot}")
+
+
+# ============================================================
+# TEST 3: Skipped nodes follow AGENT_INFO reads/writes
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Skipped nodes follow AGENT_INFO reads/writes")
+print("=" * 70)
+
+skip_none = plan_skipped_nodes([])
+skip_usage = plan_skipped_nodes(["usage_instructions"])
+skip_price = plan_skipped_nodes(["price"])
+
+print(f"Nothing changed → skip: {skip_none}")
+print(f"Usage changed → skip: {skip_usage}")
+print(f"Price changed → skip: {skip_price}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Snapshot persists questions", len(snapshot["questions"]) == 1),
+    ("Snapshot persists block lists", len(snapshot["content_blocks"]["faq_answers"]) == 1),
+    ("Snapshot persists pages", snapshot["faq_page"] == {"page_type": "faq"}),
+    ("Product model loads alone", stored_model == snapshot["product_model"]
+        and store.load_product_model("missing_product") is None and store.product_models() == [stored_model]),
+    ("Unchanged input has empty diff", same == []),
+    ("Price edit detected", price_changed == ["price"]),
+    ("Missing snapshot means full run", no_snapshot is None),
+    ("Nothing changed skips all generators", "question_generator" in skip_none and "content_logic" in skip_none),
+    ("Usage edit keeps Product B", skip_usage == ["product_b_generator"]),
+    ("Price edit re-runs everything", skip_price == [])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,124 @@
+"""
+Test Question Deduplication
+Tests paraphrase detection and the catalog-wide canonical question index
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.agents.question_generator_agent as question_generator_agent
+from src.agents.question_generator_agent import _replace_duplicate_questions
+from src.content_logic.question_dedup import CanonicalQuestionIndex, dedupe_questions, question_kind, question_shingles
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+
+
+def make_question(text: str, category: str = "Safety", generated_from: str = "llm") -> QuestionModel:
+    return QuestionModel(question_text=text, answer="Answer.", category=category, generated_from=generated_from)
+
+
+# ============================================================
+# TEST 1: Paraphrases within one product
+# ============================================================
+print("=" * 70)
+print("TEST 1: Paraphrases within one product")
+print("=" * 70)
+
+template = [make_question("What are the side effects of GlowBoost Serum?", generated_from="template")]
+llm = [
+    make_question("Is it safe for sensitive skin?"),
+    make_question("Can sensitive skin use this?"),
+    make_question("Is it suitable for oily skin?"),
+    make_question("What side effects does GlowBoost Serum have?"),
+    make_question("How often should I apply it?", category="Usage"),
+    make_question("How should I apply it?", category="Usage")
+]
+kept, dropped = dedupe_questions(llm, "GlowBoost Serum", existing=template)
+print("Kept:", [q.question_text for q in kept])
+print("Dropped:", [q.question_text for q in dropped])
+
+
+# ============================================================
+# TEST 2: Canonical forms across products
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Canonical forms across products")
+print("=" * 70)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = Path(tmp) / "canonical_questions.json"
+    index = CanonicalQuestionIndex(path=path)
+    first = index.assign([make_question("Is GlowBoost Serum safe for sensitive skin?")], "GlowBoost Serum")
+    second = index.assign([make_question("Can sensitive skin use Calm Cream?")], "Calm Cream")
+    other = index.assign([make_question("How should I store Calm Cream?")], "Calm Cream")
+    reused = index.assign(first, "GlowBoost Serum")
+
+    form = index.get(first[0].canonical_id)
+    print(f"Canonical form: {form}")
+    written_before_flush = path.exists()
+    index.flush()
+    reloaded = CanonicalQuestionIndex(path=path)
+    reloaded_id = reloaded.canonical_id("Is Daily Lotion safe for sensitive skin?", "Daily Lotion")
+    oily = index.assign([make_question("Is Calm Cream suitable for oily skin?")], "Calm Cream")
+
+
+# ============================================================
+# TEST 3: Replacement requests that fail
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Replacement requests that fail")
+print("=" * 70)
+
+
+def failing_llm(messages):
+    raise TimeoutError("Request timed out")
+
+
+question_generator_agent.invoke_llm = failing_llm
+product = ProductModel(name="GlowBoost Serum", price=699, category="Serum")
+replaced, replace_warnings = _replace_duplicate_questions(
+    product, template, llm[:2], llm_count=2, llm_categories=["Safety"]
+)
+print(f"Kept: {[q.question_text for q in replaced]}, warnings: {replace_warnings}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Question kind compared separately", question_kind("Can sensitive skin use this?") == "yes_no"
+        and question_kind("How long does it last?") == "when"
+        and question_shingles("Can sensitive skin use this?") == {"sensitive", "skin", "suitable"}),
+    ("Product name ignored", "glowboost" not in question_shingles("Is GlowBoost safe?", "GlowBoost")),
+    ("Sensitive skin paraphrase dropped", [q.question_text for q in dropped][:1] == ["Can sensitive skin use this?"]),
+    ("Different skin types kept", {"Is it safe for sensitive skin?", "Is it suitable for oily skin?"}
+        <= {q.question_text for q in kept}),
+    ("Paraphrase of template dropped", "What side effects does GlowBoost Serum have?" in [q.question_text for q in dropped]),
+    ("Different question kinds kept", {"How often should I apply it?", "How should I apply it?"} <= {q.question_text for q in kept}),
+    ("Template never dropped", template[0] not in dropped and len(dropped) == 2),
+    ("Paraphrases share a canonical form", first[0].canonical_id == second[0].canonical_id),
+    ("Different question gets its own form", other[0].canonical_id != first[0].canonical_id
+        and oily[0].canonical_id != first[0].canonical_id),
+    ("Product name replaced in form", form["text"] == "Is this product safe for sensitive skin?"),
+    ("Tagged questions not counted again", reused[0] is first[0] and form["count"] == 2),
+    ("Nothing written before flush", not written_before_flush),
+    ("Forms survive reload", reloaded_id == first[0].canonical_id),
+    ("Provider error keeps the unique questions", [q.question_text for q in replaced] == ["Is it safe for sensitive skin?"]
+        and len(replace_warnings) == 1)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,209 @@
+"""
+Test Question Refresh
+Tests per-question invalidation of previous LLM answers on incremental runs
+"""
+import sys
+import json
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import re
+import tempfile
+import src.utils.llm_client as llm_client
+import src.orchestrator as orchestrator
+import src.agents.question_generator_agent as question_generator_agent
+import src.agents.product_b_generator_agent as product_b_generator_agent
+import src.agents.content_logic_agent as content_logic_agent
+import src.agents.output_formatter_agent as output_formatter_agent
+import src.storage.output_paths as output_paths
+import src.storage.output_manifest as output_manifest
+from src.agents.question_generator_agent import _refresh_llm_questions
+from src.storage.product_store import ProductStore
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+
+
+prompts = []
+
+
+def offline_llm(messages):
+    """Rewrites price mentions and answers every numbered question"""
+    prompt = messages[-1].content
+    prompts.append(prompt)
+    numbered = prompt.split("Questions:")[1].split("Return ONLY")[0].strip().splitlines()
+    questions = [line.split(". ", 1)[1] for line in numbered]
+    return json.dumps({"questions": [
+        {"question_text": question.replace("₹699", "₹749"), "answer": f"Updated answer {i}"}
+        for i, question in enumerate(questions, 1)
+    ]})
+
+
+def failing_llm(messages):
+    raise TimeoutError("Request timed out")
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class CountingLLM:
+    """Answers the question, competitor and overview prompts of a workflow run, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        prompt = "\n".join(message.content for message in messages)
+        if "fictional competitor" in prompt:
+            return Response(json.dumps({
+                "name": "RadiantSkin Niacinamide Serum", "price": 799, "category": "Serum",
+                "key_ingredients": [{"name": "Niacinamide"}], "benefits": ["Controls oil"],
+                "target_audience": ["Oily skin"]
+            }))
+        if "question generator" in prompt:
+            count = int(re.search(r"Generate (\d+) diverse", prompt).group(1))
+            categories = re.search(r"VALID CATEGORIES: (.+)", prompt).group(1).split(", ")
+            return Response(json.dumps({"questions": [
+                {"question_text": f"Is it worth ₹699 for result {i}?", "answer": f"At ₹699, yes ({i}).",
+                 "category": categories[i % len(categories)], "related_fields": ["price"]}
+                for i in range(count)
+            ]}))
+        return Response("A concise overview of the product.")
+
+
+# Keep the catalog-wide question index out of the test
+question_generator_agent.QUESTION_DEDUP_ENABLED = False
+question_generator_agent.invoke_llm = offline_llm
+
+product = ProductModel(
+    name="GlowBoost Vitamin C Serum", price=749, category="Serum",
+    benefits=["Brightening"], usage_instructions="Apply 2-3 drops in the morning"
+)
+previous_questions = [
+    QuestionModel(question_text="Is it worth ₹699?", answer="Yes, at ₹699 it is good value.",
+                  category="Comparison", related_fields=["price"], generated_from="llm"),
+    QuestionModel(question_text="What results can I expect?", answer="Brighter skin.",
+                  category="Results", related_fields=["benefits"], generated_from="llm"),
+    QuestionModel(question_text="How does it compare on cost and results?", answer="It is affordable.",
+                  category="Comparison", related_fields=["benefits", "price"], generated_from="llm"),
+    QuestionModel(question_text="When should I apply it?", answer="In the morning.",
+                  category="Application", related_fields=["usage_instructions"], generated_from="llm")
+]
+
+
+# ============================================================
+# TEST 1: Only questions tagged with a changed field are re-answered
+# ============================================================
+print("=" * 70)
+print("TEST 1: Only questions tagged with a changed field are re-answered")
+print("=" * 70)
+
+result = _refresh_llm_questions(product, [], previous_questions, ["price", "benefits"], previous_price=699)
+refreshed = result["questions"]
+for question in refreshed:
+    print(f"  {question.question_text} -> {question.answer}")
+
+
+# ============================================================
+# TEST 2: A price-only edit rewrites price mentions without the LLM
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: A price-only edit rewrites price mentions without the LLM")
+print("=" * 70)
+
+refresh_prompts = list(prompts)
+prompts.clear()
+repriced = _refresh_llm_questions(product, [], previous_questions, ["price"], previous_price=699)["questions"]
+for question in repriced:
+    print(f"  {question.question_text} -> {question.answer}")
+
+
+# ============================================================
+# TEST 3: Provider errors keep the previous answers
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Provider errors keep the previous answers")
+print("=" * 70)
+
+question_generator_agent.invoke_llm = failing_llm
+failed = _refresh_llm_questions(product, [], previous_questions, ["benefits"])
+print(f"Warnings: {failed.get('warnings')}")
+
+
+# ============================================================
+# TEST 4: Incremental workflow run after a price-only edit
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Incremental workflow run after a price-only edit")
+print("=" * 70)
+
+question_generator_agent.invoke_llm = llm_client.invoke_llm
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+    output_paths.OUTPUT_PRODUCTS_DIR = tmp / "products"
+    output_paths.OUTPUT_CHANGES_DIR = tmp / "changes"
+    output_manifest.OUTPUT_MANIFEST_DIR = tmp / "manifests"
+    orchestrator.PRODUCT_STORE = output_formatter_agent.PRODUCT_STORE = ProductStore(root=tmp / "store")
+    question_generator_agent.INGREDIENT_KB_ENABLED = False
+    product_b_generator_agent.COMPETITOR_SOURCE = "generated"
+    product_b_generator_agent.COMPETITOR_LIBRARY_ENABLED = False
+    content_logic_agent.BLOCK_CACHE_ENABLED = False
+    content_logic_agent.INGREDIENT_KB_ENABLED = False
+    output_formatter_agent.FAQ_INDEX_ENABLED = False
+    counting_llm = llm_client._llm = CountingLLM()
+
+    workflow_input = {
+        "name": "GlowBoost Vitamin C Serum", "price": 699, "category": "Serum",
+        "key_ingredients": [{"name": "Vitamin C"}], "benefits": ["Brightening"],
+        "usage_instructions": "Apply 2-3 drops in the morning.", "target_audience": ["Oily skin"]
+    }
+    first_run = orchestrator.run_workflow(workflow_input, incremental=True)
+    first_calls = counting_llm.calls
+    price_run = orchestrator.run_workflow({**workflow_input, "price": 749}, incremental=True)
+    price_run_calls = counting_llm.calls - first_calls
+    price_run_llm_answers = [q.answer for q in price_run["questions"] if q.generated_from == "llm"]
+    print(f"LLM calls: first run {first_calls}, price-only run {price_run_calls}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("One LLM request for all stale questions", len(refresh_prompts) == 1),
+    ("Only stale questions sent", "What results can I expect?" in refresh_prompts[0]
+        and "How does it compare on cost and results?" in refresh_prompts[0]
+        and "Is it worth ₹699?" not in refresh_prompts[0] and "When should I apply it?" not in refresh_prompts[0]),
+    ("Stale questions re-answered", [q.answer for q in refreshed] == [
+        "Yes, at ₹749 it is good value.", "Updated answer 1", "Updated answer 2", "In the morning."
+    ]),
+    ("Unchanged questions reused as-is", refreshed[3] is previous_questions[3]),
+    ("Price-only edit makes no LLM call", prompts == []),
+    ("Price mentions rewritten", repriced[0].question_text == "Is it worth ₹749?"
+        and repriced[0].answer == "Yes, at ₹749 it is good value." and repriced[0].question_id == "q_is_it_worth"),
+    ("Questions without the price kept as-is", all(repriced[i] is previous_questions[i] for i in (1, 2, 3))),
+    ("Provider error keeps previous answers", [q.answer for q in failed["questions"]] == [
+        q.answer for q in previous_questions
+    ] and len(failed["warnings"]) == 1),
+    ("Incremental price-only run calls no LLM", first_calls > 0 and price_run_calls == 0
+        and not price_run.get("errors")),
+    ("Incremental run shows the new price", price_run_llm_answers
+        and all("₹749" in answer and "₹699" not in answer for answer in price_run_llm_answers)
+        and price_run["product_b_model"].name == first_run["product_b_model"].name)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,135 @@
+"""
+Test Result Store
+Tests batched inserts into the SQLite result store and queries by product, page type and run
+"""
+import sys
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.storage.result_store import ResultStoreSink, ResultStore
+from src.utils.serialization import encode_page
+
+
+def pages_for(i, price="₹699"):
+    return {
+        "faq.json": encode_page({"product_name": f"Serum {i}", "faqs": [price]}, compact=True),
+        "product_page.json": encode_page({"product_name": f"Serum {i}", "price": price}, compact=True)
+    }
+
+
+def entries_for(i, run_id):
+    return [
+        {"page_type": page_type, "content_hash": f"hash_{i}_{run_id}", "schema_version": "1", "generated_at": run_id}
+        for page_type in ("faq", "product_page")
+    ]
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    db_path = Path(tmp) / "results.sqlite3"
+    store = ResultStore(db_path)
+    empty_before_first_run = store.product_ids() == [] and store.page("prod_0", "faq") is None
+
+    # ============================================================
+    # TEST 1: Batched inserts
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Batched inserts")
+    print("=" * 70)
+
+    sink = ResultStoreSink("run_1", db_path, batch_size=4)
+    for i in range(6):
+        sink.append(
+            f"prod_{i}", "run_1", pages_for(i), entries_for(i, "run_1"), {"overview": {"content": f"Overview {i}"}}
+        )
+    # Four products are committed, two are still buffered
+    committed_mid_run = len(store.product_ids("run_1"))
+    sink.close()
+    sink.close()
+
+    journal_mode = sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0]
+    print(f"Committed mid-run: {committed_mid_run}, journal mode: {journal_mode}")
+
+    # ============================================================
+    # TEST 2: Concurrent appends and a second run
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Concurrent appends and a second run")
+    print("=" * 70)
+
+    with ResultStoreSink("run_2", db_path, batch_size=3) as second_sink:
+        threads = [
+            threading.Thread(
+                target=second_sink.append,
+                args=(f"prod_{i}", "run_2", pages_for(i, "₹749"), entries_for(i, "run_2"))
+            )
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    runs = store.runs()
+    print(f"Runs: {runs}")
+
+    # ============================================================
+    # TEST 3: Queries
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Queries")
+    print("=" * 70)
+
+    latest_faq = store.page("prod_1", "faq")
+    first_faq = store.page("prod_1", "faq", run_id="run_1")
+    latest_info = store.page_info("prod_1", "product_page")
+    prod_5_pages = store.product_pages("prod_5")
+    blocks = store.content_blocks("prod_2", run_id="run_1")
+    all_product_ids = store.product_ids()
+    second_run_ids = store.product_ids("run_2")
+    print(f"prod_1 FAQ latest: {latest_faq}, run_1: {first_faq}")
+    print(f"prod_1 product page info: {latest_info}")
+    print(f"prod_5 latest pages: {list(prod_5_pages)}")
+    store.close()
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Missing database reads as empty", empty_before_first_run),
+    ("Full batches committed during the run", committed_mid_run == 4),
+    ("WAL mode", journal_mode == "wal"),
+    ("Run metadata recorded", [(r["run_id"], r["product_count"], r["page_count"]) for r in runs] == [
+        ("run_1", 6, 12), ("run_2", 4, 8)
+    ] and all(r["finished_at"] for r in runs)),
+    ("Latest run by default", latest_faq == pages_for(1, "₹749")["faq.json"]),
+    ("Earlier runs kept", first_faq == pages_for(1)["faq.json"]),
+    ("Page info from entries", latest_info == {
+        "run_id": "run_2", "content_hash": "hash_1_run_2", "schema_version": "1", "generated_at": "run_2"
+    }),
+    ("Products missing from the latest run keep their pages", prod_5_pages == {
+        "faq": {"product_name": "Serum 5", "faqs": ["₹699"]},
+        "product_page": {"product_name": "Serum 5", "price": "₹699"}
+    }),
+    ("Content blocks stored", blocks == {"overview": {"content": "Overview 2"}}),
+    ("Product IDs listed", all_product_ids == [f"prod_{i}" for i in range(6)] and second_run_ids == [
+        f"prod_{i}" for i in range(4)
+    ])
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,112 @@
+"""
+Test Serialization
+Tests page encoding (fast encoder and json fallback), compact mode, round-trips and content hashes
+"""
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.utils.serialization as serialization
+from src.utils.serialization import encode_page, decode_page, content_hash
+
+
+page = {
+    "product_name": "GlowBoost Vitamin C Serum",
+    "price": "₹699",
+    "price_value": 699.0,
+    "in_stock": True,
+    "discount": None,
+    "faqs": [{"question": "Is it safe?", "answer": "Yes."}],
+    "tags": []
+}
+
+# ============================================================
+# TEST 1: Pretty and compact encoding
+# ============================================================
+print("=" * 70)
+print("TEST 1: Pretty and compact encoding")
+print("=" * 70)
+
+print(f"Fast encoder available: {serialization.orjson is not None}")
+pretty = encode_page(page)
+compact = encode_page(page, compact=True)
+print(f"Pretty: {len(pretty)} bytes, compact: {len(compact)} bytes")
+
+# ============================================================
+# TEST 2: Standard library fallback
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Standard library fallback")
+print("=" * 70)
+
+fast_encoder = serialization.orjson
+serialization.orjson = None
+try:
+    fallback_pretty = encode_page(page)
+    fallback_compact = encode_page(page, compact=True)
+    fallback_round_trip = decode_page(fallback_pretty)
+finally:
+    serialization.orjson = fast_encoder
+print(f"Fallback pretty: {len(fallback_pretty)} bytes")
+
+# Keys orjson rejects still encode through json
+mixed_keys = encode_page({1: "one"}, compact=True)
+print(f"Non-string keys: {mixed_keys!r}")
+
+# ============================================================
+# TEST 3: Stable content hash
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Stable content hash")
+print("=" * 70)
+
+first_run = {**page, "metadata": {"generated_at": "2026-01-01T00:00:00", "product_id": "prod_1"}}
+second_run = {"metadata": {"product_id": "prod_1", "generated_at": "2026-01-02T00:00:00"}, **page}
+edited = {**first_run, "price": "₹749"}
+print(f"Hash: {content_hash(first_run)}")
+
+# orjson writes 1e-07 as 1e-7; the hash must not depend on which encoder is installed
+float_page = {**page, "concentration": 1e-07}
+serialization.orjson = None
+try:
+    fallback_hash = content_hash(float_page)
+finally:
+    serialization.orjson = fast_encoder
+canonical = json.dumps(float_page, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Pretty output is bytes", isinstance(pretty, bytes)),
+    ("Pretty matches json indent=2", pretty == json.dumps(page, indent=2, ensure_ascii=False).encode("utf-8")),
+    ("Compact has no whitespace", b"\n" not in compact and b'": ' not in compact and b", " not in compact),
+    ("Compact is smaller", len(compact) < len(pretty)),
+    ("UTF-8 preserved", "₹699".encode("utf-8") in pretty and "₹699".encode("utf-8") in compact),
+    ("Round-trip", decode_page(pretty) == page and decode_page(compact) == page),
+    ("Fallback matches fast encoder", fallback_pretty == pretty and fallback_compact == compact),
+    ("Fallback round-trip", fallback_round_trip == page),
+    ("Non-string keys encoded", mixed_keys == b'{"1":"one"}'),
+    ("Hash ignores generated_at and key order", content_hash(first_run) == content_hash(second_run)),
+    ("Hash detects edits", content_hash(first_run) != content_hash(edited)),
+    ("Hash leaves page untouched", first_run["metadata"]["generated_at"] == "2026-01-01T00:00:00"),
+    ("Hash independent of the encoder", content_hash(float_page) == fallback_hash
+        == hashlib.sha256(canonical.encode("utf-8")).hexdigest())
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
@@ -0,0 +1,148 @@
+"""
+Test Product Similarity Scorer
+Tests local Product B validation against PRODUCT_B_SIMILARITY_THRESHOLD and best-effort repair
+"""
+import sys
+import json
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.agents.product_b_generator_agent as product_b_generator_agent
+from src.content_logic.similarity import score_product_similarity
+from src.models.product_model import ProductModel
+
+
+product_a = ProductModel(
+    name="GlowBoost Vitamin C Serum",
+    price=699,
+    category="Serum",
+    key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+    benefits=["Brightening", "Fades dark spots"],
+    target_audience=["Oily skin", "Combination skin"]
+)
+
+
+# ============================================================
+# TEST 1: Good competitor → in bounds, nothing to repair
+# ============================================================
+print("=" * 70)
+print("TEST 1: Good competitor → in bounds, nothing to repair")
+print("=" * 70)
+
+good_b = ProductModel(
+    name="RadiantSkin Niacinamide Serum",
+    price=799,
+    category="Serum",
+    key_ingredients=[{"name": "Niacinamide"}, {"name": "Zinc PCA"}],
+    benefits=["Brightening", "Controls oil"],
+    target_audience=["Oily skin", "Acne-prone skin"]
+)
+result1 = score_product_similarity(product_a, good_b)
+print(result1)
+
+
+# ============================================================
+# TEST 2: Clone → too similar, ingredients offending
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Clone → too similar, ingredients offending")
+print("=" * 70)
+
+clone_b = ProductModel(
+    name="Copycat Serum",
+    price=699,
+    category="Serum",
+    key_ingredients=[{"name": "Vitamin C"}, {"name": "Hyaluronic Acid"}],
+    benefits=["Brightening", "Fades dark spots"],
+    target_audience=["Oily skin", "Combination skin"]
+)
+result2 = score_product_similarity(product_a, clone_b)
+print(result2)
+
+
+# ============================================================
+# TEST 3: Wrong category and price → offending fields
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Wrong category and price → offending fields")
+print("=" * 70)
+
+far_b = ProductModel(
+    name="Night Cream",
+    price=2500,
+    category="Moisturizer",
+    key_ingredients=[{"name": "Retinol"}],
+    benefits=["Anti-aging"],
+    target_audience=["Dry skin"]
+)
+result3 = score_product_similarity(product_a, far_b)
+print(result3)
+
+
+# ============================================================
+# TEST 4: Failed repair keeps the generated Product B
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 4: Failed repair keeps the generated Product B")
+print("=" * 70)
+
+clone_json = json.dumps(clone_b.model_dump(include={
+    "name", "price", "category", "key_ingredients", "benefits", "target_audience"
+}))
+
+
+def llm_with_repair(repair):
+    """Generates the clone, then answers the repair request with repair()"""
+    calls = []
+
+    def fake_llm(messages):
+        calls.append(messages)
+        return clone_json if len(calls) == 1 else repair()
+    return fake_llm
+
+
+def timeout():
+    raise TimeoutError("Request timed out")
+
+
+product_b_generator_agent.COMPETITOR_SOURCE = "generated"
+product_b_generator_agent.COMPETITOR_LIBRARY_ENABLED = False
+repair_results = []
+for repair in (timeout, lambda: json.dumps({"key_ingredients": [{"purpose": "Oil control"}], "benefits": ["Controls oil"]})):
+    product_b_generator_agent.invoke_llm = llm_with_repair(repair)
+    repair_results.append(product_b_generator_agent.generate_product_b({"product_model": product_a}))
+    print(f"Warnings: {repair_results[-1].get('warnings')}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Good competitor in bounds", result1["in_bounds"] and not result1["offending_fields"]),
+    ("Clone is out of bounds", not result2["in_bounds"]),
+    ("Clone flags ingredients", "key_ingredients" in result2["offending_fields"]),
+    ("Category mismatch flagged", "category" in result3["offending_fields"]),
+    ("Price gap flagged", "price" in result3["offending_fields"]),
+    ("Scores within 0-1", all(0 <= r["score"] <= 1 for r in (result1, result2, result3))),
+    ("Provider error during repair keeps Product B", not repair_results[0].get("errors")
+        and repair_results[0]["product_b_model"].name == "Copycat Serum"
+        and any("repair failed" in w for w in repair_results[0]["warnings"])),
+    ("Invalid repaired fields keep Product B", not repair_results[1].get("errors")
+        and [i.name for i in repair_results[1]["product_b_model"].key_ingredients] == ["Vitamin C", "Hyaluronic Acid"]
+        and any("repair failed" in w for w in repair_results[1]["warnings"]))
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
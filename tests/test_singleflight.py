@@ -0,0 +1,113 @@
+"""
+Test Singleflight
+Tests coalescing of concurrent identical calls
+"""
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.singleflight import SingleFlight
+
+
+# ============================================================
+# TEST 1: Concurrent identical keys share one execution
+# ============================================================
+print("=" * 70)
+print("TEST 1: Concurrent identical keys share one execution")
+print("=" * 70)
+
+group = SingleFlight()
+executions = []
+barrier = threading.Barrier(5)
+
+
+def slow_call():
+    executions.append(1)
+    time.sleep(0.2)
+    return "answer"
+
+
+def worker(_):
+    barrier.wait()
+    return group.do("same_prompt", slow_call)
+
+
+with ThreadPoolExecutor(max_workers=5) as executor:
+    results = list(executor.map(worker, range(5)))
+
+shared_count = sum(1 for _, shared in results if shared)
+print(f"Executions: {len(executions)}")
+print(f"Shared results: {shared_count}")
+print(f"All got same answer: {all(result == 'answer' for result, _ in results)}")
+
+
+# ============================================================
+# TEST 2: Errors propagate to all waiters
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 2: Errors propagate to all waiters")
+print("=" * 70)
+
+barrier2 = threading.Barrier(3)
+
+
+def failing_call():
+    time.sleep(0.2)
+    raise RuntimeError("provider down")
+
+
+def failing_worker(_):
+    barrier2.wait()
+    try:
+        group.do("bad_prompt", failing_call)
+        return False
+    except RuntimeError:
+        return True
+
+
+with ThreadPoolExecutor(max_workers=3) as executor:
+    error_results = list(executor.map(failing_worker, range(3)))
+
+print(f"Callers that saw the error: {sum(error_results)}/3")
+
+
+# ============================================================
+# TEST 3: Sequential calls are not coalesced
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST 3: Sequential calls are not coalesced")
+print("=" * 70)
+
+_, first_shared = group.do("seq", lambda: 1)
+_, second_shared = group.do("seq", lambda: 2)
+print(f"Shared flags: {first_shared}, {second_shared}")
+print(f"In flight after completion: {group.in_flight()}")
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Single execution for concurrent calls", len(executions) == 1 and shared_count == 4),
+    ("Errors propagate to waiters", all(error_results)),
+    ("Sequential calls run independently", not first_shared and not second_shared),
+    ("No leaked in-flight entries", group.in_flight() == 0)
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")
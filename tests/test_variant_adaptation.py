@@ -0,0 +1,189 @@
+"""
+Test Variant Adaptation
+Tests that a near-duplicate adapting its representative's outputs ships no trace of the representative's name,
+and that single-product runs write their run manifest
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Ensure project root is in sys.path
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.utils.llm_client as llm_client
+import src.orchestrator as orchestrator
+import src.agents.question_generator_agent as question_generator_agent
+import src.agents.content_logic_agent as content_logic_agent
+import src.agents.output_formatter_agent as output_formatter_agent
+import src.storage.output_paths as output_paths
+import src.storage.output_manifest as output_manifest
+from src.agents.data_parser_agent import parse_product_data
+from src.agents.faq_builder_agent import build_faq_page
+from src.agents.product_page_builder_agent import build_product_page
+from src.agents.comparison_page_builder_agent import build_comparison_page
+from src.content_logic.template_questions import generate_template_questions
+from src.storage.product_store import ProductStore
+from src.models.product_model import ProductModel
+from src.models.question_model import QuestionModel
+
+
+REPRESENTATIVE_NAME = "GlowBoost Vitamin C Serum 30ml"
+VARIANT_NAME = "GlowBoost Vitamin C Serum 50ml"
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class OfflineLLM:
+    """
+    Answers re-answer requests from the product context, but echoes every
+    question verbatim (the worst case for stale names in question text)
+    """
+
+    def __init__(self):
+        self.reanswered = []
+
+    def invoke(self, messages):
+        prompt = messages[-1].content
+        if "Questions:" not in prompt:
+            return Response("")
+        name = prompt.split("Product Name: ")[1].splitlines()[0]
+        numbered = prompt.split("Questions:")[1].split("Return ONLY")[0].strip().splitlines()
+        questions = [line.split(". ", 1)[1] for line in numbered]
+        self.reanswered.extend(questions)
+        return Response(json.dumps({"questions": [
+            {"question_text": question, "answer": f"{name} is answered from its current details."}
+            for question in questions
+        ]}))
+
+
+fields = {
+    "category": "Serum",
+    "key_ingredients": [{"name": "Vitamin C", "concentration": "10%"}, {"name": "Hyaluronic Acid"}],
+    "benefits": ["Brightening", "Hydration"],
+    "usage_instructions": "Apply 2-3 drops in the morning before sunscreen",
+    "side_effects": "Mild tingling for sensitive skin",
+    "target_audience": ["Oily skin"]
+}
+representative = {"name": REPRESENTATIVE_NAME, "price": 699, "product_id": "glow_30", **fields}
+variant = {"name": VARIANT_NAME, "price": 999, "product_id": "glow_50", **fields}
+
+llm_questions = [
+    QuestionModel(question_text=f"Is {REPRESENTATIVE_NAME} good value?", answer=f"Yes, {REPRESENTATIVE_NAME} is good value.",
+                  category="Comparison", related_fields=["price"], generated_from="llm"),
+    QuestionModel(question_text="What results can I expect?", answer=f"{REPRESENTATIVE_NAME} brightens skin in weeks.",
+                  category="Results", related_fields=["benefits"], generated_from="llm"),
+    QuestionModel(question_text=f"Why choose {REPRESENTATIVE_NAME.upper()} over others?", answer="It combines two actives.",
+                  category="Alternatives", related_fields=["key_ingredients"], generated_from="llm"),
+    QuestionModel(question_text="Can I layer it with retinol?", answer="Use retinol at night instead.",
+                  category="Compatibility", related_fields=["key_ingredients"], generated_from="llm")
+]
+competitor = ProductModel(
+    name="RadiantSkin Niacinamide Serum", price=799, category="Serum",
+    key_ingredients=[{"name": "Niacinamide"}], benefits=["Controls oil"]
+)
+
+
+def store_representative(run_id):
+    """Store the representative's outputs as a finished workflow run does"""
+    state = {"raw_input": representative, "input_mode": "json", "run_id": run_id, "errors": [], "warnings": []}
+    state.update(parse_product_data(state))
+    state["questions"] = generate_template_questions(state["product_model"]) + llm_questions
+    state["product_b_model"] = competitor
+    state.update(content_logic_agent.generate_content_blocks(state))
+    for builder in (build_faq_page, build_product_page, build_comparison_page):
+        state.update(builder(state))
+    orchestrator.PRODUCT_STORE.save(state)
+    return state
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+    output_paths.OUTPUT_PRODUCTS_DIR = tmp / "products"
+    output_manifest.OUTPUT_MANIFEST_DIR = tmp / "manifests"
+    orchestrator.PRODUCT_STORE = ProductStore(root=tmp / "store")
+    orchestrator.OUTPUT_SINK = "files"
+    orchestrator.COMPETITOR_SOURCE = "generated"
+    orchestrator.NEAR_DUPLICATE_ENABLED = False
+    question_generator_agent.INGREDIENT_KB_ENABLED = False
+    question_generator_agent.QUESTION_DEDUP_ENABLED = False
+    content_logic_agent.BLOCK_CACHE_ENABLED = False
+    content_logic_agent.INGREDIENT_KB_ENABLED = False
+    output_formatter_agent.FAQ_INDEX_ENABLED = False
+
+    llm = OfflineLLM()
+    llm_client._llm = llm
+
+    # ============================================================
+    # TEST 1: Representative outputs
+    # ============================================================
+    print("=" * 70)
+    print("TEST 1: Representative outputs")
+    print("=" * 70)
+
+    representative_state = store_representative("20260101T000000_representative")
+    representative_faq = json.dumps(representative_state["faq_page"], ensure_ascii=False)
+    print(f"Representative FAQ mentions its name: {REPRESENTATIVE_NAME in representative_faq}")
+
+    # ============================================================
+    # TEST 2: Variant adapts the representative's outputs
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 2: Variant adapts the representative's outputs")
+    print("=" * 70)
+
+    variant_state = orchestrator.run_workflow(variant, reuse_from="glow_30")
+    variant_faq = json.dumps(variant_state["faq_page"], ensure_ascii=False)
+    variant_llm_questions = [q for q in variant_state["questions"] if q.generated_from == "llm"]
+    for question in variant_llm_questions:
+        print(f"  {question.question_text} -> {question.answer}")
+
+    # ============================================================
+    # TEST 3: Run manifest
+    # ============================================================
+    print("\n\n" + "=" * 70)
+    print("TEST 3: Run manifest")
+    print("=" * 70)
+
+    manifest_file = variant_state.get("manifest_file")
+    manifest = output_manifest.load_manifest(manifest_file) if manifest_file else {}
+    print(f"Manifest: {manifest_file} ({manifest.get('page_count')} pages)")
+    batch_member_state = orchestrator.run_workflow(variant, run_id="20260101T000000_batch")
+    batch_member_manifest = output_manifest.OUTPUT_MANIFEST_DIR / "20260101T000000_batch.json"
+
+# ============================================================
+# SUMMARY
+# ============================================================
+print("\n\n" + "=" * 70)
+print("TEST SUMMARY")
+print("=" * 70)
+
+test_results = [
+    ("Variant run succeeded", not variant_state.get("errors")),
+    ("Representative FAQ used its own name", REPRESENTATIVE_NAME in representative_faq),
+    ("Questions mentioning the old name re-answered", sorted(llm.reanswered) == sorted([
+        llm_questions[0].question_text, llm_questions[1].question_text, llm_questions[2].question_text
+    ])),
+    ("Unrelated answer reused", variant_llm_questions[3].answer == llm_questions[3].answer),
+    ("Adapted FAQ has no trace of the representative's name",
+        REPRESENTATIVE_NAME.lower() not in variant_faq.lower() and "30ml" not in variant_faq.lower()),
+    ("Adapted FAQ names the variant", VARIANT_NAME in variant_faq
+        and f"Is {VARIANT_NAME} good value?" in [q.question_text for q in variant_llm_questions]),
+    ("Single-product run writes its manifest", manifest.get("run_ids") == [variant_state["run_id"]]
+        and manifest["pages"] == sorted(variant_state["manifest_entries"], key=lambda e: (e["product_id"], e["page_type"]))
+        and manifest["page_count"] == 3),
+    ("Batch members leave the manifest to the batch", "manifest_file" not in batch_member_state
+        and not batch_member_manifest.exists())
+]
+
+print("\nTest Results:")
+for test_name, passed in test_results:
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status} - {test_name}")
+
+all_passed = all(result[1] for result in test_results)
+print(f"\n{'🎉 All tests passed!' if all_passed else '⚠️  Some tests failed'}")